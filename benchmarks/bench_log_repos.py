@@ -0,0 +1,77 @@
+"""Benchmark of the log repositories.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_log_repos
+"""
+import datetime
+import os
+import tempfile
+import time
+
+from redbird.oper import between
+from redbird.repos import MemoryRepo
+
+from rocketry.log import MinimalRecord
+from rocketry.log.repos import IndexedMemoryRepo, RetentionMemoryRepo, SQLiteRepo
+
+def fill(repo, n_records:int):
+    for i in range(n_records):
+        repo.add(MinimalRecord(task_name=f"task {i % 10}", action="run", created=float(i)))
+    return repo
+
+def measure_query(repo, n_queries:int=100):
+    start = time.perf_counter()
+    for i in range(n_queries):
+        repo.filter_by(task_name="task 1", action="run", created=between(i, i + 50)).count()
+        repo.filter_by(task_name="task 1", action="run").last()
+    return time.perf_counter() - start
+
+def bench_query():
+    for n_records in (1_000, 10_000, 100_000):
+        indexed = measure_query(fill(IndexedMemoryRepo(model=MinimalRecord), n_records))
+        print(f"Querying {n_records} records 100 times (IndexedMemoryRepo): {indexed:.4f}s")
+        if n_records <= 10_000:
+            # Scans all the records in each query
+            memory = measure_query(fill(MemoryRepo(model=MinimalRecord), n_records))
+            print(f"Querying {n_records} records 100 times (MemoryRepo): {memory:.4f}s")
+
+def measure_write(repo, n_records:int):
+    start = time.perf_counter()
+    fill(repo, n_records)
+    return time.perf_counter() - start
+
+def bench_sqlite():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repo = SQLiteRepo(filename=os.path.join(tmpdir, "logs.db"), model=MinimalRecord)
+        written = measure_write(repo, 5_000)
+        queried = measure_query(repo)
+        repo.close()
+    print(f"Writing 5000 records (SQLiteRepo): {written:.4f}s")
+    print(f"Querying 5000 records 100 times (SQLiteRepo): {queried:.4f}s")
+
+    repo = MemoryRepo(model=MinimalRecord)
+    written = measure_write(repo, 5_000)
+    queried = measure_query(repo)
+    print(f"Writing 5000 records (MemoryRepo): {written:.4f}s")
+    print(f"Querying 5000 records 100 times (MemoryRepo): {queried:.4f}s")
+
+def measure_retention(n_tasks:int, n_records:int):
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=100, rollup=datetime.timedelta(seconds=60))
+    start = time.perf_counter()
+    for i in range(n_records):
+        repo.add(MinimalRecord(task_name=f"task {i % n_tasks}", action="run", created=float(i)))
+    return time.perf_counter() - start
+
+def bench_retention():
+    for n_tasks in (10, 100, 1000):
+        elapsed = measure_retention(n_tasks, 200_000)
+        print(f"Logging 200000 records of {n_tasks} tasks (RetentionMemoryRepo, max_records=100): {elapsed:.4f}s")
+
+def main():
+    bench_query()
+    bench_sqlite()
+    bench_retention()
+
+if __name__ == "__main__":
+    main()
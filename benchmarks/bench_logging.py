@@ -0,0 +1,66 @@
+"""Benchmark of logging the runs of the tasks.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_logging
+"""
+import logging
+import time
+
+from redbird.logging import RepoHandler
+from redbird.repos import MemoryRepo
+
+from rocketry import Session
+from rocketry.log import MinimalRecord, TaskRunRecord
+from rocketry.log.repos import IndexedMemoryRepo
+from rocketry.tasks import FuncTask
+
+def do_nothing():
+    pass
+
+def create_session():
+    logger = logging.getLogger("rocketry.task")
+    logger.handlers = [RepoHandler(repo=MemoryRepo(model=MinimalRecord))]
+    logger.setLevel(logging.INFO)
+    return Session(config={"execution": "main"})
+
+def measure_logger_access(n:int):
+    task = FuncTask(do_nothing, name="task", session=create_session())
+    start = time.perf_counter()
+    for _ in range(n):
+        task.logger
+    return time.perf_counter() - start
+
+def measure_log_runs(n:int):
+    task = FuncTask(do_nothing, name="task", session=create_session())
+    start = time.perf_counter()
+    for _ in range(n):
+        task.log_running()
+        task.log_success()
+    return time.perf_counter() - start
+
+def measure_handler(repo, n:int):
+    logger = logging.getLogger("rocketry.task.benchmark")
+    logger.handlers = [RepoHandler(repo=repo)]
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    extra = {"task_name": "task", "action": "success", "start": 0.0, "end": 1.0, "runtime": 1.0, "run_id": None}
+    start = time.perf_counter()
+    for _ in range(n):
+        logger.info("Task 'task' status: 'success'", extra=extra)
+    return time.perf_counter() - start
+
+def main():
+    n = 50_000
+    elapsed = measure_logger_access(n)
+    print(f"Task.logger: {n / elapsed:.0f} accesses per second")
+    n = 5_000
+    elapsed = measure_log_runs(n)
+    print(f"log_running and log_success: {n / elapsed:.0f} pairs per second")
+    elapsed = measure_handler(IndexedMemoryRepo(model=TaskRunRecord), n)
+    print(f"Logging with IndexedMemoryRepo (compact): {n / elapsed:.0f} records per second")
+    elapsed = measure_handler(IndexedMemoryRepo(model=TaskRunRecord, compact=False), n)
+    print(f"Logging with IndexedMemoryRepo (validated): {n / elapsed:.0f} records per second")
+
+if __name__ == "__main__":
+    main()
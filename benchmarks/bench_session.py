@@ -0,0 +1,72 @@
+"""Benchmark of the scheduling cycle, the task look ups and
+tailing the logs with growing number of tasks.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_session
+"""
+import asyncio
+import logging
+import time
+
+from redbird.logging import RepoHandler
+from redbird.repos import MemoryRepo
+
+from rocketry import Session
+from rocketry.conditions import TaskStarted
+from rocketry.log import MinimalRecord
+from rocketry.tasks import FuncTask
+
+def do_nothing():
+    pass
+
+def create_session():
+    logger = logging.getLogger("rocketry.task")
+    logger.handlers = [RepoHandler(repo=MemoryRepo(model=MinimalRecord))]
+    logger.setLevel(logging.INFO)
+    return Session(config={"execution": "main"})
+
+def create_tasks(session, n_tasks):
+    for i in range(n_tasks):
+        FuncTask(
+            do_nothing, name=f"task {i}", session=session,
+            # Condition with named task (looked up from the session)
+            start_cond=TaskStarted(task=f"task {max(i - 1, 0)}") >= 1,
+        )
+
+def measure_cycle(n_tasks):
+    session = create_session()
+    create_tasks(session, n_tasks)
+    session.scheduler.n_cycles = 0
+    start = time.perf_counter()
+    asyncio.run(session.scheduler.run_cycle())
+    return time.perf_counter() - start
+
+def measure_lookup(n_tasks):
+    session = create_session()
+    create_tasks(session, n_tasks)
+    names = [f"task {i}" for i in range(n_tasks)]
+    start = time.perf_counter()
+    for _ in range(10):
+        for name in names:
+            session[name]
+    return time.perf_counter() - start
+
+def measure_tail(n_tasks):
+    session = create_session()
+    create_tasks(session, n_tasks)
+    start = time.perf_counter()
+    for _ in range(100):
+        session.scheduler._tail_logs()
+    return time.perf_counter() - start
+
+def main():
+    for n_tasks in (200, 2000):
+        print(f"Cycle with {n_tasks} tasks: {measure_cycle(n_tasks):.4f}s")
+    for n_tasks in (200, 2000):
+        print(f"Looking up {n_tasks} tasks 10 times: {measure_lookup(n_tasks):.4f}s")
+    for n_tasks in (200, 2000):
+        print(f"Tailing the logs of {n_tasks} tasks 100 times: {measure_tail(n_tasks):.4f}s")
+
+if __name__ == "__main__":
+    main()
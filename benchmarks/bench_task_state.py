@@ -0,0 +1,59 @@
+"""Benchmark of setting the runtime state of a task
+(status and the force flags) as in the scheduling.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_task_state
+"""
+import logging
+import time
+
+from redbird.logging import RepoHandler
+from redbird.repos import MemoryRepo
+
+from rocketry import Session
+from rocketry.log import MinimalRecord
+from rocketry.tasks import FuncTask
+
+def do_nothing():
+    pass
+
+def create_task():
+    logger = logging.getLogger("rocketry.task")
+    logger.handlers = [RepoHandler(repo=MemoryRepo(model=MinimalRecord))]
+    logger.setLevel(logging.INFO)
+    session = Session(config={"execution": "main"})
+    return FuncTask(do_nothing, name="task", session=session)
+
+def set_status(task, value):
+    if hasattr(task, "_set_state"):
+        task._set_state("status", value)
+    else:
+        task.status = value
+
+def set_force_run(task, value):
+    if hasattr(task, "_set_state"):
+        task._set_state("force_run", value)
+    else:
+        task.force_run = value
+
+def measure(func, n:int):
+    task = create_task()
+    start = time.perf_counter()
+    for _ in range(n):
+        func(task)
+    return n / (time.perf_counter() - start)
+
+def main():
+    n = 100_000
+    rate = measure(lambda task: (set_status(task, "run"), set_status(task, "success")), n)
+    print(f"Status set (run and success): {rate:.0f} pairs per second")
+    rate = measure(lambda task: set_force_run(task, False), n)
+    print(f"force_run reset: {rate:.0f} per second")
+    rate = measure(lambda task: (setattr(task, "status", "run"), setattr(task, "status", "success")), n // 10)
+    print(f"Status assigned (validated): {rate:.0f} pairs per second")
+    rate = measure(lambda task: (task.log_running(), task.log_success()), n // 20)
+    print(f"log_running and log_success: {rate:.0f} pairs per second")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark of rolling the time periods and
+forecasting their intervals.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_time
+"""
+import datetime
+import time
+
+from rocketry.core.time.base import All
+from rocketry.time import Cron
+from rocketry.time.interval import TimeOfDay, TimeOfHour, TimeOfMonth, TimeOfWeek, TimeOfYear
+
+def measure_all():
+    # Rarely (or never) overlapping periods
+    periods = [
+        All(TimeOfWeek.at("Fri"), TimeOfMonth.at(13)),
+        All(TimeOfMonth("28th", "31st"), TimeOfWeek.at("Mon"), TimeOfYear.at("Feb")),
+        All(TimeOfDay("10:00", "12:00"), TimeOfWeek.at("Tue"), TimeOfMonth("1st", "7th"), TimeOfYear.at("Oct")),
+        All(TimeOfHour("15:00", "20:00"), TimeOfDay("10:00", "11:00"), TimeOfWeek.at("Sun")),
+        # Never
+        All(TimeOfYear.at("Feb"), TimeOfDay("10:00", "11:00"), TimeOfDay("12:00", "13:00")),
+    ]
+    dt = datetime.datetime(2022, 6, 1)
+    start = time.perf_counter()
+    for period in periods:
+        period.rollforward(dt)
+        period.rollback(dt)
+    return len(periods), time.perf_counter() - start
+
+def measure_rollback(n:int):
+    # Rolled back as timestamps (as the conditions do)
+    # and through datetimes
+    periods = [TimeOfDay("10:00", "12:00"), TimeOfWeek("Sat", "Mon"), TimeOfHour("15:00", "45:00")]
+    now = time.time()
+
+    start = time.perf_counter()
+    for period in periods:
+        for i in range(n):
+            period.rollback(datetime.datetime.fromtimestamp(now + i))
+    dt_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for period in periods:
+        for i in range(n):
+            period.rollback_timestamp(now + i)
+    ts_elapsed = time.perf_counter() - start
+    return len(periods) * n, dt_elapsed, ts_elapsed
+
+def measure_forecast(n_periods:int):
+    periods = [
+        TimeOfDay(f"{i % 24:02d}:00", f"{(i + 2) % 24:02d}:30") if i % 2 else Cron(f"{i % 60}", f"*/{i % 5 + 1}")
+        for i in range(n_periods)
+    ]
+    dt = datetime.datetime(2022, 6, 1, 12, 0)
+    start = time.perf_counter()
+    n_intervals = 0
+    for period in periods:
+        starts, ends = period.next_intervals(dt, horizon="1 day")
+        n_intervals += len(starts)
+    return n_intervals, time.perf_counter() - start
+
+def main():
+    n_periods, elapsed = measure_all()
+    print(f"Rolling {n_periods} rarely overlapping All periods: {elapsed:.4f}s")
+    n_rolls, dt_elapsed, ts_elapsed = measure_rollback(20_000)
+    print(f"Rollbacks through datetimes: {n_rolls / dt_elapsed:.0f} per second")
+    print(f"Rollbacks as timestamps: {n_rolls / ts_elapsed:.0f} per second")
+    n_intervals, elapsed = measure_forecast(10_000)
+    print(f"Forecasting a day of 10000 periods ({n_intervals} intervals): {elapsed:.4f}s")
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,8 @@ import warnings
 
 from redbird import BaseRepo
 from redbird.logging import RepoHandler
-from redbird.repos import MemoryRepo
 from rocketry.log.log_record import LogRecord
+from rocketry.log.repos import IndexedMemoryRepo
 
 from rocketry.conditions import FuncCond
 from rocketry.parameters import FuncParam
@@ -81,7 +81,7 @@ class Rocketry(_AppMixin):
 
     def _set_logger_with_repo(self, repo):
         if repo is None:
-            repo = MemoryRepo(model=LogRecord)
+            repo = IndexedMemoryRepo(model=LogRecord)
         logger = self._get_task_logger()
         logger.handlers.insert(0, RepoHandler(repo=repo))
 
@@ -64,6 +64,12 @@ class TimeCondWrapper(BaseCondition):
         cond = self.get_cond()
         return cond.observe(**kwargs)
 
+    def get_next_change(self, **kwargs):
+        return self.get_cond().get_next_change(**kwargs)
+
+    def get_inputs(self, **kwargs):
+        return self.get_cond().get_inputs(**kwargs)
+
     def get_cond(self):
         "Get condition the wrapper itself represents"
         period = self._cls_period(None, None)
@@ -88,6 +94,12 @@ class TimeActionWrapper(BaseCondition):
         cond = self.get_cond()
         return cond.observe(**kwargs)
 
+    def get_next_change(self, **kwargs):
+        return self.get_cond().get_next_change(**kwargs)
+
+    def get_inputs(self, **kwargs):
+        return self.get_cond().get_inputs(**kwargs)
+
     def __call__(self, task):
         return TimeActionWrapper(self.cls_cond, task=task)
 
@@ -130,6 +142,12 @@ class RetryWrapper(BaseCondition):
     def observe(self, **kwargs):
         return self.get_cond().observe(**kwargs)
 
+    def get_next_change(self, **kwargs):
+        return self.get_cond().get_next_change(**kwargs)
+
+    def get_inputs(self, **kwargs):
+        return self.get_cond().get_inputs(**kwargs)
+
     def get_cond(self):
         "Get condition the wrapper represents"
         return Retry(-1)
@@ -142,6 +160,12 @@ class RunningWrapper(BaseCondition):
     def observe(self, **kwargs):
         return self.get_cond().observe(**kwargs)
 
+    def get_next_change(self, **kwargs):
+        return self.get_cond().get_next_change(**kwargs)
+
+    def get_inputs(self, **kwargs):
+        return self.get_cond().get_inputs(**kwargs)
+
     def __call__(self, task=None, more_than=None, less_than=None):
         if more_than is not None or less_than is not None or task is None:
             warnings.warn(
@@ -1,5 +1,6 @@
 
 import copy
+import math
 from typing import Callable, Optional, Pattern, Union
 
 from pydantic import Field
@@ -7,6 +8,7 @@ from rocketry.args import Session
 from rocketry import Session as _Session
 
 from rocketry.core.condition import BaseCondition #, Task
+from rocketry.core.time import always
 from rocketry.tasks.func import FuncTask
 
 
@@ -130,6 +132,16 @@ class TaskCond(BaseCondition):
             self.state = task_state
         return self.state
 
+    def get_next_change(self, task=None, session=None):
+        if self.active_time is always:
+            # Changes only when the condition task finishes
+            return math.inf
+        return None
+
+    def get_inputs(self, task=None, session=None):
+        # The state is set when the condition task finishes
+        return {self.task.name}
+
     def _set_parsing(self):
         from rocketry.parse import CondParser
         self.session._cond_parsers[self.syntax] = CondParser(func=self._set_task, session=self.session, cached=True)
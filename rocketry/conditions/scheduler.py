@@ -1,6 +1,10 @@
+import math
+
 from rocketry.args.builtin import Session
 from rocketry.core.condition.base import BaseComparable, BaseCondition
-from rocketry.core.time.utils import get_period_span
+from rocketry.core.time import TimeDelta
+from rocketry.core.time.utils import get_period_span, get_next_boundary
+from rocketry.pybox.time.convert import to_timestamp
 
 
 class SchedulerCycles(BaseComparable):
@@ -13,6 +17,9 @@ class SchedulerCycles(BaseComparable):
         n_cycles = session.scheduler.n_cycles
         return n_cycles
 
+    def _get_memo_key(self, task=None):
+        return (type(self), self._get_comps_key())
+
     def __str__(self):
         if hasattr(self, "_str"):
             return self._str
@@ -59,6 +66,18 @@ class SchedulerStarted(BaseCondition):
         dt = session.scheduler.startup_time
         return start <= dt <= end
 
+    def get_next_change(self, task=None, session=None):
+        session = self.session if session is None else session
+        if type(self.period) is TimeDelta:
+            # Changes once when the startup falls out of the period
+            change = to_timestamp(session.scheduler.startup_time + self.period.past)
+            return change if change > session.get_time() else math.inf
+        return to_timestamp(get_next_boundary(self.period, session._get_datetime_now()))
+
+    def get_inputs(self, task=None, session=None):
+        # Depends only on time
+        return set()
+
     def __str__(self):
         if hasattr(self, "_str"):
             return self._str
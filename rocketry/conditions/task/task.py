@@ -1,5 +1,6 @@
 from typing import Optional
 import datetime
+import math
 
 from redbird.oper import in_, greater_equal, between
 
@@ -8,11 +9,10 @@ from rocketry.log.utils import get_field_value
 from rocketry.pybox.time import to_timestamp
 from rocketry.time.construct import get_before, get_between, get_full_cycle, get_after, get_on
 from rocketry.args import Task, Session
-from rocketry.core.time.utils import get_period_span
+from rocketry.core.time.utils import get_period_timestamps, get_next_boundary
 from rocketry.core.time import TimeDelta
-from .utils import DependMixin, TaskStatusMixin
-
-from ..time import IsPeriod
+from rocketry.core.condition import All
+from .utils import DependMixin, TaskStatusMixin, get_task_inputs, get_task_name, is_within_counts
 
 
 class TaskStarted(TaskStatusMixin):
@@ -168,59 +168,91 @@ class TaskRunning(BaseComparable):
         task = session[self.task] if self.task is not None else task
 
         allow_optimization = not self.session.config.force_status_from_logs
-        start, end = get_period_span(self.period, session=session)
+        start, end = get_period_timestamps(self.period, session=session)
         if allow_optimization:
             task = session[self.task] if self.task is not None else task
             runs = [
                 run.start
                 for run in task._run_stack
-                if run.is_alive() and start <= session._format_timestamp(run.start) <= end
+                if run.is_alive() and start <= run.start <= end
             ]
             return runs
 
-        records = task.logger.get_records(
-            created=between(to_timestamp(start), to_timestamp(end)),
+        if task._open_runs is not None:
+            # Maintained from the records logged
+            # by the scheduler (see Task._update_open_runs)
+            return [run for run, created in task._open_runs.items() if start <= created <= end]
+
+        records = task.logger._get_data(
+            created=between(start, end),
         )
         records = sorted(records, key=lambda x: get_field_value(x, "created"))
         runs = []
-        has_run_id = True
         try:
-            finishes = [
+            finishes = {
                 get_field_value(record, "run_id")
                 for record in records
                 if get_field_value(record, "run_id") and get_field_value(record, "action") != "run"
-            ]
+            }
         except (KeyError, AttributeError):
             # Logs have no run_id
-            finishes = [
-                get_field_value(record, "created")
-                for record in records
-                if get_field_value(record, "action") != "run"
-            ]
-            has_run_id = False
+            finishes = None
+
+        if finishes is not None:
+            for record in records:
+                if get_field_value(record, "action") == "run":
+                    run_id = get_field_value(record, "run_id")
+                    if run_id not in finishes:
+                        runs.append(run_id)
+            return runs
 
+        # Less optimized, tries to guess which is the finish:
+        # each run is matched with the earliest finish after it
+        # that is not matched with a previous run
+        finish_times = [
+            get_field_value(record, "created")
+            for record in records
+            if get_field_value(record, "action") != "run"
+        ]
+        pos = 0
         for record in records:
-            action = get_field_value(record, "action")
-            is_run = action == "run"
-            if not is_run:
+            if get_field_value(record, "action") != "run":
                 continue
-            if has_run_id:
-                run_id = get_field_value(record, "run_id")
-                if run_id not in finishes:
-                    runs.append(run_id)
+            created = get_field_value(record, "created")
+            while pos < len(finish_times) and finish_times[pos] < created:
+                # Before any of the remaining runs
+                pos += 1
+            if pos < len(finish_times):
+                # match
+                pos += 1
             else:
-                # Less optimized, tries to guess which is the finish
-                created = get_field_value(record, "created")
-                for finish in finishes.copy():
-                    if finish >= created:
-                        # match
-                        finishes.remove(finish)
-                        break
-                else:
-                    # No finishes
-                    runs.append(created)
+                # No finishes
+                runs.append(created)
         return runs
 
+    def get_next_change(self, task=None, session=None):
+        session = self.session if session is None else session
+        task = session[self.task] if self.task is not None else task
+        if self.period is None:
+            return math.inf
+        if session.config.force_status_from_logs:
+            return None
+
+        # The runs enter and exit the period as time passes
+        now = session.get_time()
+        near = self.period.near.total_seconds()
+        far = self.period.far.total_seconds() if self.period.far is not None else math.inf
+        times = (
+            run.start + delta
+            for run in task._run_stack
+            if run.is_alive()
+            for delta in (near, far)
+        )
+        return min((t for t in times if t > now), default=math.inf)
+
+    def get_inputs(self, task=None, session=None):
+        return get_task_inputs(self.task if self.task is not None else task)
+
     def __str__(self):
         if hasattr(self, "_str"):
             return self._str
@@ -283,33 +315,51 @@ class TaskExecutable(BaseCondition):
         # NOTE: inaction is not considered at all
 
     def get_state(self, task=Task(default=None), session=Session()):
-        task = self.task if self.task is not None else task
+        task = session[self.task] if self.task is not None else task
         period = self.period
-        retries = 0 if self.retries is None else self.retries
 
-        # Form the sub statements
-        has_not_succeeded = TaskSucceeded(period=period, task=task) == 0
-        has_not_inacted = TaskInacted(period=period, task=task) == 0
-        has_not_failed = TaskFailed(period=period, task=task) <= retries
-        has_not_terminated = TaskTerminated(period=period, task=task) == 0
-
-        isin_period = (
-            # TimeDelta has no __contains__. One cannot say whether now is "past 2 hours".
-            #   And please tell why this does not raise an exception then? - Future me
-            #   Because the period is used in the sub statements and TimeDelta is still accepted - Senior me
-            True
-            if isinstance(period, TimeDelta)
-            else IsPeriod(period=period).observe(session=session)
-        )
+        # TimeDelta has no __contains__. One cannot say whether now is "past 2 hours".
+        #   And please tell why this does not raise an exception then? - Future me
+        #   Because the period is used in the action counts and TimeDelta is still accepted - Senior me
+        if not isinstance(period, TimeDelta) and session._get_datetime_now() not in period:
+            return False
 
-        return (
-            isin_period
-            and has_not_inacted.observe(task=task, session=session)
-            and has_not_succeeded.observe(task=task, session=session)
-            and has_not_failed.observe(task=task, session=session)
-            and has_not_terminated.observe(task=task, session=session)
+        # Same as the sub statements but checked in one go
+        retries = 0 if self.retries is None else self.retries
+        return is_within_counts(
+            task,
+            {"inaction": 0, "success": 0, "fail": retries, "terminate": 0},
+            period=period, session=session
         )
 
+    def get_next_change(self, task=None, session=None):
+        session = self.session if session is None else session
+        task = self.task if self.task is not None else task
+        if self.period is None:
+            return math.inf
+        if isinstance(self.period, TimeDelta):
+            # Changes when the occurrences fall out of the period
+            return All(*self._get_sub_conds(task)).get_next_change(task=task, session=session)
+        now = session._get_datetime_now()
+        return to_timestamp(get_next_boundary(self.period, now))
+
+    def get_inputs(self, task=None, session=None):
+        return get_task_inputs(self.task if self.task is not None else task)
+
+    def _get_sub_conds(self, task):
+        task_name = get_task_name(task)
+        sub_conds = self.__dict__.setdefault("_sub_conds", {})
+        if task_name not in sub_conds:
+            period = self.period
+            retries = 0 if self.retries is None else self.retries
+            sub_conds[task_name] = (
+                TaskSucceeded(period=period, task=task_name) == 0,
+                TaskInacted(period=period, task=task_name) == 0,
+                TaskFailed(period=period, task=task_name) <= retries,
+                TaskTerminated(period=period, task=task_name) == 0,
+            )
+        return sub_conds[task_name]
+
     def __str__(self):
         if hasattr(self, "_str"):
             return self._str
@@ -344,21 +394,26 @@ class TaskRunnable(BaseCondition):
         super().__init__()
 
     def get_state(self, task=Task(default=None), session=Session()):
-        task = self.task if self.task is not None else task
+        task = session[self.task] if self.task is not None else task
         period = self.period
 
-        has_not_run = TaskStarted(period=period, task=task) == 0
+        if not isinstance(period, TimeDelta) and session._get_datetime_now() not in period:
+            return False
+        return is_within_counts(task, {"run": 0}, period=period, session=session)
 
-        isin_period = (
-            True
-            if isinstance(period, TimeDelta)
-            else IsPeriod(period=period).observe(session=session)
-        )
+    def get_next_change(self, task=None, session=None):
+        session = self.session if session is None else session
+        task = self.task if self.task is not None else task
+        if self.period is None:
+            return math.inf
+        if isinstance(self.period, TimeDelta):
+            has_not_run = TaskStarted(period=self.period, task=task) == 0
+            return has_not_run.get_next_change(task=task, session=session)
+        now = session._get_datetime_now()
+        return to_timestamp(get_next_boundary(self.period, now))
 
-        return (
-            isin_period
-            and has_not_run.observe(task=task, session=session)
-        )
+    def get_inputs(self, task=None, session=None):
+        return get_task_inputs(self.task if self.task is not None else task)
 
     def __str__(self):
         if hasattr(self, "_str"):
@@ -470,6 +525,13 @@ class Retry(BaseCondition):
             # Infinite retries
             return True
 
+        log_batch = getattr(session, "_log_batch", None)
+        if log_batch is not None:
+            # Answered from the grouped queries of the cycle
+            last_non_fail_created = log_batch.get_latest(task.logger, ['success', 'crash', 'inaction', 'terminate'])
+            n_failed_in_row = log_batch.count(task.logger, ['fail'], start=last_non_fail_created or 0)
+            return self.n >= n_failed_in_row
+
         last_non_fail = task.logger.filter_by(
             action=in_(['success', 'crash', 'inaction', 'terminate'])
         ).last()
@@ -481,3 +543,10 @@ class Retry(BaseCondition):
             action='fail'
         ).count()
         return self.n >= n_failed_in_row
+
+    def get_next_change(self, task=None, session=None):
+        # Changes only when the task changes status
+        return math.inf
+
+    def get_inputs(self, task=None, session=None):
+        return get_task_inputs(task)
@@ -1,13 +1,68 @@
+import math
+from typing import Dict
+
 from redbird.oper import in_, between
 
 from rocketry.core.condition import All, Any
 from rocketry.args import Task, Session
 from rocketry.core.condition import BaseCondition
 from rocketry.core.condition.base import BaseComparable
-from rocketry.core.time.utils import get_period_span
+from rocketry.core.time import TimeDelta
+from rocketry.core.time.utils import get_period_timestamps, get_next_boundary
 from rocketry.pybox.time import to_timestamp
 from rocketry.log.utils import get_field_value
 
+def get_task_name(task) -> str:
+    "Get name of the task (task or task name)"
+    return getattr(task, "name", task)
+
+def get_task_inputs(*tasks):
+    "Get names of the tasks (as condition inputs)"
+    if any(task is None for task in tasks):
+        # Task is not known
+        return None
+    return {get_task_name(task) for task in tasks}
+
+def is_within_counts(task, limits:Dict[str, int], period=None, session=None) -> bool:
+    """Check whether the task has done each of the actions
+    at most the given number of times in the period.
+
+    Same as checking ``TaskStatusMixin(...) <= limit`` for each
+    action but the period span is computed once and only the
+    counts that cannot be determined from the cached times of
+    the latest actions are queried (stopping at the first
+    action over its limit).
+    """
+    start, end = get_period_timestamps(period if period is not None else task.period, session=session)
+
+    if session.config.force_status_from_logs:
+        actions = list(limits)
+    else:
+        actions = []
+        for action, limit in limits.items():
+            last_occur = task._get_last_action(action)
+            if last_occur is None or last_occur < start:
+                # Cannot have occurred on the period
+                continue
+            if limit == 0 and last_occur <= end:
+                # Occurred on the period
+                return False
+            actions.append(action)
+    if not actions:
+        return True
+
+    log_batch = getattr(session, "_log_batch", None)
+    for action in actions:
+        if log_batch is not None:
+            # Answered from the grouped query of the cycle
+            count = log_batch.count(task.logger, [action], start, end)
+        else:
+            # Counted by the repo (includes the compacted records)
+            count = task.logger.filter_by(created=between(start, end), action=action).count()
+        if count > limits[action]:
+            return False
+    return True
+
 class DependMixin(BaseCondition):
 
     _dep_actions = None
@@ -37,6 +92,15 @@ class DependMixin(BaseCondition):
         actual_task = session[self.task] if self.task is not None else task
         depend_task = session[self.depend_task]
 
+        log_batch = getattr(session, "_log_batch", None)
+        if log_batch is not None:
+            # Answered from the grouped query of the cycle
+            last_depend_finish = log_batch.get_latest(depend_task.logger, self._dep_actions)
+            last_actual_start = log_batch.get_latest(actual_task.logger, ["run"])
+            if last_depend_finish is None:
+                return False
+            return last_actual_start is None or last_depend_finish > last_actual_start
+
         #! TODO: use Task._last_success & Task._last_run if not none and not forced
         last_depend_finish = depend_task.logger.get_latest(action=in_(self._dep_actions))
         last_actual_start = actual_task.logger.get_latest(action="run")
@@ -50,6 +114,20 @@ class DependMixin(BaseCondition):
 
         return get_field_value(last_depend_finish, "created") > get_field_value(last_actual_start, "created")
 
+    def get_next_change(self, task=None, session=None):
+        # Changes only when either of the tasks changes status
+        return math.inf
+
+    def get_inputs(self, task=None, session=None):
+        actual_task = self.task if self.task is not None else task
+        return get_task_inputs(actual_task, self.depend_task)
+
+    def _get_memo_key(self, task=None):
+        actual_task = self.task if self.task is not None else task
+        if actual_task is None:
+            return None
+        return (type(self), get_task_name(actual_task), get_task_name(self.depend_task))
+
 class TaskStatusMixin(BaseComparable):
 
     _action = None
@@ -61,7 +139,7 @@ class TaskStatusMixin(BaseComparable):
 
     def get_measurement(self, task=Task(default=None), session=Session()):
         task = session[self.task] if self.task is not None else task
-        _start_, _end_ = get_period_span(self.period if self.period is not None else task.period, session=session)
+        start, end = get_period_timestamps(self.period if self.period is not None else task.period, session=session)
 
         allow_optimization = not self.session.config.force_status_from_logs
 
@@ -69,25 +147,25 @@ class TaskStatusMixin(BaseComparable):
 
             # Get features that could be used to bypass reading logs
             if isinstance(self._action, str):
-                last_occur = getattr(task, f'last_{self._action}')
-                occurred_on_period = _start_ <= last_occur <= _end_ if last_occur is not None else False
-                cannot_have_occurred = last_occur is None or last_occur < _start_
+                last_occur = task._get_last_action(self._action)
+                occurred_on_period = start <= last_occur <= end if last_occur is not None else False
+                cannot_have_occurred = last_occur is None or last_occur < start
             else:
                 # Multiple actions
                 cannot_have_occurred = True
                 for action in self._action:
-                    last_occur = getattr(task, f'last_{action}')
-                    if last_occur is not None and _start_ <= last_occur <= _end_:
+                    last_occur = task._get_last_action(action)
+                    if last_occur is not None and start <= last_occur <= end:
                         occurred_on_period = True
                         cannot_have_occurred = False
                         break
-                    if last_occur is not None and last_occur >= _start_:
+                    if last_occur is not None and last_occur >= start:
                         cannot_have_occurred = False
                 else:
                     occurred_on_period = False
 
             # Check if can be determined without reading logs
-            # NOTE: if the last_occurred > _end_, we cannot determine whether the cond is true or not
+            # NOTE: if the last_occurred > end, we cannot determine whether the cond is true or not
             if self._is_equal_zero():
                 if cannot_have_occurred:
                     return True
@@ -101,14 +179,65 @@ class TaskStatusMixin(BaseComparable):
                     return True
 
 
-        records = task.logger.get_records(
-            created=between(to_timestamp(_start_), to_timestamp(_end_)),
+        log_batch = getattr(session, "_log_batch", None)
+        if log_batch is not None:
+            # Answered from the grouped query of the cycle
+            actions = self._action if isinstance(self._action, list) else [self._action]
+            return log_batch.count(task.logger, actions, start, end)
+
+        return task.logger.filter_by(
+            created=between(start, end),
             action=in_(self._action) if isinstance(self._action, list) else self._action
-        )
-        return [
-            get_field_value(record, "created")
-            for record in records
-        ]
+        ).count()
+
+    def get_next_change(self, task=None, session=None):
+        session = self.session if session is None else session
+        task = session[self.task] if self.task is not None else task
+        period = self.period if self.period is not None else task.period
+
+        if isinstance(period, TimeDelta):
+            if type(period) is not TimeDelta:
+                # Periods relative to reference in both ends
+                # (ie. TimeSpanDelta) are not supported
+                return None
+            # The state may change when an occurrence
+            # falls out of the period
+            start, end = get_period_timestamps(period, session=session)
+            actions = [self._action] if isinstance(self._action, str) else self._action
+            if self._is_equal_zero() or self._is_any_over_zero():
+                # Only the latest occurrence matters
+                occurs = (task._get_last_action(action) for action in actions)
+                occur = max((occur for occur in occurs if occur is not None and occur >= start), default=None)
+            else:
+                # The earliest occurrence is the first to fall out
+                records = list(task.logger._get_data(
+                    created=between(start, end),
+                    action=in_(actions)
+                ))
+                n_occurs = task.logger.filter_by(
+                    created=between(start, end),
+                    action=in_(actions)
+                ).count()
+                if n_occurs > len(records):
+                    # Some are only counted (compacted by the repo)
+                    # thus when they fall out is not known
+                    return None
+                occur = min((get_field_value(record, "created") for record in records), default=None)
+            if occur is None:
+                return math.inf
+            return occur + period.past.total_seconds()
+
+        now = session._get_datetime_now()
+        return to_timestamp(get_next_boundary(period, now))
+
+    def get_inputs(self, task=None, session=None):
+        return get_task_inputs(self.task if self.task is not None else task)
+
+    def _get_memo_key(self, task=None):
+        task = self.task if self.task is not None else task
+        if task is None:
+            return None
+        return (type(self), get_task_name(task), repr(self.period), self._get_comps_key())
 
     def __str__(self):
         if hasattr(self, "_str"):
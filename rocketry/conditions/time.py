@@ -2,6 +2,8 @@ import datetime
 
 from rocketry.time import TimeDelta
 from rocketry.core.condition.base import BaseCondition
+from rocketry.core.time.utils import get_next_boundary
+from rocketry.pybox.time import to_timestamp
 from rocketry.args import Session
 
 class IsPeriod(BaseCondition):
@@ -34,9 +36,32 @@ class IsPeriod(BaseCondition):
         self.period = period
 
     def get_state(self, session=Session()):
+        cache = getattr(session, "_period_cache", None)
+        if cache is not None and session.config.cache_periods:
+            # Same till the next start or end of the period
+            is_in, _ = cache.contains(self.period, session._get_timestamp_now(), timezone=session.config.timezone)
+            return is_in
         now = session._get_datetime_now()
         return now in self.period
 
+    def get_next_change(self, task=None, session=None):
+        session = self.session if session is None else session
+        cache = getattr(session, "_period_cache", None)
+        if cache is not None and session.config.cache_periods:
+            now = session._get_timestamp_now()
+            _, valid_until = cache.contains(self.period, now, timezone=session.config.timezone)
+            if valid_until > now:
+                return valid_until
+        now = session._get_datetime_now()
+        return to_timestamp(get_next_boundary(self.period, now))
+
+    def get_inputs(self, task=None, session=None):
+        # Depends only on time
+        return set()
+
+    def _get_memo_key(self, task=None):
+        return (type(self), repr(self.period))
+
     def __str__(self):
         if hasattr(self, "_str"):
             return self._str
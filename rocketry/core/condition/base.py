@@ -1,12 +1,67 @@
 from copy import copy
 from abc import abstractmethod
-from typing import Callable, Dict, Pattern, Union
+from functools import wraps
+import math
+from typing import Callable, Dict, Hashable, Optional, Pattern, Set, Union
 
 from rocketry._base import RedBase
 from rocketry.core.parameters.parameters import Parameters
 
 PARSERS: Dict[Union[str, Pattern], Union[Callable, 'BaseCondition']] = {}
 
+class CycleContext:
+    """Context of a scheduling cycle.
+
+    Freezes the current time for the cycle and
+    memoizes the states of the conditions (that
+    define a memo key) till a task the state
+    depends on changes its status.
+    """
+
+    def __init__(self):
+        self.now = None
+        self.timestamp = None
+        self.states = {}
+        # Task name --> memo keys depending on the task
+        # (None for the states with unknown inputs)
+        self.dependents = {}
+
+    def set_state(self, key:Hashable, state, inputs:Optional[Set[str]]):
+        self.states[key] = state
+        for name in (None,) if inputs is None else inputs:
+            self.dependents.setdefault(name, set()).add(key)
+
+    def invalidate(self, task_name:Optional[str]=None):
+        "Remove the memoized states depending on the task (or all if not given)"
+        if task_name is None:
+            self.states = {}
+            self.dependents = {}
+            return
+        states = self.states
+        for name in (task_name, None):
+            for key in self.dependents.pop(name, ()):
+                states.pop(key, None)
+
+def _memoize_state(observe):
+    "Memoize the state of the condition in the cycle context (if any)"
+    @wraps(observe)
+    def wrapper(self, **kwargs):
+        session = kwargs.get("session", self.session)
+        cycle = getattr(session, "_cycle", None)
+        if cycle is None:
+            return observe(self, **kwargs)
+        task = kwargs.get("task")
+        key = self._get_memo_key(task=task)
+        if key is None:
+            return observe(self, **kwargs)
+        states = cycle.states
+        if key in states:
+            return states[key]
+        state = observe(self, **kwargs)
+        cycle.set_state(key, state, self.get_inputs(task=task, session=session))
+        return state
+    return wrapper
+
 
 class BaseCondition(RedBase):
     """A condition is a thing/occurence that should happen in
@@ -60,6 +115,7 @@ class BaseCondition(RedBase):
 
     """
 
+    @_memoize_state
     def observe(self, **kwargs):
         "Observe the status of the condition"
         cond_params = Parameters._from_signature(self.get_state, **kwargs)
@@ -70,6 +126,41 @@ class BaseCondition(RedBase):
         """Check whether the condition holds."""
         return self.observe()
 
+    def get_next_change(self, task=None, session=None) -> Optional[float]:
+        """Get the earliest time (as timestamp) the state
+        of the condition may change without any task
+        changing its status.
+
+        Used by the scheduler to determine how long it
+        can sleep if ``event_driven`` is set. Return
+        ``math.inf`` if the state can only change when a
+        task changes its status and ``None`` if the time
+        cannot be determined (the condition is polled).
+        Override this method to support event driven
+        scheduling.
+        """
+        return None
+
+    def get_inputs(self, task=None, session=None) -> Optional[Set[str]]:
+        """Get the names of the tasks which statuses
+        the state of the condition depends on (in addition
+        to time).
+
+        Used by the scheduler to determine which tasks
+        need to be evaluated if ``dirty_evaluation`` is
+        set. Return ``None`` if the state may depend on
+        something else (the condition is always evaluated).
+        Override this method to support dirty evaluation.
+        """
+        return None
+
+    def _get_memo_key(self, task=None) -> Optional[Hashable]:
+        """Get a key identifying the state of the condition
+        in a scheduling cycle. Conditions with the same key
+        have the same state till a task's status changes.
+        Return ``None`` if the state cannot be memoized."""
+        return None
+
     @abstractmethod
     def get_state(self):
         """Get the status of the condition
@@ -101,7 +192,8 @@ class BaseCondition(RedBase):
         if is_same_class:
             # Check equality of the attributes except
             # those that are only for display purposes
-            repr_attrs = ("_str",)
+            # or caches
+            repr_attrs = ("_str", "_sub_conds")
             self_dict = {
                 key: val for key, val in self.__dict__.items()
                 if key not in repr_attrs
@@ -139,6 +231,24 @@ class _ConditionContainer:
         string = ', '.join(map(str, self.subconditions))
         return f'{type(self).__name__}({string})'
 
+    def get_next_change(self, task=None, session=None) -> Optional[float]:
+        next_change = math.inf
+        for subcond in self.subconditions:
+            sub_change = subcond.get_next_change(task=task, session=session)
+            if sub_change is None:
+                return None
+            next_change = min(next_change, sub_change)
+        return next_change
+
+    def get_inputs(self, task=None, session=None) -> Optional[Set[str]]:
+        inputs = set()
+        for subcond in self.subconditions:
+            sub_inputs = subcond.get_inputs(task=task, session=session)
+            if sub_inputs is None:
+                return None
+            inputs.update(sub_inputs)
+        return inputs
+
 class Any(_ConditionContainer, BaseCondition):
 
     def __init__(self, *conditions):
@@ -235,6 +345,12 @@ class AlwaysTrue(BaseCondition):
     def observe(self, **kwargs):
         return True
 
+    def get_next_change(self, task=None, session=None):
+        return math.inf
+
+    def get_inputs(self, task=None, session=None):
+        return set()
+
     def __repr__(self):
         return 'true'
 
@@ -247,6 +363,12 @@ class AlwaysFalse(BaseCondition):
     def observe(self, **kwargs):
         return False
 
+    def get_next_change(self, task=None, session=None):
+        return math.inf
+
+    def get_inputs(self, task=None, session=None):
+        return set()
+
     def __repr__(self):
         return 'false'
 
@@ -262,6 +384,7 @@ class BaseComparable(BaseCondition):
         self._comps = {}
         super().__init__()
 
+    @_memoize_state
     def observe(self, **kwargs):
         params = Parameters._from_signature(self.get_measurement, **kwargs)
         param_dict = params.materialize(**kwargs)
@@ -287,6 +410,9 @@ class BaseComparable(BaseCondition):
             for comp, val in compares.items()
         )
 
+    def _get_comps_key(self) -> tuple:
+        return tuple(sorted(self._comps.items()))
+
     def _is_any_over_zero(self):
         # Useful for optimization: just find any observation and the statement is true
         comps = {
@@ -1 +1,4 @@
 from .adapter import TaskAdapter
+from .writer import LogWriter
+from .batch import LogQueryBatch
+from .cursor import LogCursor
@@ -1,15 +1,18 @@
 
 import logging
+import sys
 import warnings
-from typing import TYPE_CHECKING, Iterable, Dict, Union
+from typing import TYPE_CHECKING, Iterable, Dict, Optional, Union
 
 from redbird import BaseRepo
 from redbird.logging import RepoHandler
+from redbird.repos import MemoryRepo
 
 from rocketry.core.utils import is_main_subprocess
 
 if TYPE_CHECKING:
     from rocketry.core import Task
+    from .writer import LogWriter
 
 class TaskAdapter(logging.LoggerAdapter):
     """Logging adapter for tasks.
@@ -25,10 +28,15 @@ class TaskAdapter(logging.LoggerAdapter):
         Logger the TaskAdapter is for.
     task : rocketry.core.Task, str
         Task the adapter is for.
+    writer : rocketry.core.log.LogWriter, optional
+        Writer to write the records in the background.
+        If not given, the records are written immediately.
     """
-    def __init__(self, logger:logging.Logger, task:Union['Task', str], ignore_warnings=False):
+    def __init__(self, logger:logging.Logger, task:Union['Task', str], ignore_warnings=False, writer:Optional['LogWriter']=None):
         task_name = task.name if hasattr(task, 'name') else task
         super().__init__(logger, {"task_name": task_name})
+        self._repo_cache = None
+        self._writer = writer
 
         if not ignore_warnings and self.is_readable_unset:
             warnings.warn(f"Logger '{logger.name}' for task '{self.task_name}' does not have ability to be read. Past history of the task cannot be utilized.")
@@ -50,8 +58,37 @@ class TaskAdapter(logging.LoggerAdapter):
         kwargs["extra"].update(self.extra)
         return msg, kwargs
 
+    def log(self, level, msg, *args, **kwargs):
+        "See `LoggerAdapter.log <https://docs.python.org/3/library/logging.html#logging.LoggerAdapter.log>`_"
+        writer = self._writer
+        if writer is None:
+            return super().log(level, msg, *args, **kwargs)
+        if self.isEnabledFor(level):
+            # Creating the record now (time, exception) but
+            # passing it to the handlers in the background
+            msg, kwargs = self.process(msg, kwargs)
+            exc_info = kwargs.get("exc_info")
+            if exc_info:
+                if isinstance(exc_info, BaseException):
+                    exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+                elif not isinstance(exc_info, tuple):
+                    exc_info = sys.exc_info()
+            fn, lno, func, sinfo = self.logger.findCaller()
+            record = self.logger.makeRecord(
+                self.logger.name, level, fn, lno, msg, args,
+                exc_info, func, kwargs.get("extra"), sinfo
+            )
+            writer.put(self.logger, record)
+        return None
+
+    def flush(self):
+        "Wait till the records logged in the background are written"
+        if self._writer is not None:
+            self._writer.flush()
+
     def filter_by(self, *args, **kwargs):
         "Filter by the repo"
+        self.flush()
         task_name = self.extra["task_name"]
         if task_name is not None:
             kwargs["task_name"] = task_name
@@ -78,10 +115,21 @@ class TaskAdapter(logging.LoggerAdapter):
         """
         return self.filter_by(*args, **kwargs).all()
 
+    def _get_data(self, **kwargs) -> Iterable:
+        """Get the log records of the task as stored in
+        the repository (read the fields with get_field_value).
+        Memory repositories do not turn the stored records
+        to the model, others do."""
+        result = self.filter_by(**kwargs)
+        if isinstance(result.repo, MemoryRepo):
+            return list(result.query_data())
+        return result.all()
+
     def set_repo(self, repo:BaseRepo):
         "Delete existing repo and create new"
         self._delete_repo()
         self.logger.handlers.insert(0, RepoHandler(repo))
+        self._repo_cache = None
 
     def _delete_repo(self):
         self.logger.handlers = [
@@ -89,15 +137,35 @@ class TaskAdapter(logging.LoggerAdapter):
             for handler in self.logger.handlers
             if not hasattr(handler, 'repo')
         ]
+        self._repo_cache = None
 
     def _get_repo(self) -> BaseRepo:
         "Get repository where the log records are stored"
+        repo = self._find_repo()
+        if repo is None:
+            raise AttributeError(f"Logger '{self.logger.name}' has no handlers with repository. Cannot be read.")
+        return repo
+
+    def _find_repo(self) -> Optional[BaseRepo]:
+        "Find the repository from the handlers (cached till the handlers change)"
         handlers = self.logger.handlers
+        if self._is_repo_cached():
+            return self._repo_cache[2]
+        repo = None
         for handler in handlers:
             repo = getattr(handler, 'repo', None)
             if repo is not None:
-                return repo
-        raise AttributeError(f"Logger '{self.logger.name}' has no handlers with repository. Cannot be read.")
+                break
+        self._repo_cache = (handlers, len(handlers), repo)
+        return repo
+
+    def _is_repo_cached(self) -> bool:
+        "Whether the handlers have not changed since the repository was found"
+        cache = self._repo_cache
+        if cache is None:
+            return False
+        handlers = self.logger.handlers
+        return cache[0] is handlers and cache[1] == len(handlers)
 
     def get_latest(self, action:str=None) -> dict:
         """Get latest log record. Note that this
@@ -115,9 +183,11 @@ class TaskAdapter(logging.LoggerAdapter):
 
 # For some reason the logging.Adapter is missing some
 # methods that are on logging.Logger
-    def handle(self, *args, **kwargs):
+    def handle(self, record:logging.LogRecord):
         "See `Logger.handle <https://docs.python.org/3/library/logging.html#logging.Logger.handle>`_"
-        return self.logger.handle(*args, **kwargs)
+        if self._writer is not None:
+            return self._writer.put(self.logger, record)
+        return self.logger.handle(record)
 
     def addHandler(self, *args, **kwargs):
         "See `Logger.addHandler <https://docs.python.org/3/library/logging.html#logging.Logger.addHandler>`_"
@@ -140,11 +210,7 @@ class TaskAdapter(logging.LoggerAdapter):
     @property
     def is_readable(self):
         "bool: Whether the logger is also readable"
-        handlers = self.logger.handlers
-        for handler in handlers:
-            if hasattr(handler, 'repo'):
-                return True
-        return False
+        return self._find_repo() is not None
 
     @property
     def is_readable_unset(self):
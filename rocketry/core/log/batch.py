@@ -0,0 +1,186 @@
+import math
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+
+from redbird.oper import between, in_
+
+from rocketry.log.utils import get_action_times, get_field_value, get_latest_actions
+
+if TYPE_CHECKING:
+    from .adapter import TaskAdapter
+
+class LogQueryBatch:
+    """Batch of the log queries of the scheduling cycles.
+
+    Instead of querying the logs of each task
+    separately, the latest actions of the tasks
+    are queried once per log repository and the
+    times of the records once per repository and
+    set of actions. The following queries in the
+    cycle are answered from these. If a task's
+    status changes, the queries of the task are
+    done directly till the batch is reset (the
+    next cycle).
+
+    Only the logs of the given tasks (ie. the tasks
+    evaluated in the cycle and the tasks their
+    conditions depend on) are batched, the others
+    are queried directly. The times are loaded from
+    the start of the count asked. If a later count
+    starts earlier, only the missing times are loaded.
+
+    The loaded times are kept over the cycles. In
+    each cycle, the times are reloaded only for the
+    tasks which latest actions changed since the
+    previous cycle (ie. the tasks that have logged).
+    The times before the earliest start asked in the
+    previous cycle are dropped.
+
+    Parameters
+    ----------
+    task_names : iterable of str, optional
+        Names of the tasks which logs are batched.
+        By default all.
+    """
+
+    def __init__(self, task_names:Optional[Iterable[str]]=None):
+        self.invalidate()
+        self.reset(task_names)
+
+    def reset(self, task_names:Optional[Iterable[str]]=None):
+        """Start a new cycle: clear the results of the queries except
+        the loaded times and set the tasks which logs are batched (all if None)"""
+        self.task_names = set(task_names) if task_names is not None else None
+        # The latest actions of the previous cycle
+        # tell which tasks have logged since
+        self._prev_latest.update(self._latest)
+        self._latest = {}
+        self._unbatched = set()
+        self._stale = set()
+        # Drop the times not asked in the previous cycle
+        times = {}
+        for key, (start, task_names, task_times) in self._times.items():
+            asked = self._asked.get(key)
+            if asked is None:
+                continue
+            if asked > start:
+                task_times = {
+                    task_name: values[bisect_left(values, asked):]
+                    for task_name, values in task_times.items()
+                }
+                start = asked
+            times[key] = (start, task_names, task_times)
+        self._times = times
+        self._asked = {}
+        self._refreshed = set()
+
+    def invalidate(self, task_name:Optional[str]=None):
+        "Clear the results of the queries (or only of the task till the next cycle)"
+        if task_name is not None:
+            self._stale.add(task_name)
+            return
+        # repo id --> {task_name: {action: created}}
+        self._latest: Dict[int, Dict[str, Dict[str, float]]] = {}
+        self._prev_latest: Dict[int, Dict[str, Dict[str, float]]] = {}
+        # (repo id, actions) --> (start, loaded task names or None if all, {task_name: sorted times})
+        self._times: Dict[Tuple[int, Tuple[str, ...]], Tuple[float, Optional[Set[str]], Dict[str, List[float]]]] = {}
+        # (repo id, actions) --> earliest start asked in the cycle
+        self._asked: Dict[Tuple[int, Tuple[str, ...]], float] = {}
+        # Loaded times checked for changes in the cycle
+        self._refreshed = set()
+        # Repos that cannot be batched (query directly)
+        self._unbatched = set()
+        # Tasks that have logged since the queries (query directly)
+        self._stale = set()
+
+    def get_latest(self, logger:'TaskAdapter', actions:Iterable[str]) -> Optional[float]:
+        "Get the time of the latest of the actions of the logger's task (None if none)"
+        if not self._is_batched(logger.task_name):
+            record = logger.get_latest(action=in_(list(actions)))
+            return get_field_value(record, "created") if record else None
+        task_actions = self._get_latest_actions(logger).get(logger.task_name, {})
+        return max((task_actions[action] for action in actions if action in task_actions), default=None)
+
+    def count(self, logger:'TaskAdapter', actions:Iterable[str], start:float=-math.inf, end:float=math.inf) -> int:
+        "Count the actions of the logger's task between start and end (inclusive)"
+        repo = logger._get_repo()
+        actions = tuple(sorted(actions))
+        if id(repo) in self._unbatched or not self._is_batched(logger.task_name):
+            return self._count_directly(logger, actions, start, end)
+
+        key = (id(repo), actions)
+        self._asked[key] = min(start, self._asked.get(key, start))
+        try:
+            times = self._get_times(logger, key, start)
+        except NotImplementedError:
+            self._unbatched.add(id(repo))
+            return self._count_directly(logger, actions, start, end)
+        times = times.get(logger.task_name, [])
+        return bisect_right(times, end) - bisect_left(times, start)
+
+    def _is_batched(self, task_name:str) -> bool:
+        return task_name not in self._stale and (self.task_names is None or task_name in self.task_names)
+
+    def _get_latest_actions(self, logger:'TaskAdapter') -> Dict[str, Dict[str, float]]:
+        "Get the latest actions of the batched tasks in the logger's repo (queried once per cycle)"
+        repo = logger._get_repo()
+        latest = self._latest.get(id(repo))
+        if latest is None:
+            logger.flush()
+            latest = self._latest[id(repo)] = get_latest_actions(repo, task_names=self.task_names)
+        return latest
+
+    def _get_times(self, logger:'TaskAdapter', key:Tuple[int, Tuple[str, ...]], start:float) -> Dict[str, List[float]]:
+        "Get the loaded times of the actions (loading the missing and changed)"
+        repo = logger._get_repo()
+        actions = key[1]
+        loaded = self._times.get(key)
+        if loaded is not None and key not in self._refreshed:
+            loaded = self._refresh(logger, actions, loaded)
+        if loaded is None:
+            # Queried before the times to not miss the records logged in between
+            self._get_latest_actions(logger)
+            logger.flush()
+            loaded = (start, self.task_names, get_action_times(repo, actions, start=start, task_names=self.task_names))
+        elif start < loaded[0]:
+            # Only the times before the loaded
+            logger.flush()
+            loaded = self._load_earlier(repo, actions, start, loaded)
+        self._times[key] = loaded
+        self._refreshed.add(key)
+        return loaded[2]
+
+    def _refresh(self, logger:'TaskAdapter', actions:Tuple[str, ...], loaded) -> Optional[tuple]:
+        "Reload the times of the tasks that have logged since the previous cycle (None if all need loading)"
+        repo = logger._get_repo()
+        start, loaded_names, times = loaded
+        prev = self._prev_latest.get(id(repo))
+        if prev is None or (loaded_names is not None and self.task_names is None):
+            return None
+        latest = self._get_latest_actions(logger)
+        reload = {task_name for task_name in latest.keys() | prev.keys() if latest.get(task_name) != prev.get(task_name)}
+        if loaded_names is not None:
+            reload |= self.task_names - loaded_names
+            loaded_names = loaded_names | self.task_names
+        if self.task_names is not None:
+            reload &= self.task_names
+        if reload:
+            logger.flush()
+            reloaded = get_action_times(repo, actions, start=start, task_names=reload)
+            times = {**times, **{task_name: reloaded.get(task_name, []) for task_name in reload}}
+        return (start, loaded_names, times)
+
+    def _load_earlier(self, repo, actions:Tuple[str, ...], start:float, loaded) -> tuple:
+        "Load the times from start till the loaded and merge them with the loaded"
+        loaded_start, loaded_names, loaded_times = loaded
+        earlier = get_action_times(repo, actions, start=start, end=loaded_start, task_names=loaded_names)
+        times = {}
+        for task_name in earlier.keys() | loaded_times.keys():
+            # The times at the loaded start are already loaded
+            task_times = earlier.get(task_name, [])
+            times[task_name] = task_times[:bisect_left(task_times, loaded_start)] + loaded_times.get(task_name, [])
+        return (start, loaded_names, times)
+
+    @staticmethod
+    def _count_directly(logger:'TaskAdapter', actions:Tuple[str, ...], start:float, end:float) -> int:
+        return logger.filter_by(created=between(start, end), action=in_(list(actions))).count()
@@ -0,0 +1,100 @@
+import heapq
+import math
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+
+from rocketry.log.utils import get_field_value, iter_by_created
+
+class LogCursor:
+    """Cursor over the task log records of log repositories.
+
+    Streams the records of the repositories merged
+    in the order they were created. The query and the
+    time span are passed to the repositories which
+    (if they support it) are read a page at a time
+    so that the whole log is not read to memory.
+
+    The cursor can be resumed from the position of
+    another cursor by passing its ``token`` as ``after``.
+    The token is the creation time of the last record
+    read and the number of records read at that time.
+
+    Parameters
+    ----------
+    repos : iterable of redbird.BaseRepo
+        Repositories of the task logs.
+    query : dict, optional
+        Query of the records (ie. ``task_name`` and ``action``).
+    start, end : float
+        Time span of the records (inclusive).
+    after : str, optional
+        Token of a previous cursor to continue from.
+    page_size : int
+        Number of records read from a repository at a time.
+    as_tuples : bool
+        Whether to return the records as tuples
+        ``(task_name, action, created)`` instead of
+        the records of the repositories.
+    """
+
+    def __init__(self, repos:Iterable, query:Optional[dict]=None, start:float=-math.inf, end:float=math.inf,
+                 after:Optional[str]=None, page_size:int=1000, as_tuples:bool=False):
+        self.as_tuples = as_tuples
+
+        skip = 0
+        if after is not None:
+            after_created, skip = self.parse_token(after)
+            if after_created < start:
+                skip = 0
+            start = max(start, after_created)
+        self._last: Tuple[float, int] = (start, 0)
+
+        streams = [
+            ((get_field_value(record, "created"), record) for record in iter_by_created(repo, query, start, end, page_size=page_size))
+            for repo in repos
+        ]
+        # Ties are in the order of the repos (heapq.merge is stable)
+        self._records = heapq.merge(*streams, key=itemgetter(0))
+        for _ in range(skip):
+            item = next(self._records, None)
+            if item is None or item[0] != start:
+                # Some of the records read before are gone
+                if item is not None:
+                    self._records = chain([item], self._records)
+                break
+            self._move(item[0])
+
+    @property
+    def token(self) -> str:
+        "Token to continue after the records read so far"
+        created, count = self._last
+        return f"{created!r}:{count}"
+
+    @staticmethod
+    def parse_token(token:str) -> Tuple[float, int]:
+        "Get the creation time and the number of records read at that time from a token"
+        created, count = token.rsplit(":", 1)
+        return float(created), int(count)
+
+    def page(self, size:int) -> List[Any]:
+        "Read the next records (at most size)"
+        return list(islice(self, size))
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self):
+        created, record = next(self._records)
+        self._move(created)
+        if self.as_tuples:
+            return (
+                get_field_value(record, "task_name"),
+                get_field_value(record, "action"),
+                created
+            )
+        return record
+
+    def _move(self, created:float):
+        last_created, count = self._last
+        self._last = (created, count + 1 if created == last_created else 1)
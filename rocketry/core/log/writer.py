@@ -0,0 +1,92 @@
+import logging
+import threading
+from queue import Queue, Empty
+from typing import List, Optional, Tuple
+
+class LogWriter:
+    """Writer of log records in a background thread.
+
+    The records are put to a bounded queue and the
+    thread passes them to the handlers of their
+    loggers in batches. If the queue is full, putting
+    a record waits till there is room.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of records waiting to be written.
+    batch_size : int
+        Maximum number of records written at once.
+    """
+
+    _stop = object()
+
+    def __init__(self, maxsize:int=10000, batch_size:int=100):
+        self.batch_size = batch_size
+        self._queue = Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._errors: List[Tuple[logging.LogRecord, Exception]] = []
+
+    @property
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        "Start the writer thread"
+        self._thread = threading.Thread(target=self._run, name="Rocketry log writer", daemon=True)
+        self._thread.start()
+
+    def put(self, logger:logging.Logger, record:logging.LogRecord):
+        "Write the record with the logger in the background"
+        if not self.is_alive:
+            logger.handle(record)
+            return
+        self._queue.put((logger, record))
+
+    def flush(self):
+        "Wait till the records put so far are written"
+        if self.is_alive and threading.current_thread() is not self._thread:
+            self._queue.join()
+
+    def close(self):
+        "Write the remaining records and stop the thread"
+        if self.is_alive:
+            self._queue.put(self._stop)
+            self._thread.join()
+        self._thread = None
+        # Records put while stopping
+        while True:
+            try:
+                logger, record = self._queue.get(block=False)
+            except Empty:
+                break
+            logger.handle(record)
+            self._queue.task_done()
+
+    def pop_errors(self) -> List[Tuple[logging.LogRecord, Exception]]:
+        "Get and clear the errors occurred in writing the records"
+        errors, self._errors = self._errors, []
+        return errors
+
+    def _run(self):
+        queue = self._queue
+        while True:
+            batch = [queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get(block=False))
+                except Empty:
+                    break
+            is_stopped = False
+            for item in batch:
+                if item is self._stop:
+                    is_stopped = True
+                else:
+                    logger, record = item
+                    try:
+                        logger.handle(record)
+                    except Exception as exc:
+                        self._errors.append((record, exc))
+                queue.task_done()
+            if is_stopped:
+                break
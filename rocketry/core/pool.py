@@ -0,0 +1,249 @@
+import multiprocessing
+import os
+import sys
+import traceback
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from rocketry.core.task import Task
+
+def _get_memory_usage() -> Optional[int]:
+    "Get memory usage (bytes) of the current process (None if cannot be determined)"
+    try:
+        # Current resident set size (Linux)
+        with open("/proc/self/statm", "r", encoding="ascii") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError: # pragma: no cover
+        # Not available on Windows
+        return None
+    # Peak resident set size, Mac reports bytes and others kilobytes
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return usage if sys.platform == "darwin" else usage * 1024
+
+def _run_worker(conn, queue, max_runs:Optional[int], max_memory:Optional[int]):
+    """Run tasks sent to the worker. This function
+    should only be run by the worker process."""
+    n_runs = 0
+    # Forked worker has the memory of the parent thus
+    # the growth is measured from the start of the worker
+    start_memory = _get_memory_usage()
+    # The tasks are sent once (and again if modified)
+    # and the runs refer to them by name
+    tasks: Dict[str, 'Task'] = {}
+    while True:
+        try:
+            envelope = conn.recv()
+        except EOFError:
+            # Pool was closed
+            break
+        if envelope is None:
+            break
+        name, task, state, kwargs = envelope
+        error = None
+        try:
+            if task is not None:
+                tasks[name] = task
+            # Each run gets a copy so that runs
+            # do not affect each other
+            task = tasks[name].copy()
+            task._load_runtime_state(state)
+            task._run_as_process(queue=queue, **kwargs)
+        except Exception:
+            # Crashed outside the handling of the task (before
+            # logging running). The scheduler fails the run
+            # and the worker is kept for the next runs
+            error = traceback.format_exc()
+        n_runs += 1
+        memory = _get_memory_usage()
+        is_exhausted = (
+            (max_runs is not None and n_runs >= max_runs)
+            or (
+                max_memory is not None and memory is not None and start_memory is not None
+                and memory - start_memory > max_memory
+            )
+        )
+        # Inform the pool the run finished
+        conn.send((is_exhausted, error))
+        if is_exhausted:
+            # The worker is recycled
+            break
+
+class PoolWorker:
+    "Long-lived worker process that runs process tasks"
+
+    def __init__(self, log_queue, daemon:bool=True, max_runs:Optional[int]=None, max_memory:Optional[int]=None):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_run_worker,
+            args=(child_conn, log_queue, max_runs, max_memory),
+            daemon=daemon
+        )
+        self.process.start()
+        child_conn.close()
+        self.run = None
+        self.exhausted = False
+        # Task name --> definition version the worker has
+        self.shipped: Dict[str, int] = {}
+
+    def submit(self, task:'Task', kwargs:dict) -> 'PoolRun':
+        """Send a run envelope to the worker. The task
+        itself is sent only if the worker does not have
+        its current definition"""
+        name = task.name
+        version = task._definition_version
+        is_shipped = self.shipped.get(name) == version
+        self.conn.send((name, None if is_shipped else task, task._get_runtime_state(), kwargs))
+        self.shipped[name] = version
+        run = PoolRun(self)
+        self.run = run
+        return run
+
+    def poll(self):
+        "Check whether the current run has finished"
+        if self.run is None:
+            return
+        try:
+            has_finished = self.conn.poll()
+            if has_finished:
+                self.exhausted, error = self.conn.recv()
+                if self.run is not None:
+                    self.run.error = error
+        except (EOFError, OSError):
+            # Worker died
+            has_finished = True
+        if has_finished or not self.process.is_alive():
+            self.run = None
+
+    def is_alive(self) -> bool:
+        return self.process.is_alive() and not self.exhausted
+
+    def is_idle(self) -> bool:
+        self.poll()
+        return self.run is None and self.is_alive()
+
+    def close(self):
+        "Stop the worker after the current run"
+        if self.process.is_alive():
+            try:
+                self.conn.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+
+    def kill(self):
+        "Kill the worker (and the run it is running)"
+        self.process.terminate()
+        self.process.join()
+        self.run = None
+
+class PoolRun:
+    """Run of a task in a pooled worker. Behaves like
+    multiprocessing.Process in the run stack of a task."""
+
+    def __init__(self, worker:PoolWorker):
+        self.worker = worker
+        # Traceback if the run crashed in the worker
+        self.error: Optional[str] = None
+
+    def is_alive(self) -> bool:
+        self.worker.poll()
+        return self.worker.run is self
+
+    def terminate(self):
+        # Only way to stop a run is to kill the worker
+        # (the pool replaces it)
+        if self.is_alive():
+            self.worker.kill()
+
+    def join(self, timeout=None):
+        if self.is_alive():
+            self.worker.process.join(timeout)
+
+    @property
+    def pid(self):
+        return self.worker.process.pid
+
+    @property
+    def sentinel(self):
+        return self.worker.process.sentinel
+
+class ProcessPool:
+    """Pool of long-lived worker processes for
+    process tasks.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of worker processes.
+    log_queue : multiprocessing.Queue
+        Queue the workers use to send
+        the log records of the tasks.
+    daemon : bool
+        Whether the workers are daemonic.
+    max_runs : int, optional
+        Number of runs after a worker
+        is recycled, by default never.
+    max_memory : int, optional
+        Growth of memory usage (in bytes) since
+        the start of a worker after which the
+        worker is recycled, by default never.
+    """
+
+    def __init__(self, size:int, log_queue, daemon:bool=True, max_runs:Optional[int]=None, max_memory:Optional[int]=None):
+        self.size = size
+        self.log_queue = log_queue
+        self.daemon = daemon
+        self.max_runs = max_runs
+        self.max_memory = max_memory
+        self.workers: List[PoolWorker] = []
+
+    def submit(self, task:'Task', kwargs:dict) -> Optional[PoolRun]:
+        """Run a task in an idle worker. Returns
+        None if no worker is available"""
+        worker = self._get_idle_worker()
+        if worker is None:
+            return None
+        return worker.submit(task, kwargs)
+
+    def _get_idle_worker(self) -> Optional[PoolWorker]:
+        # Remove the dead and recycled workers
+        workers = []
+        for worker in self.workers:
+            worker.poll()
+            if worker.is_alive() or worker.run is not None:
+                workers.append(worker)
+            else:
+                worker.close()
+        self.workers = workers
+
+        for worker in self.workers:
+            if worker.is_idle():
+                return worker
+        if len(self.workers) < self.size:
+            worker = PoolWorker(
+                self.log_queue,
+                daemon=self.daemon,
+                max_runs=self.max_runs,
+                max_memory=self.max_memory
+            )
+            self.workers.append(worker)
+            return worker
+        return None
+
+    def close(self, timeout:Optional[float]=5):
+        "Stop the workers"
+        for worker in self.workers:
+            if worker.run is not None:
+                # Should not be any as the runs are
+                # waited or terminated in shutdown
+                worker.kill()
+            else:
+                worker.close()
+        for worker in self.workers:
+            worker.process.join(timeout)
+            if worker.process.is_alive():
+                worker.kill()
+        self.workers = []
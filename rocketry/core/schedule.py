@@ -1,6 +1,8 @@
 import asyncio
+import heapq
+import math
 import multiprocessing
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 import threading
 import time
 import sys
@@ -11,11 +13,17 @@ import datetime
 import platform
 from queue import Empty
 
+from redbird import BaseRepo
+
 from rocketry._base import RedBase
 from rocketry.core.condition import BaseCondition, AlwaysFalse
+from rocketry.core.condition.base import CycleContext
 from rocketry.core.task import Task
+from rocketry.core.log import LogQueryBatch, LogWriter, TaskAdapter
 from rocketry.exc import SchedulerRestart, SchedulerExit, TaskLoggingError, TaskSetupError
 from rocketry.core.hook import _Hooker
+from rocketry.core.pool import ProcessPool, PoolRun
+from rocketry.log.utils import get_latest_actions, tail_actions
 
 if TYPE_CHECKING:
     from rocketry import Session
@@ -67,6 +75,10 @@ class Scheduler(RedBase):
     """
     session: 'Session'
 
+    # Seconds allowed the setup of a process to take
+    # before declaring the setup to crash
+    _setup_timeout: float = 10
+
     def __init__(self, session=None,
                 logger=None, name:str=None):
 
@@ -89,6 +101,31 @@ class Scheduler(RedBase):
         self.is_alive = None
 
         self._log_queue = multiprocessing.Queue(-1)
+        self._pool = None
+
+        # Used in event driven scheduling
+        self._loop = None
+        self._flag_wake = None
+        self._next_due = None
+
+        # Used in handling the log records in the event loop
+        self._log_reader = None
+        self._log_error = None
+        self._flag_logs = None
+        self._watched_processes = set()
+
+        # Used in tailing the logs (repo id --> (repo, cursor))
+        self._tail_cursors = {}
+        # Tasks grouped by the log repos: ((tasks, number of tasks), loggers with their handlers, repo id --> (repo, task name --> task))
+        self._task_repos = (None, [], {})
+
+        # Used in batching the log queries (spans kept over cycles)
+        self._log_batch = LogQueryBatch()
+
+        # Used in dirty evaluation
+        self._dirty = set()
+        self._dirty_lock = threading.Lock()
+        self._reset_index()
 
     @property
     def tasks(self):
@@ -114,12 +151,19 @@ class Scheduler(RedBase):
         self._flag_enabled.set()
 
         self.is_alive = True
+        self._loop = asyncio.get_running_loop()
+        self._flag_wake = asyncio.Event()
+        self._next_due = 0 # First cycle is due immediately
+        self._start_log_reader()
         exception = None
         try:
             await self.startup()
 
             while not self.check_shut_cond(self.session.config.shut_cond):
-                await self._hibernate()
+                if self.session.config.event_driven:
+                    await self._hibernate(until=self._next_due)
+                else:
+                    await self._hibernate()
                 if self._flag_shutdown.is_set():
                     break
                 if self._flag_restart.is_set():
@@ -152,6 +196,8 @@ class Scheduler(RedBase):
             self.logger.info('Purpose completed. Shutting down...', extra={"action": "shutdown"})
         finally:
             await self.shut_down(exception=exception)
+            self._stop_log_reader()
+            self._flag_wake = None
 
     async def run_cycle(self):
         """Run one round of tasks.
@@ -163,33 +209,306 @@ class Scheduler(RedBase):
         are running but their termination condition is fulfilled are
         terminated.
         """
-        tasks = self.tasks
+        if self.session.config.tail_logs:
+            self._tail_logs()
+        dirty_evaluation = self.session.config.dirty_evaluation
+        tasks = self._get_dirty_tasks() if dirty_evaluation else self.tasks
         self.logger.debug(f"Beginning cycle with {len(tasks)} tasks...", extra={"action": "run"})
 
         # Running hooks
         hooker = _Hooker(self.session.hooks.scheduler_cycle)
         hooker.prerun(scheduler=self)
 
-        for task in tasks:
-            with task.lock:
-                self.handle_logs()
-                task._clean_run_stack()
-                if task.on_startup or task.on_shutdown:
-                    # Startup or shutdown tasks are not run in main sequence
-                    pass
-                elif self._flag_enabled.is_set() and self.is_task_runnable(task):
-                    # Run the actual task
-                    await self.run_task(task)
-                    # Reset force_run as a run has forced
-                    task.force_run = False
-                await task._check_termination()
+        event_driven = self.session.config.event_driven
+        if event_driven and self._flag_wake is not None:
+            # Changes from now on wake up the scheduler
+            self._flag_wake.clear()
+        next_due = math.inf
+
+        if self.session.config.cycle_memo:
+            # Time is frozen and the conditions' states
+            # are memoized till a task's status changes
+            self.session._cycle = CycleContext()
+        if self.session.config.batch_log_queries:
+            # Log queries of the conditions are answered
+            # with grouped queries till a task's status changes
+            self._log_batch.reset(self._get_log_task_names(tasks))
+            self.session._log_batch = self._log_batch
+        try:
+            for task in tasks:
+                with task.lock:
+                    if self._log_reader is None:
+                        # Records are not handled in the event loop
+                        self.handle_logs()
+                    task._clean_run_stack()
+                    if task.on_startup or task.on_shutdown:
+                        # Startup or shutdown tasks are not run in main sequence
+                        pass
+                    elif self._flag_enabled.is_set() and self.is_task_runnable(task):
+                        # Run the actual task
+                        await self.run_task(task)
+                        # Reset force_run as a run has forced
+                        task._set_state("force_run", False)
+                    await task._check_termination()
+                    if dirty_evaluation:
+                        self._index_task(task)
+                    elif event_driven and next_due is not None:
+                        task_due = self._get_task_due(task)
+                        next_due = min(next_due, task_due) if task_due is not None else None
+            # Processes were started concurrently, waiting
+            # till they have all logged running
+            await self._wait_task_starts(tasks)
+        finally:
+            self.session._cycle = None
+            self.session._log_batch = None
         self.handle_logs()
+        self.check_log_errors()
         self.check_thread_errors()
         # Running hooks
         hooker.postrun()
 
+        if dirty_evaluation:
+            next_due = self._due_heap[0][0] if self._due_heap else math.inf
+            if self._always_check:
+                next_due = None
+        if event_driven and next_due is not None:
+            shut_due = self._get_cond_change(self.session.config.shut_cond)
+            next_due = min(next_due, shut_due) if shut_due is not None else None
+        self._next_due = next_due
         self.n_cycles += 1
 
+    async def _wait_task_starts(self, tasks):
+        """Wait till the started processes of the tasks have logged
+        running (or the setup timeout has passed)"""
+        pending = [task for task in tasks if task._is_start_pending()]
+        deadline = time.monotonic() + self._setup_timeout
+        while pending:
+            await self._wait_log_records(timeout=min(0.1, max(deadline - time.monotonic(), 0)))
+            self.handle_logs()
+            is_timeout = time.monotonic() >= deadline
+            for task in pending:
+                self._check_task_setup(task, is_timeout=is_timeout)
+            pending = [task for task in pending if task._is_start_pending()]
+
+    async def _wait_log_records(self, timeout:float):
+        "Wait till there are records in the log queue (or timeout)"
+        if self._log_reader is not None:
+            # The records are handled by the reader
+            self._flag_logs.clear()
+            try:
+                await asyncio.wait_for(self._flag_logs.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            return
+        loop = asyncio.get_running_loop()
+        arrived = loop.create_future()
+        try:
+            fd = self._log_queue._reader.fileno()
+            loop.add_reader(fd, lambda: arrived.done() or arrived.set_result(None))
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            # Event loop does not support readers (ie. Windows)
+            await asyncio.sleep(0.001)
+            return
+        try:
+            await asyncio.wait_for(arrived, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(fd)
+
+    def _check_task_setup(self, task:Task, is_timeout:bool=False):
+        """Check whether the processes of the task crashed before logging
+        running (or did not log it within the setup timeout)"""
+        for run in task._run_stack:
+            if not (run.is_process and task._is_run_pending(run)):
+                continue
+            error = None
+            if isinstance(run.task, PoolRun):
+                # The run may have finished in the worker but
+                # the records are still coming
+                run.task.worker.poll()
+                error = run.task.error
+                has_crashed = error is not None or not run.task.worker.process.is_alive()
+            else:
+                has_crashed = not run.is_alive()
+            if has_crashed or is_timeout:
+                # There will be no "run" log record thus ending the task gracefully
+                run.event_running.set()
+                task.logger.critical(f"Task '{task.name}' crashed in setup", extra={"action": "fail"})
+                if error is not None:
+                    exc = TaskSetupError(f"Task '{task.name}' crashed in the worker:\n{error}")
+                elif not has_crashed:
+                    exc = TaskSetupError(f"Task '{task.name}' process did not start in {self._setup_timeout} seconds")
+                else:
+                    exc = TaskSetupError(f"Task '{task.name}' process crashed silently")
+                self.logger.error(f"Task '{task.name}' crashed outside execution.", exc_info=exc)
+                if not self.session.config.silence_task_prerun:
+                    raise exc
+
+    def _get_task_due(self, task:Task) -> Optional[float]:
+        "Get the time (timestamp) when the task needs to be inspected next (None if unknown)"
+        if task.batches or task.force_termination:
+            return None
+
+        due = math.inf
+        if task.is_alive():
+            if task.get_execution() == "process":
+                if self._log_reader is None:
+                    # The logs of processes are read from the queue
+                    # thus they don't wake the scheduler
+                    return None
+                # The records wake the scheduler but
+                # a crashed process might not log
+                self._watch_processes(task)
+            end_due = self._get_cond_change(task.end_cond, task=task)
+            if end_due is None:
+                return None
+            due = min(due, end_due)
+            if not task.permanent:
+                timeout = task.timeout if task.timeout else self.session.config.timeout
+                timeout_sec = timeout.total_seconds()
+                for run in task._run_stack:
+                    if run.is_alive():
+                        due = min(due, run.start + timeout_sec)
+
+        if not task.disabled and not (task.on_startup or task.on_shutdown):
+            start_due = self._get_cond_change(task.start_cond, task=task)
+            if start_due is None:
+                return None
+            due = min(due, start_due)
+        return due
+
+    def _get_dirty_tasks(self) -> list:
+        "Get tasks that need to be evaluated in the cycle"
+        session_tasks = self.session.tasks
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+        if self._dirty_all:
+            dirty.update(session_tasks)
+            self._dirty_all = False
+        dirty.update(self._always_check)
+
+        # Tasks which conditions' may have changed due to time
+        now = self.session.get_time()
+        heap = self._due_heap
+        while heap and heap[0][0] <= now:
+            due, _, task = heapq.heappop(heap)
+            if self._task_due.get(task) == due:
+                dirty.add(task)
+
+        tasks = []
+        for task in dirty:
+            if task in session_tasks:
+                tasks.append(task)
+            else:
+                # Task removed from the session
+                self._unindex_task(task)
+        return sorted(tasks, key=lambda task: getattr(task, "priority", 0), reverse=True)
+
+    def _set_dirty(self, task:Task):
+        "Mark the task and the tasks depending on it to be evaluated (thread-safe)"
+        if self.session.config.dirty_evaluation:
+            with self._dirty_lock:
+                self._dirty.add(task)
+                self._dirty.update(self._dependents.get(task.name, ()))
+        self._wake()
+
+    def _index_task(self, task:Task):
+        "Register the inputs and the next due of the task's conditions"
+        start_cond = task.start_cond
+        prev_cond, prev_inputs = self._task_inputs.get(task, (None, None))
+        if prev_cond is not start_cond:
+            for name in prev_inputs or ():
+                self._dependents[name].discard(task)
+            inputs = self._get_cond_inputs(start_cond, task=task)
+            for name in inputs or ():
+                self._dependents.setdefault(name, set()).add(task)
+            self._task_inputs[task] = (start_cond, inputs)
+        else:
+            inputs = prev_inputs
+
+        due = self._get_task_due(task)
+        if inputs is None or due is None or task.is_alive():
+            # Cannot know when the task needs to be evaluated
+            self._always_check.add(task)
+            self._task_due.pop(task, None)
+            return
+        self._always_check.discard(task)
+        self._task_due[task] = due
+        if due != math.inf:
+            heapq.heappush(self._due_heap, (due, id(task), task))
+
+    def _reset_index(self):
+        "Reset the dependency index (all tasks are evaluated in next cycle)"
+        self._dirty_all = True
+        self._always_check = set()
+        self._task_inputs = {}
+        self._dependents = {}
+        self._task_due = {}
+        self._due_heap = []
+
+    def _unindex_task(self, task:Task):
+        _, inputs = self._task_inputs.pop(task, (None, None))
+        for name in inputs or ():
+            self._dependents[name].discard(task)
+        self._always_check.discard(task)
+        self._task_due.pop(task, None)
+
+    def _get_log_task_names(self, tasks:List[Task]) -> Optional[Set[str]]:
+        "Get the names of the tasks which logs the evaluation of the tasks may query (None if unknown)"
+        names = set()
+        for task in tasks:
+            names.add(task.name)
+            indexed = self._task_inputs.get(task)
+            if indexed is not None and indexed[0] is task.start_cond:
+                inputs = indexed[1]
+            else:
+                inputs = self._get_cond_inputs(task.start_cond, task=task)
+            end_inputs = self._get_cond_inputs(task.end_cond, task=task)
+            if inputs is None or end_inputs is None:
+                return None
+            names.update(inputs)
+            names.update(end_inputs)
+        return names
+
+    def _get_cond_inputs(self, cond:Optional[BaseCondition], task:Task=None) -> Optional[set]:
+        if cond is None:
+            return set()
+        try:
+            return cond.get_inputs(task=task, session=self.session)
+        except Exception:
+            # Cannot determine, the condition is always evaluated
+            self.logger.debug(f"Could not determine inputs of condition '{cond}'", exc_info=True)
+            return None
+
+    def _get_cond_change(self, cond:Optional[BaseCondition], task:Task=None) -> Optional[float]:
+        if cond is None:
+            return math.inf
+        try:
+            return cond.get_next_change(task=task, session=self.session)
+        except Exception:
+            # Cannot determine, the condition is polled
+            self.logger.debug(f"Could not determine next change of condition '{cond}'", exc_info=True)
+            return None
+
+    def _wake(self):
+        "Wake up the scheduler from the hibernation (thread-safe)"
+        flag = self._flag_wake
+        if flag is None:
+            return
+        try:
+            is_same_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            is_same_loop = False
+        if is_same_loop:
+            flag.set()
+        else:
+            try:
+                self._loop.call_soon_threadsafe(flag.set)
+            except RuntimeError:
+                # Loop already closed
+                pass
+
     def check_shut_cond(self, cond: Optional[BaseCondition]) -> bool:
         # Note that failure in scheduler shut_cond always crashes the system
         if cond is None:
@@ -242,6 +561,9 @@ class Scheduler(RedBase):
             has_free_processors = self.has_free_processors()
             if not has_free_processors:
                 return False
+            if task._is_start_pending():
+                # Previous process has not yet started
+                return False
         if execution in ("thread", "async", "process"):
             if task.multilaunch is None:
                 allow_multilaunch = self.session.config.multilaunch
@@ -285,16 +607,126 @@ class Scheduler(RedBase):
                     task._handle_return(return_value)
                     del record.__return__
                 self._log_task(task, "log_record", record)
+                self._set_dirty(task)
 
-    async def _hibernate(self):
-        """Go to sleep and wake up when next task can be executed."""
+    def _start_log_reader(self):
+        "Start handling the log records in the event loop as they arrive"
+        self._flag_logs = asyncio.Event()
+        self._log_error = None
+        try:
+            fd = self._log_queue._reader.fileno()
+            self._loop.add_reader(fd, self._on_log_records)
+        except (AttributeError, NotImplementedError, OSError, ValueError):
+            # Event loop does not support readers (ie. Windows)
+            # thus the queue is polled in the cycles
+            self._log_reader = None
+        else:
+            self._log_reader = fd
+
+    def _stop_log_reader(self):
+        if self._log_reader is not None:
+            self._loop.remove_reader(self._log_reader)
+            self._log_reader = None
+        for sentinel in self._watched_processes:
+            self._loop.remove_reader(sentinel)
+        self._watched_processes = set()
+
+    def _on_log_records(self):
+        "Handle the records in the log queue (called by the event loop)"
+        try:
+            self.handle_logs()
+        except Exception as exc:
+            # Cannot raise in the event loop callback,
+            # raised in the cycle instead
+            if self._log_error is None:
+                self._log_error = exc
+            self._wake()
+        self._flag_logs.set()
+
+    def _watch_processes(self, task:Task):
+        "Wake up the scheduler when a process of the task exits"
+        for run in task._run_stack:
+            if not run.is_process:
+                continue
+            sentinel = run.task.sentinel
+            if sentinel in self._watched_processes:
+                continue
+            try:
+                # The process is passed to keep the sentinel open
+                self._loop.add_reader(sentinel, self._on_process_exit, sentinel, task, run.task)
+            except (NotImplementedError, OSError, ValueError):
+                continue
+            self._watched_processes.add(sentinel)
+
+    def _on_process_exit(self, sentinel, task:Task, process):
+        self._loop.remove_reader(sentinel)
+        self._watched_processes.discard(sentinel)
+        self._set_dirty(task)
+
+    def check_log_errors(self):
+        "Raise the error occurred in handling the log records in the event loop or in the background"
+        exc, self._log_error = self._log_error, None
+        if exc is not None:
+            raise exc
+        writer = self.session._log_writer
+        if writer is not None:
+            errors = writer.pop_errors()
+            for record, exc in errors:
+                self.logger.error(f"Logging failed for task '{record.task_name}'", exc_info=exc)
+            if errors and not self.session.config.silence_task_logging:
+                record, exc = errors[0]
+                raise TaskLoggingError(f"Logging for task '{record.task_name}' failed.") from exc
+
+    def _start_log_writer(self):
+        "Start writing the task log records in the background (if buffered_logging)"
+        if self.session.config.buffered_logging:
+            writer = LogWriter(maxsize=self.session.config.log_buffer_size)
+            writer.start()
+            self.session._log_writer = writer
+
+    def _close_log_writer(self):
+        "Write the remaining task log records"
+        writer = self.session._log_writer
+        if writer is not None:
+            writer.close()
+
+    async def _hibernate(self, until:Optional[float]=None):
+        """Go to sleep and wake up when next task can be executed.
+
+        If ``until`` (timestamp) is given, sleep till then
+        or till the scheduler is woken up."""
         delay = self.session.config.cycle_sleep
-        if delay is not None:
+        flag = self._flag_wake
+        if flag is not None and self.session.config.event_driven:
+            if until is not None:
+                delay = self._get_sleep_time(until)
+                if self.session.config.tail_logs and self.session.config.cycle_sleep is not None:
+                    # Records of other processes do not wake up
+                    delay = min(delay, self.session.config.cycle_sleep) if delay is not None else self.session.config.cycle_sleep
+            elif delay is None:
+                delay = 0
+            try:
+                await asyncio.wait_for(flag.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+            flag.clear()
+        elif delay is not None:
             await asyncio.sleep(delay)
         else:
             # delay is None, sleep 0 to release the async execution
             await asyncio.sleep(0)
 
+    def _get_sleep_time(self, until:float) -> Optional[float]:
+        "Get seconds to sleep until the given timestamp (None for indefinitely)"
+        cycle_sleep = self.session.config.cycle_sleep
+        if self.session.config.time_func is not None:
+            # Custom time cannot be mapped to wall clock
+            # thus we cannot sleep longer than a cycle
+            return cycle_sleep or 0
+        if until == math.inf:
+            return None
+        return max(until - self.session.get_time(), 0)
+
     async def startup(self):
         """Start up the scheduler.
 
@@ -307,16 +739,21 @@ class Scheduler(RedBase):
 
         self.n_cycles = 0
         self.startup_time = self.session._get_datetime_now()
+        self._reset_index()
 
         self.logger.debug("Beginning startup sequence...")
+        self._start_log_writer()
+        if self.session.config.tail_logs:
+            # Records logged from now on are tailed
+            self._tail_cursors = {}
+            self._tail_logs()
+        if self.session.config.force_status_from_logs:
+            # The runs are tracked from the records logged
+            # from now on (the previous runs have crashed)
+            for task in self.tasks:
+                task._open_runs = {}
+        self._set_cached(self.tasks)
         for task in self.tasks:
-            try:
-                task.set_cached()
-            except TaskLoggingError:
-                self.logger.exception(f"Failed setting cache for task '{task.name}'")
-                if not self.session.config.silence_task_logging:
-                    raise
-            
             if task.on_startup:
                 if isinstance(task.start_cond, AlwaysFalse) and not task.disabled:
                     # Make sure the tasks run if start_cond not set
@@ -324,10 +761,111 @@ class Scheduler(RedBase):
 
                 if self.is_task_runnable(task):
                     await self.run_task(task)
+        await self._wait_task_starts(self.tasks)
 
         hooker.postrun()
         self.logger.info("Startup complete.")
 
+    def _set_cached(self, tasks:List[Task]):
+        "Restore the cached statuses of the tasks from the logs"
+        start = time.perf_counter()
+        latest = self._get_latest_actions(tasks)
+        for task in tasks:
+            try:
+                task.set_cached(latest.get(task))
+            except TaskLoggingError:
+                self.logger.exception(f"Failed setting cache for task '{task.name}'")
+                if not self.session.config.silence_task_logging:
+                    raise
+        elapsed = time.perf_counter() - start
+        self.logger.debug(f"Restored the statuses of {len(tasks)} tasks in {elapsed:.3f} seconds")
+
+    def _get_task_repos(self, tasks:List[Task]) -> Dict[int, Tuple[BaseRepo, List[Task]]]:
+        "Group the tasks by their log repositories"
+        repos = {}
+        for task in tasks:
+            logger = TaskAdapter(logging.getLogger(task.logger_name), task=task, ignore_warnings=True)
+            try:
+                repo = logger._get_repo()
+            except AttributeError:
+                # Not readable
+                continue
+            repos.setdefault(id(repo), (repo, []))[1].append(task)
+        return repos
+
+    def _get_session_task_repos(self) -> Dict[int, Tuple[BaseRepo, Dict[str, Task]]]:
+        "Group the tasks of the session by their log repositories (cached till the tasks or the handlers change)"
+        session = self.session
+        prev_tasks, loggers, repos = self._task_repos
+        is_cached = (
+            # Session resets this if the tasks change, the rest if modified directly
+            prev_tasks is not None
+            and prev_tasks[0] is session.tasks and prev_tasks[1] == len(session.tasks)
+            and all(logger.handlers is handlers and len(handlers) == n for logger, handlers, n in loggers)
+        )
+        if not is_cached:
+            repos = {
+                repo_id: (repo, {task.name: task for task in repo_tasks})
+                for repo_id, (repo, repo_tasks) in self._get_task_repos(session.tasks).items()
+            }
+            loggers = [
+                (logger, logger.handlers, len(logger.handlers))
+                for logger in {logging.getLogger(task.logger_name) for task in session.tasks}
+            ]
+            self._task_repos = ((session.tasks, len(session.tasks)), loggers, repos)
+        return repos
+
+    def _get_latest_actions(self, tasks:List[Task]) -> Dict[Task, Dict[str, float]]:
+        "Get the latest actions of the tasks with one query per log repository"
+        latest = {}
+        for repo, repo_tasks in self._get_task_repos(tasks).values():
+            try:
+                actions = get_latest_actions(repo, task_names=[task.name for task in repo_tasks])
+            except Exception:
+                # Tasks read their logs themselves
+                self.logger.debug("Could not query the latest actions in bulk", exc_info=True)
+                continue
+            for task in repo_tasks:
+                latest[task] = actions.get(task.name, {})
+        return latest
+
+    def _tail_logs(self):
+        "Update the statuses of the tasks from the records logged after the previous cycle"
+        cursors = self._tail_cursors
+        for repo_id, (repo, repo_tasks) in self._get_session_task_repos().items():
+            prev_repo, cursor = cursors.get(repo_id, (None, None))
+            if prev_repo is not repo:
+                # New repo, only the records from now on
+                cursor = None
+            try:
+                rows, cursor = tail_actions(repo, cursor)
+            except Exception:
+                self.logger.exception("Could not read the new log records")
+                continue
+            cursors[repo_id] = (repo, cursor)
+            for task_name, action, created in rows:
+                task = repo_tasks.get(task_name)
+                if task is not None and task._tail_action(action, created):
+                    self._set_dirty(task)
+
+    def _get_pool(self) -> ProcessPool:
+        "Get (or create) the pool of worker processes"
+        if self._pool is None:
+            config = self.session.config
+            self._pool = ProcessPool(
+                size=config.process_pool_size if config.process_pool_size is not None else config.max_process_count,
+                log_queue=self._log_queue,
+                daemon=config.tasks_as_daemon,
+                max_runs=config.process_pool_max_runs,
+                max_memory=config.process_pool_max_memory,
+            )
+        return self._pool
+
+    def _close_pool(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
     def has_free_processors(self) -> bool:
         """Whether the Scheduler has free processors to
         allocate more tasks."""
@@ -352,6 +890,7 @@ class Scheduler(RedBase):
 
                 if self.is_task_runnable(task):
                     await self.run_task(task)
+        await self._wait_task_starts(self.tasks)
 
     async def _shut_down_tasks(self, traceback=None, exception=None):
         non_fatal_excs = (SchedulerRestart,) # Exceptions that are allowed to have graceful exit
@@ -426,9 +965,14 @@ class Scheduler(RedBase):
                 # Finally check logs once more
                 # and raise TaskLoggingError if has occurred in a thread and they are not silenced
                 self.handle_logs()
+                self._close_log_writer()
+                self.check_log_errors()
                 self.check_thread_errors()
         finally:
             # Running hooks and finalize the shutdown
+            self._close_log_writer()
+            self.session._log_writer = None
+            self._close_pool()
             hooker.postrun()
             self.is_alive = False
             self.logger.info("Shutdown completed. Good bye.")
@@ -482,12 +1026,14 @@ class Scheduler(RedBase):
             self._flag_enabled.clear()
         else:
             self._flag_enabled.set()
+        self._wake()
 
     def set_shut_down(self):
         """Shut down the scheduler. Useful to shut down the
         scheduler in a controller task."""
         self.on_hold = False # In case was set to wait
         self._flag_shutdown.set()
+        self._wake()
 
 # Logging
     @property
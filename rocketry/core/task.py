@@ -11,6 +11,7 @@ from types import FunctionType, TracebackType
 import warnings
 from copy import copy
 from abc import abstractmethod
+import itertools
 import multiprocessing
 import threading
 from queue import Empty
@@ -31,6 +32,7 @@ from rocketry.pybox.time import to_timedelta
 from rocketry.core.utils import is_pickleable, filter_keyword_args, is_main_subprocess
 from rocketry.exc import SchedulerRestart, SchedulerExit, TaskInactionException, TaskTerminationException, TaskLoggingError, TaskSetupError
 from rocketry.core.hook import _Hooker
+from rocketry.core.pool import PoolRun
 from rocketry.log import QueueHandler
 
 if TYPE_CHECKING:
@@ -38,6 +40,7 @@ if TYPE_CHECKING:
     from rocketry.core.parameters import BaseArgument
 
 _IS_WINDOWS = platform.system()
+_definition_versions = itertools.count()
 
 def _create_session():
     # To avoid circular imports
@@ -84,7 +87,7 @@ class TaskRun:
 
     @property
     def is_process(self) -> bool:
-        return isinstance(self.task, multiprocessing.Process)
+        return isinstance(self.task, (multiprocessing.Process, PoolRun))
 
     @property
     def is_async(self) -> bool:
@@ -249,6 +252,9 @@ class Task(RedBase, BaseModel):
     _run_stack: List[TaskRun] = PrivateAttr(default_factory=list)
     _lock: Optional[Type] = PrivateAttr(default=None)
     _main_alive: bool = PrivateAttr(default=False)
+    _logger: Optional[TaskAdapter] = PrivateAttr(default=None)
+    _open_runs: Optional[Dict[Any, float]] = PrivateAttr(default=None) # Run id (or start) --> start of the runs not finished (if maintained)
+    _definition_version: int = PrivateAttr(default_factory=lambda: next(_definition_versions)) # Changes when the task is modified (not the runtime state)
 
     _mark_running = False
 
@@ -299,8 +305,22 @@ class Task(RedBase, BaseModel):
 
     @property
     def logger(self):
-        logger = logging.getLogger(self.logger_name)
-        return TaskAdapter(logger, task=self)
+        adapter = self._logger
+        if adapter is None or not self._is_logger_cached(adapter):
+            logger = logging.getLogger(self.logger_name)
+            adapter = TaskAdapter(logger, task=self)
+            self._logger = adapter
+        # Records are written in the background if buffered_logging
+        adapter._writer = getattr(self.session, "_log_writer", None)
+        return adapter
+
+    def _is_logger_cached(self, adapter:TaskAdapter) -> bool:
+        "Whether the cached adapter is still valid (same task and logger, and readable)"
+        return (
+            adapter.task_name == self.name
+            and logging.Logger.manager.loggerDict.get(self.logger_name) is adapter.logger
+            and adapter._find_repo() is not None
+        )
 
     def __init__(self, **kwargs):
 
@@ -387,6 +407,46 @@ class Task(RedBase, BaseModel):
     def __hash__(self):
         return id(self)
 
+    def __setattr__(self, name, value):
+        prev_value = self.__dict__.get(name)
+        super().__setattr__(name, value)
+        if name == "name" and prev_value != value and self.session is not None:
+            self.session._rename_task(self, prev_value)
+        if not name.startswith("_") and prev_value is not value:
+            # The task has changed thus scheduler
+            # may need to check it and the pooled
+            # workers need the new definition
+            self._definition_version = next(_definition_versions)
+            self._wake_scheduler()
+
+    def _set_state(self, name:str, value):
+        """Set a runtime state field (ie. status) without
+        validation. Used in the scheduling where the values
+        are known to be valid."""
+        prev_value = self.__dict__.get(name)
+        self.__dict__[name] = value
+        self.__fields_set__.add(name)
+        if prev_value is not value:
+            self._wake_scheduler()
+        elif name == "status":
+            # Logged thus the conditions depending on
+            # the task may have changed even if the
+            # status is the same
+            self._invalidate_cycle()
+
+    def _invalidate_cycle(self):
+        session = self.__dict__.get("session")
+        if session is not None:
+            session._invalidate_cycle(self.__dict__.get("name"))
+
+    def _wake_scheduler(self):
+        "Wake up the scheduler (if sleeping) to check the task"
+        self._invalidate_cycle()
+        session = self.__dict__.get("session")
+        scheduler = getattr(session, "scheduler", None)
+        if scheduler is not None:
+            scheduler._set_dirty(self)
+
     def run(self, _params:Union[Parameters, Dict]=None, **kwargs):
         """Set the task running (with given parameters)
 
@@ -409,11 +469,12 @@ class Task(RedBase, BaseModel):
         if kwargs:
             params.update(kwargs)
         self.batches.append(params)
+        self._wake_scheduler()
 
     def delete(self):
         """Delete the task from the session.
         Overried if needed additional cleaning."""
-        self.session.tasks.remove(self)
+        self.session.remove_task(self)
 
     def terminate(self):
         "Terminate the task"
@@ -478,7 +539,7 @@ class Task(RedBase, BaseModel):
         execution = self.get_execution()
         task_run = TaskRun(start=self.session.get_time(), task=None)
         try:
-            self.force_run = False
+            self._set_state("force_run", False)
             params = self.get_extra_params(params, execution=execution)
             direct_params = self._get_direct_params()
 
@@ -716,25 +777,51 @@ class Task(RedBase, BaseModel):
         log_queue = session.scheduler._log_queue if log_queue is None else log_queue
 
         daemon = self.daemon if self.daemon is not None else session.config.tasks_as_daemon
-        process = multiprocessing.Process(
-            target=self._run_as_process,
-            kwargs=dict(
-                params=params, direct_params=direct_params,
-                task_run=task_run,
-                queue=log_queue,
-                config=session.config,
-                exec_hooks=self._get_hooks("task_execute")
-            ),
-            daemon=daemon
+        kwargs = dict(
+            params=params, direct_params=direct_params,
+            task_run=task_run,
+            config=session.config,
+            exec_hooks=self._get_hooks("task_execute")
         )
-        task_run.task = process
 
-        self._run_stack.append(task_run)
-        self._mark_running = True # needed in pickling
+        process = None
+        scheduler = session.scheduler
+        use_pool = (
+            session.config.process_pool
+            and log_queue is scheduler._log_queue
+            and daemon == session.config.tasks_as_daemon
+        )
+        if use_pool:
+            try:
+                process = scheduler._get_pool().submit(self, kwargs)
+            except Exception:
+                # Cannot be sent to a worker (ie. not picklable)
+                # thus using a new process instead
+                process = None
+
+        # Set when the process has logged running
+        task_run.event_running = threading.Event()
+        if process is not None:
+            task_run.task = process
+            self._run_stack.append(task_run)
+        else:
+            process = multiprocessing.Process(
+                target=self._run_as_process,
+                kwargs=dict(queue=log_queue, **kwargs),
+                daemon=daemon
+            )
+            task_run.task = process
+
+            self._run_stack.append(task_run)
+            self._mark_running = True # needed in pickling
 
-        process.start()
-        self._mark_running = False
+            process.start()
+            self._mark_running = False
 
+        if scheduler.is_alive and log_queue is scheduler._log_queue:
+            # The scheduler handles the record of the start
+            # thus we don't need to block here
+            return log_queue
         self._lock_to_run_log(log_queue)
         return log_queue
 
@@ -913,17 +1000,47 @@ class Task(RedBase, BaseModel):
         self._last_inaction = None
         self._last_crash = None
 
-    def set_cached(self):
-        "Update cached statuses"
-        # We get the logger here to not flood with warnings if missing repo
-        logger = self.logger
+    def _get_runtime_state(self) -> Dict[str, Any]:
+        "Get the status and the times of the latest actions (sent with pooled runs)"
+        state = {
+            f"_last_{action}": getattr(self, f"_last_{action}")
+            for action in ('run', 'success', 'fail', 'terminate', 'inaction', 'crash')
+        }
+        state["status"] = self.status
+        return state
+
+    def _load_runtime_state(self, state:Dict[str, Any]):
+        "Set the status and the times of the latest actions (in a pooled worker)"
+        for name, value in state.items():
+            if name == "status":
+                self.__dict__[name] = value
+            else:
+                setattr(self, name, value)
+
+    def set_cached(self, latest:Optional[Dict[str, float]]=None):
+        """Update cached statuses
+
+        Parameters
+        ----------
+        latest : dict, optional
+            Timestamps of the latest actions of the task
+            (ie. ``{"run": 1640995200.0, "success": 1640995260.0}``).
+            Missing actions have never occurred. If not given,
+            the timestamps are read from the logs.
+        """
+        if latest is not None:
+            for action in ('run', 'success', 'fail', 'terminate', 'inaction', 'crash'):
+                setattr(self, f"_last_{action}", latest.get(action))
+        else:
+            # We get the logger here to not flood with warnings if missing repo
+            logger = self.logger
 
-        self._last_run = self._get_last_action("run", from_logs=True, logger=logger)
-        self._last_success = self._get_last_action("success", from_logs=True, logger=logger)
-        self._last_fail = self._get_last_action("fail", from_logs=True, logger=logger)
-        self._last_terminate = self._get_last_action("terminate", from_logs=True, logger=logger)
-        self._last_inaction = self._get_last_action("inaction", from_logs=True, logger=logger)
-        self._last_crash = self._get_last_action("crash", from_logs=True, logger=logger)
+            self._last_run = self._get_last_action("run", from_logs=True, logger=logger)
+            self._last_success = self._get_last_action("success", from_logs=True, logger=logger)
+            self._last_fail = self._get_last_action("fail", from_logs=True, logger=logger)
+            self._last_terminate = self._get_last_action("terminate", from_logs=True, logger=logger)
+            self._last_inaction = self._get_last_action("inaction", from_logs=True, logger=logger)
+            self._last_crash = self._get_last_action("crash", from_logs=True, logger=logger)
 
         times = {
             name: getattr(self, f"_last_{name}")
@@ -939,7 +1056,39 @@ class Task(RedBase, BaseModel):
                 # There has been a sudden crash
                 self.log_crash()
             else:
-                self.status = status
+                self._set_state("status", status)
+
+    def _tail_action(self, action:str, created:float) -> bool:
+        """Update the cached statuses with an action read from the logs
+        (ie. logged by another process). Returns whether anything changed."""
+        last = getattr(self, f"_last_{action}", None)
+        if last is not None and last >= created:
+            # Already known
+            return False
+        latest = max((
+            getattr(self, f"_last_{name}")
+            for name in ('run', 'success', 'fail', 'terminate', 'inaction', 'crash')
+            if getattr(self, f"_last_{name}") is not None
+        ), default=None)
+        setattr(self, f"_last_{action}", created)
+        self._update_open_runs(action, None, created)
+        if latest is None or created >= latest:
+            self._set_state("status", action)
+        return True
+
+    def _update_open_runs(self, action:str, run_id:Any, created:float):
+        """Update the table of the runs not finished (if maintained)
+        with a logged action. Finishes without run ID finish the
+        oldest run."""
+        open_runs = self._open_runs
+        if open_runs is None:
+            return
+        if action == "run":
+            open_runs[run_id if run_id is not None else created] = created
+        elif run_id is not None:
+            open_runs.pop(run_id, None)
+        elif open_runs:
+            del open_runs[next(iter(open_runs))]
 
     def get_default_name(self, **kwargs):
         """Create a name for the task when name was not passed to initiation of
@@ -965,6 +1114,22 @@ class Task(RedBase, BaseModel):
         """Whether the task has a live process."""
         return any(run.is_process and run.is_alive() for run in self._run_stack)
 
+    def _set_run_started(self, run_id=None) -> Optional[TaskRun]:
+        "Mark a process run started (its running is logged)"
+        for run in self._run_stack:
+            if run.is_process and self._is_run_pending(run) and (run_id is None or run.run_id == run_id):
+                run.event_running.set()
+                return run
+        return None
+
+    @staticmethod
+    def _is_run_pending(run:TaskRun) -> bool:
+        return run.event_running is not None and not run.event_running.is_set()
+
+    def _is_start_pending(self) -> bool:
+        "Whether a process of the task has not yet logged running"
+        return any(run.is_process and self._is_run_pending(run) for run in self._run_stack)
+
     def count_processes_taken(self) -> int:
         """Count number of processes the task takes"""
         return sum(run.is_process and run.is_alive() for run in self._run_stack)
@@ -1020,13 +1185,16 @@ class Task(RedBase, BaseModel):
         for run in self._run_stack:
             await self._terminate_run(run, reason=reason)
         self._clean_run_stack()
-        self.force_termination = False
+        self._set_state("force_termination", False)
         #self._run_stack = [] # Does not work with threads
 
     async def _terminate_run(self, run:TaskRun, reason=None):
         "Terminate the whole run stack"
         try:
             await run.terminate()
+            if run.is_process and run.event_running is not None:
+                # Terminated before it may have logged running
+                run.event_running.set()
         except asyncio.CancelledError:
             # Async tasks raise CancelledError if terminated
             self.log_termination(reason=reason, task_run=run)
@@ -1091,7 +1259,7 @@ class Task(RedBase, BaseModel):
         self._set_status("terminate", task_run, message=msg + f" ({reason})")
 
         # Reset event and force_termination (for threads)
-        self.force_termination = False
+        self._set_state("force_termination", False)
 
     def log_inaction(self, task_run:TaskRun=None):
         """Make a log that the task did nothing."""
@@ -1105,6 +1273,9 @@ class Task(RedBase, BaseModel):
         """Log the record with the logger of the task.
         Also sets the status according to the record.
         """
+        run = None
+        if record.action == "run":
+            run = self._set_run_started(getattr(record, "run_id", None))
         # Set last_run/last_success/last_fail etc.
         cache_attr = f"_last_{record.action}"
         record_time = record.created
@@ -1116,16 +1287,20 @@ class Task(RedBase, BaseModel):
                 # The task started and the run must be set
                 # even though the task partly failed already
                 setattr(self, cache_attr, record_time)
-                self.status = record.action
+                self._set_state("status", record.action)
             else:
                 # Logging is part of the task so even if the task
                 # function itself succeeded, the task failed
                 setattr(self, "_last_fail", record_time)
-                self.status = "fail"
+                self._set_state("status", "fail")
             raise TaskLoggingError(f"Logging for task '{self.name}' failed.") from exc
         else:
             setattr(self, cache_attr, record_time)
-            self.status = record.action
+            # The processes start concurrently thus the open runs
+            # are tracked by when the scheduler started them
+            run_start = run.start if run is not None else record_time
+            self._update_open_runs(record.action, getattr(record, "run_id", None), run_start)
+            self._set_state("status", record.action)
 
     def get_status(self) -> Literal['run', 'fail', 'success', 'terminate', 'inaction', None]:
         """Get latest status of the task."""
@@ -1185,14 +1360,15 @@ class Task(RedBase, BaseModel):
         except Exception as exc:
             if action == "run":
                 setattr(self, cache_attr, time_now)
-                self.status = action
+                self._set_state("status", action)
             else:
                 setattr(self, "_last_fail", time_now)
-                self.status = "fail"
+                self._set_state("status", "fail")
             raise TaskLoggingError(f"Logging for task '{self.name}' failed.") from exc
         else:
             setattr(self, cache_attr, time_now)
-            self.status = action
+            self._update_open_runs(action, extra["run_id"], time_now)
+            self._set_state("status", action)
 
     def get_last_success(self) -> datetime.datetime:
         """Get the lastest timestamp when the task succeeded."""
@@ -1262,6 +1438,13 @@ class Task(RedBase, BaseModel):
     def _get_last_action_from_log(self, action, logger=None):
         """Get last action timestamp from log"""
         logger = logger if logger is not None else self.logger
+        log_batch = getattr(self.session, "_log_batch", None)
+        if log_batch is not None:
+            try:
+                # Answered from the grouped query of the cycle
+                return log_batch.get_latest(logger, [action])
+            except AttributeError:
+                pass
         try:
             record = logger.get_latest(action=action)
         except AttributeError:
@@ -1300,6 +1483,7 @@ class Task(RedBase, BaseModel):
         priv_attrs['_process'] = None
         priv_attrs['_thread'] = None
         priv_attrs['_run_stack'] = None
+        priv_attrs['_logger'] = None
 
         # We also get rid of the conditions as if there is a task
         # containing an attr that cannot be pickled (like FuncTask
@@ -1367,6 +1551,65 @@ class Task(RedBase, BaseModel):
         # TimePeriod could not be determined
         return StaticInterval()
 
+    def next_intervals(self, n:Optional[int]=None, horizon=None):
+        """Get the next intervals in which the task is
+        expected to start (best estimate).
+
+        The time period is determined from the start
+        condition (ie. ``daily``, ``cron(...)``,
+        ``time_of_day.between(...)``, ``every(...)`` and
+        their combinations). If it cannot be determined,
+        the task is expected to start any time.
+
+        Parameters
+        ----------
+        n : int, optional
+            Maximum number of intervals.
+        horizon : str, datetime.timedelta, datetime.datetime, optional
+            Time span from now (or end time) to search.
+
+        Returns
+        -------
+        starts, ends : numpy.ndarray or list of float
+            Starts and ends of the intervals as timestamps.
+            NumPy arrays if NumPy is installed.
+        """
+        from rocketry.core.time import StaticInterval
+        period = self._get_cond_period(self.start_cond)
+        if period is None:
+            period = StaticInterval()
+        now = self.session._get_datetime_now()
+        return period.next_intervals(now, n=n, horizon=horizon)
+
+    def _get_cond_period(self, cond) -> Optional[TimePeriod]:
+        "Get time period in which the condition is true for the task (None if cannot be determined)"
+        from rocketry.core.condition import Any
+        from rocketry.core.time import All as AllTime, Any as AnyTime
+        from rocketry.conditions import TaskExecutable, TaskRunnable, IsPeriod
+        from rocketry.conditions.api import TimeCondWrapper
+        from rocketry.conditions.task.utils import TaskStatusMixin
+
+        if isinstance(cond, TimeCondWrapper):
+            cond = cond.get_cond()
+
+        task = getattr(cond, "task", None)
+        is_self = task is None or getattr(task, "name", task) == self.name
+        if isinstance(cond, (TaskExecutable, TaskRunnable)) and is_self:
+            return cond.period
+        if isinstance(cond, TaskStatusMixin) and is_self and cond._is_equal_zero():
+            # Ie. every("10 minutes")
+            return cond.period
+        if isinstance(cond, IsPeriod):
+            return cond.period
+        if isinstance(cond, All):
+            # The other conditions only restrict further
+            periods = [period for period in map(self._get_cond_period, cond) if period is not None]
+            return AllTime(*periods) if periods else None
+        if isinstance(cond, Any):
+            periods = list(map(self._get_cond_period, cond))
+            return AnyTime(*periods) if periods and None not in periods else None
+        return None
+
     @property
     def lock(self):
         # Lock is private in a sense that we want to hide it from
@@ -11,6 +11,7 @@ from .base import (
     always,
     never,
 )
+from .cache import PeriodCache
 
 
 #from .factory import period_factory
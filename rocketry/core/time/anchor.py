@@ -1,11 +1,17 @@
-from datetime import datetime
-from typing import ClassVar, Dict, List, Tuple, Union
+from datetime import datetime, timedelta, tzinfo
+from typing import ClassVar, Dict, List, Optional, Tuple, Union
 from abc import abstractmethod
 from dataclasses import dataclass
 
-from rocketry.pybox.time import to_microseconds, timedelta_to_str, datetime_to_dict, to_timedelta
+from rocketry.pybox.time import (
+    to_microseconds, timedelta_to_str, datetime_to_dict, to_timedelta,
+    to_timestamp, supports_wall, timestamp_to_wall, wall_to_timestamp, round_timestamp
+)
 from .base import Any, TimeInterval
 
+_WALL_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
 @dataclass(frozen=True, repr=False)
 class AnchoredInterval(TimeInterval):
     """Base class for interval for those that have
@@ -48,6 +54,7 @@ class AnchoredInterval(TimeInterval):
     _scope: ClassVar[str] = None # Scope of the full period. Ie. day, hour, second, microsecond
     _scope_max: ClassVar[int] = None # Max in microseconds of the
 
+    _scope_origin: ClassVar[Optional[int]] = None # Wall time (microseconds from 1970-01-01) of a start of the scope if the scope has fixed length
     _unit_resolution: ClassVar[int] = None # Microseconds of one unit (if start/end is int)
     _unit_names: ClassVar[List] = None
     _unit_mapping: ClassVar[Dict[str, int]] = {}
@@ -191,9 +198,6 @@ class AnchoredInterval(TimeInterval):
     def __contains__(self, dt) -> bool:
         "Whether dt is in the interval"
 
-        ms_start = self._start
-        ms_end = self._end
-
         if self.is_full():
             # As there is no time in between,
             # the interval is considered full
@@ -201,13 +205,7 @@ class AnchoredInterval(TimeInterval):
             return True
 
         ms = self.anchor_dt(dt) # In relative nanoseconds (removed more accurate than scope)
-
-        is_over_period = ms_start > ms_end # period is overnight, over weekend etc.
-        if not is_over_period:
-            # Note that the period is right opened (end point excluded)
-            return ms_start <= ms < ms_end
-        # Note that the period is right opened (end point excluded)
-        return ms >= ms_start or ms < ms_end
+        return self._contains_ms(ms)
 
     def is_full(self):
         "Whether every time belongs to the period (but there is still distinct intervals)"
@@ -396,6 +394,75 @@ class AnchoredInterval(TimeInterval):
 
         return dt + offset
 
+    def rollback_timestamp(self, ts:float, timezone:Optional[tzinfo]=None) -> Tuple[float, float]:
+        if self._scope_origin is None or not supports_wall(timezone):
+            return super().rollback_timestamp(ts, timezone=timezone)
+        # Computed in wall time (microseconds), same as
+        # rollback but without creating datetimes
+        now = timestamp_to_wall(ts, timezone)
+        ms_start = int(self._start)
+        ms = (now - self._scope_origin) % self._scope_max
+        start = self._prev_wall(now, ms, ms_start)
+        if self.is_full():
+            end = now
+            if start == end:
+                ms = (now - 1 - self._scope_origin) % self._scope_max
+                start = self._prev_wall(now - 1, ms, ms_start)
+        elif self._contains_ms(ms):
+            end = now
+        else:
+            end = self._prev_wall(now, ms, int(self._end))
+        return (
+            wall_to_timestamp(start, timezone),
+            round_timestamp(ts, timezone) if end == now else wall_to_timestamp(end, timezone)
+        )
+
+    def _next_intervals(self, dt:datetime, n:Union[int, float], until:float) -> Tuple[List[float], List[float]]:
+        timezone = dt.tzinfo
+        if self._scope_origin is None or not supports_wall(timezone):
+            return super()._next_intervals(dt, n, until)
+        # Computed in wall time (microseconds), the
+        # intervals repeat every scope
+        wall = (dt.replace(tzinfo=None) - _WALL_EPOCH) // _MICROSECOND
+        ms_start = int(self._start)
+        length = (int(self._end) - ms_start) % self._scope_max or self._scope_max
+        since_start = (wall - self._scope_origin - ms_start) % self._scope_max
+        start = wall - since_start
+        never = to_timestamp(self.max)
+
+        starts, ends = [], []
+        if since_start < length:
+            # Ongoing
+            starts.append(to_timestamp(dt))
+            ends.append(wall_to_timestamp(start + length, timezone))
+        start += self._scope_max
+        while len(starts) < n:
+            start_ts = wall_to_timestamp(start, timezone)
+            if start_ts >= until or start_ts >= never:
+                break
+            starts.append(start_ts)
+            ends.append(wall_to_timestamp(start + length, timezone))
+            start += self._scope_max
+        return starts, ends
+
+    def _prev_wall(self, wall:int, ms:int, ms_point:int) -> int:
+        "Get previous wall time on the point of the scope (as prev_start or prev_end)"
+        if ms < ms_point:
+            return wall + ms_point - ms - self._scope_max
+        return wall + ms_point - ms
+
+    def _contains_ms(self, ms:int) -> bool:
+        "Whether the microseconds of the scope are in the interval"
+        ms_start = self._start
+        ms_end = self._end
+
+        is_over_period = ms_start > ms_end # period is overnight, over weekend etc.
+        if not is_over_period:
+            # Note that the period is right opened (end point excluded)
+            return ms_start <= ms < ms_end
+        # Note that the period is right opened (end point excluded)
+        return ms >= ms_start or ms < ms_end
+
     def repr_ms(self, n:int):
         "Microseconds to representative format"
         return repr(n)
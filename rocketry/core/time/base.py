@@ -1,13 +1,17 @@
 import datetime
 from functools import reduce
+import math
 import time
 from abc import abstractmethod
-from typing import Callable, ClassVar, Dict, FrozenSet, List, Optional, Pattern, Union
+from typing import Callable, ClassVar, Dict, FrozenSet, List, Optional, Pattern, Sequence, Tuple, Union
 import itertools
 from dataclasses import dataclass, field
 
 from rocketry._base import RedBase
-from rocketry.pybox.time import to_datetime, to_timedelta, Interval
+from rocketry.pybox.time import (
+    to_datetime, to_timedelta, to_timestamp, Interval,
+    supports_wall, timestamp_to_wall, wall_to_timestamp, round_timestamp
+)
 
 PARSERS: Dict[Union[str, Pattern], Union[Callable, 'TimePeriod']] = {}
 
@@ -69,6 +73,106 @@ class TimePeriod(RedBase):
         "Get previous time interval of the period."
         raise NotImplementedError
 
+    def rollback_timestamp(self, ts:float, timezone:Optional[datetime.tzinfo]=None) -> Tuple[float, float]:
+        """Get previous time interval of the period as
+        timestamps. Same as ``rollback`` but the time and
+        the interval are timestamps (in the timezone).
+        Override to compute without datetimes."""
+        interval = self.rollback(datetime.datetime.fromtimestamp(ts, tz=timezone))
+        return to_timestamp(interval.left), to_timestamp(interval.right)
+
+    def contains_until(self, ts:float, timezone:Optional[datetime.tzinfo]=None) -> Tuple[bool, float]:
+        """Whether the timestamp is in the period and the
+        timestamp till which the answer stays the same
+        (the next start or end of the period)."""
+        dt = datetime.datetime.fromtimestamp(ts, tz=timezone)
+        return dt in self, self._get_valid_until(dt, ts)
+
+    def rollback_until(self, ts:float, timezone:Optional[datetime.tzinfo]=None) -> Tuple[float, Optional[float], float]:
+        """Get previous time interval of the period as
+        timestamps and the timestamp till which it stays
+        the same. The end is None if the interval is
+        ongoing (ends to the given time)."""
+        start, end = self.rollback_timestamp(ts, timezone=timezone)
+        valid_until = self._get_valid_until(datetime.datetime.fromtimestamp(ts, tz=timezone), ts)
+
+        # The interval of the next microsecond should be the
+        # same (the time is not on a joint of intervals)
+        next_ts = ts + 1e-6
+        if valid_until <= next_ts:
+            return start, end, ts
+        next_start, next_end = self.rollback_timestamp(next_ts, timezone=timezone)
+        if next_start != start:
+            return start, end, ts
+        if next_end == end:
+            return start, end, valid_until
+        if next_end == round_timestamp(next_ts, timezone) and end == round_timestamp(ts, timezone):
+            # Ongoing
+            return start, None, valid_until
+        return start, end, ts
+
+    def next_intervals(self, dt, n:Optional[int]=None, horizon=None) -> Tuple[Sequence[float], Sequence[float]]:
+        """Get the next intervals of the period as timestamps.
+
+        The intervals (including the ongoing one) are
+        searched from the given time onwards till
+        ``n`` intervals are found or the intervals start
+        after the horizon.
+
+        Parameters
+        ----------
+        dt : datetime.datetime, str
+            Time to search from.
+        n : int, optional
+            Maximum number of intervals.
+        horizon : str, datetime.timedelta, datetime.datetime, optional
+            Time span from ``dt`` (or end time) to search.
+
+        Returns
+        -------
+        starts, ends : numpy.ndarray or list of float
+            Starts and ends of the intervals as timestamps.
+            NumPy arrays if NumPy is installed.
+        """
+        if n is None and horizon is None:
+            raise ValueError("Either n or horizon must be given")
+        dt = to_datetime(dt)
+        if horizon is None:
+            until = math.inf
+        elif isinstance(horizon, datetime.datetime):
+            until = to_timestamp(horizon)
+        else:
+            until = to_timestamp(dt) + to_timedelta(horizon).total_seconds()
+        n = math.inf if n is None else n
+        starts, ends = self._next_intervals(dt, n, until) if n > 0 else ([], [])
+        return _to_arrays(starts, ends)
+
+    def _next_intervals(self, dt:datetime.datetime, n:Union[int, float], until:float) -> Tuple[List[float], List[float]]:
+        "Get the starts and ends of the next intervals (override to compute in batch)"
+        starts, ends = [], []
+        never = to_timestamp(self.max)
+        while len(starts) < n:
+            interval = self.rollforward(dt)
+            start = to_timestamp(interval.left)
+            if start >= until or start >= never:
+                break
+            starts.append(start)
+            ends.append(to_timestamp(interval.right))
+            dt = interval.right if interval.right > interval.left else interval.right + self.resolution
+        return starts, ends
+
+    def _get_valid_until(self, dt:datetime.datetime, ts:float) -> float:
+        "Get the timestamp of the next start or end of the period after dt (ts if not fixed)"
+        if not self._has_fixed_boundaries():
+            return ts
+        interval = self.rollforward(dt)
+        start = to_timestamp(interval.left)
+        return start if start > to_timestamp(dt) else to_timestamp(interval.right)
+
+    def _has_fixed_boundaries(self) -> bool:
+        "Whether the starts and ends of the period are fixed (do not move with the time)"
+        return False
+
 class TimeInterval(TimePeriod):
     """Base for all time intervals
 
@@ -125,6 +229,9 @@ class TimeInterval(TimePeriod):
         "Whether every time belongs to the period (but there is still distinct intervals)"
         return False
 
+    def _has_fixed_boundaries(self) -> bool:
+        return True
+
     def rollforward(self, dt) -> datetime.datetime:
         "Get next time interval of the period"
 
@@ -229,6 +336,14 @@ class TimeDelta(TimePeriod):
         end = to_datetime(dt)
         return Interval(start, end)
 
+    def rollback_timestamp(self, ts:float, timezone:Optional[datetime.tzinfo]=None) -> Tuple[float, float]:
+        if type(self).rollback is not TimeDelta.rollback or not supports_wall(timezone):
+            return super().rollback_timestamp(ts, timezone=timezone)
+        # Computed in wall time (microseconds)
+        now = timestamp_to_wall(ts, timezone)
+        start = now - abs(self.past) // datetime.timedelta(microseconds=1)
+        return wall_to_timestamp(start, timezone), round_timestamp(ts, timezone)
+
     def rollforward(self, dt):
         "Get next interval (including currently ongoing)"
         end = dt + abs(self.future)
@@ -236,6 +351,16 @@ class TimeDelta(TimePeriod):
         end = to_datetime(end)
         return Interval(start, end)
 
+    def _next_intervals(self, dt:datetime.datetime, n:Union[int, float], until:float) -> Tuple[List[float], List[float]]:
+        # Consecutive windows of the length of the delta
+        length = (self.past or self.future).total_seconds()
+        if not length:
+            raise ValueError(f"Cannot get intervals of zero length delta: {self!r}")
+        first = to_timestamp(dt)
+        count = math.ceil((until - first) / length) if until != math.inf else n
+        starts = [first + i * length for i in range(int(min(n, count)))]
+        return starts, [start + length for start in starts]
+
     def __eq__(self, other):
         "Test whether self and other are essentially the same periods"
         is_same_class = isinstance(self, type(other))
@@ -271,8 +396,21 @@ def get_overlapping(times):
 
 @dataclass(frozen=True)
 class All(TimePeriod):
+    """Intersection of time periods.
+
+    The intersection is searched iteratively by
+    rolling the periods that are behind to the
+    latest of the intervals (leapfrog) till the
+    intervals overlap. If they don't overlap within
+    the search horizon (``All.horizon``, by default
+    till ``TimePeriod.max`` or ``TimePeriod.min``),
+    the period never occurs and an empty interval
+    at ``TimePeriod.max`` (rolling forward) or at
+    ``TimePeriod.min`` (rolling back) is returned.
+    """
 
     periods: FrozenSet[TimePeriod]
+    horizon: ClassVar[Optional[datetime.timedelta]] = None
 
     def __init__(self, *args):
         if any(not isinstance(arg, TimePeriod) for arg in args):
@@ -299,65 +437,121 @@ class All(TimePeriod):
         # We solve this iteratively
         # 1. rollback
         # 2. check if everything overlaps
-        # 3. If not overlaps, take max and check again
+        # 3. If not overlaps, roll back the periods that
+        #    are not on the earliest end and check again
         # 4. If overlaps, get the period that overlaps
 
+        limit = self._get_limit(dt, self.min if self.horizon is None else dt - self.horizon)
+        periods = list(self.periods)
         intervals = [
             period.rollback(dt)
-            for period in self.periods
+            for period in periods
         ]
-        all_overlaps = all(a.overlaps(b) for a, b in itertools.combinations(intervals, 2))
-        if all_overlaps:
-            return reduce(lambda a, b: a & b, intervals)
-        # Not found, trying again with next period
-        # Example:
-        # Current:                     |
-        # A:         <-------------->
-        # B:         <---> <--->
-        # C:         <------>
-        # Next try:         |
-        next_dt = min(intervals, key=lambda x: x.right).right
-
-        opened = any(
-            interv.closed not in ('right', 'both')
-            for interv in intervals
-            if interv.right == next_dt
-        )
-        # TODO: If
-        if dt == next_dt:
-            next_dt -= self.resolution
-        return self.rollback(next_dt)
+        while True:
+            all_overlaps = all(a.overlaps(b) for a, b in itertools.combinations(intervals, 2))
+            if all_overlaps:
+                return reduce(lambda a, b: a & b, intervals)
+            # Not found, trying again with next period
+            # Example:
+            # Current:                     |
+            # A:         <-------------->
+            # B:         <---> <--->
+            # C:         <------>
+            # Next try:         |
+            next_dt = min(intervals, key=lambda x: x.right).right
+
+            if next_dt >= dt:
+                next_dt = dt - self.resolution
+            if next_dt < limit:
+                # Never occurs (in the horizon)
+                return Interval(self.min, self.min)
+            dt = next_dt
+            # Leapfrog: roll only the periods that
+            # are not on the time already
+            intervals = [
+                interv if dt in interv else period.rollback(dt)
+                for period, interv in zip(periods, intervals)
+            ]
 
     def rollforward(self, dt):
         # We solve this iteratively
         # 1. rollforward
         # 2. check if everything overlaps
-        # 3. If not overlaps, take max and check again
+        # 3. If not overlaps, roll forward the periods that
+        #    are not on the latest start and check again
         # 4. If overlaps, get the period that overlaps
 
+        limit = self._get_limit(dt, self.max if self.horizon is None else dt + self.horizon)
+        periods = list(self.periods)
         intervals = [
             period.rollforward(dt)
-            for period in self.periods
+            for period in periods
         ]
-        all_overlaps = all(a.overlaps(b) for a, b in itertools.combinations(intervals, 2))
-        if all_overlaps:
-            return reduce(lambda a, b: a & b, intervals)
-        # Not found, trying again with next period
-        # Example:
-        # Current: |
-        # A:         <-------------->
-        # B:         <---> <--->
-        # C:                 <------>
-        # Next try:          |
-        next_dt = max(intervals, key=lambda x: x.left).left
-        opened = any(
-            interv.closed not in ('left', 'both')
-            for interv in intervals
-            if interv.left == next_dt
-        )
-        if opened:
-            next_dt -= self.resolution
-        return self.rollforward(next_dt)
+        while True:
+            all_overlaps = all(a.overlaps(b) for a, b in itertools.combinations(intervals, 2))
+            if all_overlaps:
+                return reduce(lambda a, b: a & b, intervals)
+            # Not found, trying again with next period
+            # Example:
+            # Current: |
+            # A:         <-------------->
+            # B:         <---> <--->
+            # C:                 <------>
+            # Next try:          |
+            next_dt = max(intervals, key=lambda x: x.left).left
+            opened = any(
+                interv.closed not in ('left', 'both')
+                for interv in intervals
+                if interv.left == next_dt
+            )
+            if opened:
+                next_dt -= self.resolution
+            if next_dt <= dt:
+                # No progress
+                next_dt = dt + self.resolution
+            if next_dt > limit:
+                # Never occurs (in the horizon)
+                return Interval(self.max, self.max)
+            dt = next_dt
+            # Leapfrog: roll only the periods that
+            # are not on the time already
+            intervals = [
+                interv if dt in interv else period.rollforward(dt)
+                for period, interv in zip(periods, intervals)
+            ]
+
+    def _next_intervals(self, dt:datetime.datetime, n:Union[int, float], until:float) -> Tuple[List[float], List[float]]:
+        deltas = [period for period in self.periods if isinstance(period, TimeDelta)]
+        if not deltas:
+            return super()._next_intervals(dt, n, until)
+        # Intervals of the other periods split to
+        # windows of the delta (ie. every hour between
+        # 10:00 and 12:00)
+        delta = max(deltas, key=lambda delta: delta.past or delta.future)
+        others = [period for period in self.periods if not isinstance(period, TimeDelta)]
+        if not others:
+            return delta._next_intervals(dt, n, until)
+        length = (delta.past or delta.future).total_seconds()
+        if not length:
+            raise ValueError(f"Cannot get intervals of zero length delta: {delta!r}")
+        period = All(*others) if len(others) > 1 else others[0]
+        starts, ends = [], []
+        for start, end in zip(*period._next_intervals(dt, n, until)):
+            while start < end and start < until and len(starts) < n:
+                starts.append(start)
+                ends.append(min(start + length, end))
+                start += length
+        return starts, ends
+
+    def _get_limit(self, dt, limit:datetime.datetime) -> datetime.datetime:
+        if dt.tzinfo is not None and limit.tzinfo is None:
+            limit = limit.replace(tzinfo=dt.tzinfo)
+        elif dt.tzinfo is None and limit.tzinfo is not None:
+            limit = limit.replace(tzinfo=None)
+        return limit
+
+    def _has_fixed_boundaries(self) -> bool:
+        return all(period._has_fixed_boundaries() for period in self.periods)
 
     def __eq__(self, other):
         # self | other
@@ -432,6 +626,8 @@ class Any(TimePeriod):
         # 3. Repeat 2 until there is none
 
         # Sorting the closest first (right is oldest)
+        # and the longest first if they end the same
+        intervals = sorted(intervals, key=lambda x: x.left)
         intervals = sorted(intervals, key=lambda x: x.right, reverse=True)
 
         curr_interval = intervals.pop(0)
@@ -478,6 +674,9 @@ class Any(TimePeriod):
             curr_interval.right
         )
 
+    def _has_fixed_boundaries(self) -> bool:
+        return all(period._has_fixed_boundaries() for period in self.periods)
+
     def __eq__(self, other):
         # self | other
         # bitwise or
@@ -516,13 +715,18 @@ class StaticInterval(TimePeriod):
 
     def rollforward(self, dt):
         dt = to_datetime(dt)
-        end = to_datetime(self.end)
+        tz = dt.tzinfo
+        end = to_datetime(self.end, timezone=tz)
         if end < dt:
             # The actual interval is already gone
-            return Interval(self.max, self.max)
-        start = max(self.start, dt)
+            never = to_datetime(self.max, timezone=tz)
+            return Interval(never, never)
+        start = max(to_datetime(self.start, timezone=tz), dt)
         return Interval(start, end)
 
+    def _has_fixed_boundaries(self) -> bool:
+        return True
+
     @property
     def is_max_interval(self):
         return (self.start == self.min) and (self.end == self.max)
@@ -541,5 +745,21 @@ class StaticInterval(TimePeriod):
             return 'never'
         return f"StaticInterval(start={self.start!r}, end={self.end!r})"
 
+_numpy = None
+
+def _to_arrays(starts:List[float], ends:List[float]):
+    "Turn the starts and ends to NumPy arrays (if NumPy is installed)"
+    global _numpy
+    if _numpy is None:
+        # Imported on first use (and only attempted once)
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    if not _numpy:
+        return starts, ends
+    return _numpy.array(starts, dtype=float), _numpy.array(ends, dtype=float)
+
 always = StaticInterval()
 never = StaticInterval(StaticInterval.max, StaticInterval.max)
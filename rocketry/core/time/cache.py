@@ -0,0 +1,80 @@
+import datetime
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from rocketry.pybox.time import round_timestamp
+from .base import TimePeriod
+
+class PeriodCache:
+    """Cache of the evaluations of time periods.
+
+    Whether a time is in a period and the span of
+    the period's previous interval change only when
+    the period starts or ends. The evaluations are
+    stored with the time they are valid until and
+    the repeated evaluations are answered from the
+    cache till then. Periods which boundaries move
+    with the time (ie. ``TimeDelta``) are not cached.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of evaluations stored. The
+        oldest are removed first.
+    """
+
+    def __init__(self, maxsize:int=1024):
+        self.maxsize = maxsize
+        # key --> (computed at, valid until, value)
+        self._cache: Dict[Hashable, Tuple[float, float, Any]] = {}
+
+    def contains(self, period:TimePeriod, ts:float, timezone:Optional[datetime.tzinfo]=None) -> Tuple[bool, float]:
+        "Whether the timestamp is in the period and the timestamp till which it stays so (see TimePeriod.contains_until)"
+        key = ("contains", type(period), period, timezone)
+        item = self._get(key, ts, timezone)
+        if item is not None:
+            return item[2], item[1]
+        is_in, valid_until = period.contains_until(ts, timezone=timezone)
+        self._set(key, ts, valid_until, is_in)
+        return is_in, valid_until
+
+    def rollback(self, period:TimePeriod, ts:float, timezone:Optional[datetime.tzinfo]=None) -> Tuple[float, float]:
+        "Get previous time interval of the period as timestamps (see TimePeriod.rollback_timestamp)"
+        key = ("rollback", type(period), period, timezone)
+        item = self._get(key, ts, timezone)
+        if item is not None:
+            start, end = item[2]
+        else:
+            start, end, valid_until = period.rollback_until(ts, timezone=timezone)
+            self._set(key, ts, valid_until, (start, end))
+        if end is None:
+            # Ongoing interval
+            end = round_timestamp(ts, timezone)
+        return start, end
+
+    def clear(self):
+        "Remove the stored evaluations"
+        self._cache = {}
+
+    def _get(self, key, ts:float, timezone:Optional[datetime.tzinfo]) -> Optional[Tuple[float, float, Any]]:
+        try:
+            item = self._cache.get(key)
+        except TypeError:
+            # Period is not hashable
+            return None
+        # The periods are evaluated in microseconds
+        if item is not None and item[0] <= ts and round_timestamp(ts, timezone) < item[1]:
+            return item
+        return None
+
+    def _set(self, key, ts:float, valid_until:float, value):
+        if valid_until <= ts:
+            # Not valid after the time
+            return
+        try:
+            self._cache.pop(key, None)
+        except TypeError:
+            # Period is not hashable
+            return
+        if len(self._cache) >= self.maxsize:
+            del self._cache[next(iter(self._cache))]
+        self._cache[key] = (ts, valid_until, value)
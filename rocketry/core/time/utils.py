@@ -1,8 +1,10 @@
 
+import math
 import time
 import datetime
 from typing import Tuple
 
+from rocketry.pybox.time import round_timestamp, to_timestamp
 from .base import TimePeriod
 
 def get_period_span(period:'TimePeriod', session=None) -> Tuple[datetime.datetime, datetime.datetime]:
@@ -30,3 +32,51 @@ def get_period_span(period:'TimePeriod', session=None) -> Tuple[datetime.datetim
     start = interval.left
     end = interval.right
     return start, end
+
+def get_period_timestamps(period:'TimePeriod', session=None) -> Tuple[float, float]:
+    """Get the span of the period as timestamps.
+    Same as ``get_period_span`` but the built-in
+    time intervals and deltas are computed without
+    creating datetimes."""
+
+    # To prevent circular import
+    from rocketry.parse import parse_time
+
+    if period is None:
+        return to_timestamp(TimePeriod.min), to_timestamp(TimePeriod.max)
+    if isinstance(period, str):
+        period = parse_time(period)
+
+    if session is None:
+        now = time.time()
+        timezone = None
+    else:
+        now = session._get_timestamp_now()
+        timezone = session.config.timezone
+
+    if hasattr(period, "use_reference"):
+        # Period requires reference date
+        # (usually timedelta related)
+        # and it is current datetime
+        period = period.use_reference(datetime.datetime.fromtimestamp(now, tz=timezone))
+
+    cache = getattr(session, "_period_cache", None)
+    if cache is not None and session.config.cache_periods:
+        # Same till the next start or end of the period
+        start, end = cache.rollback(period, now, timezone=timezone)
+    else:
+        start, end = period.rollback_timestamp(now, timezone=timezone)
+    if getattr(session, "_cycle", None) is not None and end >= round_timestamp(now, timezone):
+        # Time is frozen in the cycle thus the ongoing
+        # span includes what is logged later in the cycle
+        end = math.inf
+    return start, end
+
+def get_next_boundary(period:'TimePeriod', dt:datetime.datetime) -> datetime.datetime:
+    """Get the next datetime after given datetime when the period
+    starts or ends. Useful to determine when a time based condition
+    may change its state."""
+    interval = period.rollforward(dt)
+    if interval.left > dt:
+        return interval.left
+    return interval.right
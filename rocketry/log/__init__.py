@@ -1,5 +1,6 @@
 from .handlers import QueueHandler
 from .log_record import (
     MinimalRecord, LogRecord, TaskLogRecord,
-    MinimalRunRecord, RunRecord, TaskRunRecord
+    MinimalRunRecord, RunRecord, TaskRunRecord,
+    CompactRecord, get_compact_class
 )
@@ -1,5 +1,7 @@
 import datetime
-from typing import Optional
+import sys
+from functools import lru_cache
+from typing import ClassVar, Optional, Tuple, Type
 from pydantic import BaseModel, Field, validator
 
 from rocketry.pybox.time import to_datetime, to_timedelta
@@ -71,3 +73,64 @@ class RunRecord(LogRecord):
 
 class TaskRunRecord(TaskLogRecord):
     run_id: Optional[str]
+
+class CompactRecord:
+    """Lightweight log record that is not validated.
+
+    Stores the fields of a record model in slots
+    as they were logged. Turned to the model (and
+    validated) only when read from the repository.
+    Use ``get_compact_class`` to create the class
+    for a model.
+    """
+    __slots__ = ()
+    _model: ClassVar[Type[BaseModel]]
+    _fields: ClassVar[Tuple[str, ...]]
+    _defaults: ClassVar[tuple]
+
+    def __init__(self, **kwargs):
+        for field, default in zip(self._fields, self._defaults):
+            setattr(self, field, kwargs.get(field, default))
+
+    @classmethod
+    def from_dict(cls, data:dict) -> 'CompactRecord':
+        "Create the record from a logged dict (ie. vars of logging.LogRecord)"
+        record = cls(**data)
+        action = data.get("action")
+        if isinstance(action, str):
+            # Shared by all records of the action
+            record.action = sys.intern(action)
+        return record
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError as exc:
+            raise KeyError(key) from exc
+
+    def dict(self) -> dict:
+        return {field: getattr(self, field) for field in self._fields}
+
+    def to_model(self) -> BaseModel:
+        "Turn the record to the model"
+        return self._model(**self.dict())
+
+    def __eq__(self, other):
+        if isinstance(other, CompactRecord):
+            return self._model is other._model and self.dict() == other.dict()
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+@lru_cache(maxsize=None)
+def get_compact_class(model:Type[BaseModel]) -> Type[CompactRecord]:
+    "Get lightweight record class with the fields of the model"
+    fields = tuple(model.__fields__)
+    return type(f"Compact{model.__name__}", (CompactRecord,), {
+        "__slots__": fields,
+        "_model": model,
+        "_fields": fields,
+        "_defaults": tuple(field.default for field in model.__fields__.values()),
+    })
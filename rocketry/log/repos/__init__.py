@@ -0,0 +1,3 @@
+from .memory import IndexedMemoryRepo
+from .retention import RetentionMemoryRepo
+from .sqlite import SQLiteRepo
@@ -0,0 +1,282 @@
+from bisect import bisect_left, bisect_right
+import heapq
+import math
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import BaseModel, PrivateAttr
+from redbird.oper import Between, In
+from redbird.repos import MemoryRepo
+
+from rocketry.log.log_record import CompactRecord, get_compact_class
+from rocketry.log.utils import tail_by_created
+
+class IndexedMemoryRepo(MemoryRepo):
+    """Memory repository for task logs indexed by
+    the time of the records.
+
+    Keeps the records of each task and action sorted
+    by their creation time so that the queries the
+    conditions commonly do (by ``task_name``, ``action``
+    and ``created``) and the queries for the latest,
+    first and count of records are answered with binary
+    search instead of scanning all the records. Other
+    queries scan the records as ``MemoryRepo`` does.
+
+    The logged records are stored as lightweight records
+    (``rocketry.log.CompactRecord``) that are validated
+    and turned to the model only when read.
+
+    Parameters
+    ----------
+    compact : bool
+        Whether to store the logged records as lightweight
+        records instead of validating them to the model
+        when logged. By default ``True``.
+    **kwargs : dict
+        See ``redbird.repos.MemoryRepo``.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from redbird.logging import RepoHandler
+        from rocketry.log import MinimalRecord
+        from rocketry.log.repos import IndexedMemoryRepo
+
+        handler = RepoHandler(repo=IndexedMemoryRepo(model=MinimalRecord))
+    """
+
+    # Index: task_name --> action --> (sorted times, items)
+    compact: bool = True
+
+    _index: Dict[str, Dict[str, Tuple[List[float], List]]] = PrivateAttr(default_factory=dict)
+    _indexed: Tuple[Optional[list], int] = PrivateAttr(default=(None, 0))
+
+    def to_item(self, obj):
+        if self.compact and isinstance(obj, dict) and issubclass(self.model, BaseModel):
+            # Validated when read
+            return get_compact_class(self.model).from_dict(obj)
+        return super().to_item(obj)
+
+    def data_to_item(self, data):
+        if isinstance(data, CompactRecord):
+            return data.to_model()
+        return super().data_to_item(data)
+
+    def insert(self, item):
+        self._check_index()
+        super().insert(item)
+        self._index_item(self.collection[-1])
+        self._indexed = (self.collection, len(self.collection))
+
+    def query_data(self, query:dict) -> Iterator:
+        spans = self._get_spans(query)
+        if spans is None:
+            yield from super().query_data(query)
+            return
+        if len(spans) == 1:
+            times, items, start, end = spans[0]
+            yield from items[start:end]
+            return
+        # Merging the records of the actions by time
+        sorted_items = heapq.merge(
+            *(zip(times[start:end], items[start:end]) for times, items, start, end in spans),
+            key=itemgetter(0)
+        )
+        for _, data in sorted_items:
+            yield data
+
+    def query_read_last(self, query:dict):
+        spans = self._get_spans(query)
+        if spans is None:
+            return super().query_read_last(query)
+        latest = max(
+            ((times[end - 1], items[end - 1]) for times, items, start, end in spans if end > start),
+            key=itemgetter(0),
+            default=None
+        )
+        return self.data_to_item(latest[1]) if latest is not None else None
+
+    def query_read_first(self, query:dict):
+        spans = self._get_spans(query)
+        if spans is None:
+            return super().query_read_first(query)
+        first = min(
+            ((times[start], items[start]) for times, items, start, end in spans if end > start),
+            key=itemgetter(0),
+            default=None
+        )
+        return self.data_to_item(first[1]) if first is not None else None
+
+    def query_count(self, query:dict) -> int:
+        spans = self._get_spans(query)
+        if spans is None:
+            return super().query_count(query)
+        return sum(end - start for _, _, start, end in spans)
+
+    def query_update(self, query:dict, values:dict):
+        super().query_update(query, values)
+        self._reindex()
+
+    def query_delete(self, query:dict):
+        super().query_delete(query)
+        self._reindex()
+
+    def query_latest_actions(self, task_names:Optional[Set[str]]=None) -> Iterator[Tuple[str, str, float]]:
+        "Get the latest time of each action of the tasks (see rocketry.log.utils.get_latest_actions)"
+        self._check_index()
+        for task_name, actions in self._iter_index(task_names):
+            for action, (times, _) in actions.items():
+                if times:
+                    yield task_name, action, times[-1]
+
+    def query_tail_actions(self, cursor=None) -> Tuple[List[Tuple[str, str, float]], Any]:
+        "Get the actions created after the cursor (see rocketry.log.utils.tail_actions)"
+        self._check_index()
+        start = cursor[0] if cursor is not None else -math.inf
+        rows = [
+            (task_name, action, created)
+            for task_name, actions in self._index.items()
+            for action, (times, _) in actions.items()
+            for created in times[bisect_left(times, start):]
+        ]
+        return tail_by_created(rows, cursor)
+
+    def query_action_times(self, actions:List[str], start:float=-math.inf, end:float=math.inf,
+                           task_names:Optional[Set[str]]=None) -> Iterator[Tuple[str, float]]:
+        "Get the times of the actions of the tasks (see rocketry.log.utils.get_action_times)"
+        self._check_index()
+        for task_name, task_index in self._iter_index(task_names):
+            for action in actions:
+                if action in task_index:
+                    times, _ = task_index[action]
+                    for created in times[bisect_left(times, start):bisect_right(times, end)]:
+                        yield task_name, created
+
+    def query_by_created(self, query:dict, page_size:int=1000) -> Iterator:
+        "Iterate the records ordered by creation time (see rocketry.log.utils.iter_by_created)"
+        if not set(query) <= {"task_name", "action", "created"}:
+            raise NotImplementedError("Query not supported by the index")
+        task_names = _get_values(query, "task_name")
+        actions = _get_values(query, "action")
+        created = query.get("created", Between(None, None))
+        if task_names is NotImplemented or actions is NotImplemented or not isinstance(created, Between):
+            raise NotImplementedError("Query not supported by the index")
+        start = created.start if created.start is not None else -math.inf
+        end = created.end if created.end is not None else math.inf
+
+        self._check_index()
+        spans = [
+            (times, items, bisect_left(times, start), bisect_right(times, end))
+            for task_name, task_index in self._index.items()
+            if task_names is None or task_name in task_names
+            for action, (times, items) in task_index.items()
+            if actions is None or action in actions
+        ]
+        # Merged lazily without copying the index
+        sorted_items = heapq.merge(
+            *(_iter_span(*span) for span in spans),
+            key=itemgetter(0)
+        )
+        return (data for _, data in sorted_items)
+
+    def _parse_query(self, query:dict) -> Optional[Tuple[str, Optional[set], float, float]]:
+        "Get task name, actions (None if any) and time span of the query (None if the query cannot use the index)"
+        task_name = query.get("task_name")
+        if not isinstance(task_name, str) or not set(query) <= {"task_name", "action", "created"}:
+            return None
+
+        start, end = -math.inf, math.inf
+        created = query.get("created")
+        if isinstance(created, Between):
+            start = created.start if created.start is not None else start
+            end = created.end if created.end is not None else end
+        elif isinstance(created, (int, float)):
+            start = end = created
+        elif "created" in query:
+            return None
+
+        action = query.get("action")
+        if "action" not in query:
+            actions = None
+        elif isinstance(action, str):
+            actions = {action}
+        elif isinstance(action, In):
+            actions = set(action.value)
+        else:
+            return None
+        return task_name, actions, start, end
+
+    def _get_spans(self, query:dict) -> Optional[List[Tuple[List[float], List, int, int]]]:
+        "Get the index slices matching the query (None if the query cannot use the index)"
+        parsed = self._parse_query(query)
+        if parsed is None:
+            return None
+        task_name, actions, start, end = parsed
+
+        self._check_index()
+        task_index = self._index.get(task_name, {})
+        if actions is None:
+            indexes = task_index.values()
+        else:
+            indexes = [task_index[act] for act in actions if act in task_index]
+
+        return [
+            (times, items, bisect_left(times, start), bisect_right(times, end))
+            for times, items in indexes
+        ]
+
+    def _iter_index(self, task_names:Optional[Set[str]]=None) -> Iterator[Tuple[str, Dict[str, Tuple[List[float], List]]]]:
+        "Iterate the index of the tasks (all if None)"
+        if task_names is None:
+            yield from self._index.items()
+            return
+        for task_name in task_names:
+            if task_name in self._index:
+                yield task_name, self._index[task_name]
+
+    def _index_item(self, data):
+        try:
+            task_name = self.get_field_value(data, "task_name")
+            action = self.get_field_value(data, "action")
+            created = self.get_field_value(data, "created")
+        except (KeyError, AttributeError):
+            # Not a task log record, only found by scanning
+            return
+        times, items = self._index.setdefault(task_name, {}).setdefault(action, ([], []))
+        if not times or times[-1] <= created:
+            # Records usually come in order
+            times.append(created)
+            items.append(data)
+        else:
+            pos = bisect_right(times, created)
+            times.insert(pos, created)
+            items.insert(pos, data)
+
+    def _check_index(self):
+        "Rebuild the index if the collection was modified directly"
+        collection, length = self._indexed
+        if collection is not self.collection or length != len(self.collection):
+            self._reindex()
+
+    def _reindex(self):
+        self._index = {}
+        for data in self.collection:
+            self._index_item(data)
+        self._indexed = (self.collection, len(self.collection))
+
+def _iter_span(times:List[float], items:List, start:int, end:int) -> Iterator[Tuple[float, Any]]:
+    for i in range(start, end):
+        yield times[i], items[i]
+
+def _get_values(query:dict, key:str):
+    "Get the accepted values of an equal or in query (None if any, NotImplemented if not supported)"
+    if key not in query:
+        return None
+    value = query[key]
+    if isinstance(value, str):
+        return {value}
+    if isinstance(value, In):
+        return set(value.value)
+    return NotImplemented
@@ -0,0 +1,251 @@
+import datetime
+import heapq
+import math
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from itertools import repeat
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from pydantic import PrivateAttr
+from redbird.utils.query import QueryMatcher
+
+from .memory import IndexedMemoryRepo
+
+class RetentionMemoryRepo(IndexedMemoryRepo):
+    """Memory repository for task logs with bounded
+    retention.
+
+    Keeps only the recent records of each task as they
+    are and compacts the older ones to counters per
+    task, action and rollup period (by default hour).
+    The rollups of a task and action are bounded by
+    ``max_rollups`` by merging the oldest of them. The
+    memory therefore stays flat regardless of how
+    long the scheduler runs while the counts of the
+    records (ie. ``TaskFailed(period=TimeOfMonth()) >= 3``)
+    still include the compacted records.
+
+    Compacted records are no longer returned as records.
+    They are only included in counts and in the latest
+    actions of the tasks (used to restore the tasks'
+    statuses at startup). The compacted records are
+    removed from ``collection`` in batches.
+
+    The counts are exact if the edges of the queried
+    span fall on the rollup periods (ie. hourly rollup
+    and ``TimeOfDay("10:00", "12:00")`` in a timezone
+    with whole hour offset). Otherwise the compacted
+    records of the (at most two) rollup periods the
+    edges fall in are counted whole if any of them can
+    be in the span. Use a rollup that divides the
+    periods of the conditions to keep the counts exact.
+
+    When a task and action has more than ``max_rollups``
+    rollups, the adjacent rollups of the older half
+    that together span the shortest time are merged.
+    The newest half stays by the rollup period and the
+    older half covers the rest of the history in about
+    even spans. The merged rollups are counted whole if
+    any of their records can be in the span thus the
+    counts of spans with an edge in the older half may
+    be too large by the records of the (at most two)
+    merged rollups at the edges. No counts are dropped.
+
+    Parameters
+    ----------
+    retention : datetime.timedelta, optional
+        How long to keep the records of a task as they
+        are, counted from the newest record of the task.
+    max_records : int, optional
+        Maximum number of records to keep of a task as
+        they are. The records are compacted in batches
+        so the count may exceed this by a quarter.
+    rollup : datetime.timedelta
+        Length of the periods the compacted records
+        are counted by. By default one hour.
+    max_rollups : int
+        Maximum number of rollups per task and action.
+        By default 1000 (the latest 500 are kept by
+        the rollup period, about 20 days if hourly).
+    **kwargs : dict
+        See ``redbird.repos.MemoryRepo``.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        import datetime
+        from redbird.logging import RepoHandler
+        from rocketry.log import MinimalRecord
+        from rocketry.log.repos import RetentionMemoryRepo
+
+        repo = RetentionMemoryRepo(
+            model=MinimalRecord,
+            retention=datetime.timedelta(days=1),
+            max_records=1000
+        )
+        handler = RepoHandler(repo=repo)
+    """
+
+    retention: Optional[datetime.timedelta] = None
+    max_records: Optional[int] = None
+    rollup: datetime.timedelta = datetime.timedelta(hours=1)
+    max_rollups: int = 1000
+
+    # Rollups: task_name --> action --> (sorted period starts, [count, first created, last created])
+    # Merged rollups span from their start to their last created
+    _rollups: Dict[str, Dict[str, Tuple[List[float], List[list]]]] = PrivateAttr(default_factory=dict)
+    # Ids of the compacted records still in the collection
+    _compacted: Set[int] = PrivateAttr(default_factory=set)
+
+    def insert(self, item):
+        super().insert(item)
+        try:
+            task_name = self.get_field_value(self.collection[-1], "task_name")
+        except (KeyError, AttributeError):
+            return
+        expired = self._get_expired(task_name)
+        if expired:
+            self._compact(task_name, expired)
+            if len(self._compacted) > len(self.collection) // 2:
+                self._purge()
+
+    def query_data(self, query:dict) -> Iterator:
+        if self._parse_query(query) is None:
+            # Scans the collection
+            self._purge()
+        yield from super().query_data(query)
+
+    def query_update(self, query:dict, values:dict):
+        self._purge()
+        super().query_update(query, values)
+
+    def query_count(self, query:dict) -> int:
+        n_records = super().query_count(query)
+        parsed = self._parse_query(query)
+        if parsed is None:
+            return n_records
+        task_name, actions, start, end = parsed
+        task_rollups = self._rollups.get(task_name, {})
+        if actions is not None:
+            task_rollups = {act: task_rollups[act] for act in actions if act in task_rollups}
+
+        for starts, stats in task_rollups.values():
+            # The rollup the start falls in (if any) is the last starting before it
+            first_pos = max(bisect_right(starts, start) - 1, 0)
+            last_pos = bisect_right(starts, end)
+            n_records += sum(
+                count
+                for count, first, last in stats[first_pos:last_pos]
+                if first <= end and last >= start
+            )
+        return n_records
+
+    def query_delete(self, query:dict):
+        self._purge()
+        super().query_delete(query)
+        matcher = QueryMatcher(query, value_getter=lambda data, key: data[key])
+        for task_name, task_rollups in self._rollups.items():
+            for action, (starts, stats) in task_rollups.items():
+                keep = [
+                    (period, stat)
+                    for period, stat in zip(starts, stats)
+                    if {"task_name": task_name, "action": action, "created": stat[2]} not in matcher
+                ]
+                starts[:] = [period for period, _ in keep]
+                stats[:] = [stat for _, stat in keep]
+
+    def query_latest_actions(self, task_names:Optional[Set[str]]=None) -> Iterator[Tuple[str, str, float]]:
+        latest = {
+            (task_name, action): stats[-1][2]
+            for task_name, task_rollups in self._rollups.items()
+            if task_names is None or task_name in task_names
+            for action, (_, stats) in task_rollups.items()
+            if stats
+        }
+        for task_name, action, created in super().query_latest_actions(task_names=task_names):
+            latest[task_name, action] = max(created, latest.get((task_name, action), created))
+        for (task_name, action), created in latest.items():
+            yield task_name, action, created
+
+    def query_action_times(self, actions:List[str], start:float=-math.inf, end:float=math.inf, task_names:Optional[Set[str]]=None):
+        # The times of the compacted records are not known
+        raise NotImplementedError("Compacted records have no times")
+
+    def _get_expired(self, task_name:str) -> Dict[str, int]:
+        "Get the number of the oldest records to compact per action"
+        task_index = self._index.get(task_name, {})
+        expired = Counter()
+        if self.retention is not None:
+            newest = max(times[-1] for times, _ in task_index.values() if times)
+            cutoff = newest - self.retention.total_seconds()
+            # Compacting once per rollup period instead of on every record
+            if any(times and times[0] < cutoff - self.rollup.total_seconds() for times, _ in task_index.values()):
+                for action, (times, _) in task_index.items():
+                    expired[action] = bisect_left(times, cutoff)
+
+        if self.max_records is not None:
+            n_records = sum(len(times) for times, _ in task_index.values())
+            if n_records > self.max_records + max(self.max_records // 4, 1):
+                oldest = heapq.merge(*(
+                    zip(times, repeat(action))
+                    for action, (times, _) in task_index.items()
+                ))
+                n_over = Counter(action for _, (_, action) in zip(range(n_records - self.max_records), oldest))
+                for action, n in n_over.items():
+                    expired[action] = max(expired[action], n)
+        return {action: n for action, n in expired.items() if n > 0}
+
+    def _compact(self, task_name:str, expired:Dict[str, int]):
+        "Turn the oldest records of the task to rollup counters"
+        size = self.rollup.total_seconds()
+        task_rollups = self._rollups.setdefault(task_name, {})
+        for action, n in expired.items():
+            times, items = self._index[task_name][action]
+            starts, stats = task_rollups.setdefault(action, ([], []))
+            for created in times[:n]:
+                period = created // size * size
+                pos = bisect_right(starts, period) - 1
+                if pos >= 0 and (starts[pos] == period or created <= stats[pos][2]):
+                    # In the period or in a merged rollup
+                    stat = stats[pos]
+                    stat[0] += 1
+                    stat[1] = min(stat[1], created)
+                    stat[2] = max(stat[2], created)
+                else:
+                    starts.insert(pos + 1, period)
+                    stats.insert(pos + 1, [1, created, created])
+            while len(starts) > self.max_rollups:
+                self._merge(starts, stats)
+            self._compacted.update(id(data) for data in items[:n])
+            del times[:n]
+            del items[:n]
+
+    def _merge(self, starts:List[float], stats:List[list]):
+        "Merge the adjacent rollups (of the older half) that together span the shortest time"
+        n_older = max(len(starts) - self.max_rollups // 2, 2)
+        pos = min(
+            range(n_older - 1),
+            key=lambda i: (starts[i + 2] if i + 2 < len(starts) else stats[i + 1][2]) - starts[i]
+        )
+        older, newer = stats[pos], stats.pop(pos + 1)
+        del starts[pos + 1]
+        older[0] += newer[0]
+        older[1] = min(older[1], newer[1])
+        older[2] = max(older[2], newer[2])
+
+    def _purge(self):
+        "Remove the compacted records from the collection"
+        if not self._compacted:
+            return
+        collection, length = self._indexed
+        if collection is self.collection:
+            # Otherwise the collection was replaced and the compacted are gone
+            self.collection = [data for data in collection if id(data) not in self._compacted]
+            if length == len(collection):
+                self._indexed = (self.collection, len(self.collection))
+        self._compacted = set()
+
+    def _reindex(self):
+        self._purge()
+        super()._reindex()
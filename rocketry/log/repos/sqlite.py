@@ -0,0 +1,369 @@
+import atexit
+import datetime
+import math
+import sqlite3
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type
+
+from pydantic import PrivateAttr
+from redbird.oper import (
+    Between, Equal, GreaterEqual, GreaterThan, In,
+    LessEqual, LessThan, NotEqual
+)
+from redbird.templates import TemplateRepo
+from redbird.utils.query import QueryMatcher
+
+from rocketry.log.log_record import MinimalRecord
+
+_SQL_OPERS = {
+    Equal: "=",
+    NotEqual: "!=",
+    GreaterThan: ">",
+    GreaterEqual: ">=",
+    LessThan: "<",
+    LessEqual: "<=",
+}
+
+class SQLiteRepo(TemplateRepo):
+    """SQLite repository for task logs.
+
+    Uses only the standard library's ``sqlite3``.
+    The table has an index on ``task_name``, ``action``
+    and ``created`` so that the queries the conditions
+    do are answered without scanning the table, and the
+    queries for the latest, first and count of records
+    and the queries on the time spans are done in SQL.
+    An index on ``created`` serves reading the records
+    in time order (``query_by_created``).
+    The database uses write-ahead logging (WAL).
+
+    The records are written by a background thread
+    in batches, one transaction per batch. The pending
+    records are written before each read so the reads
+    always see them. Call ``close`` (or ``flush``) to
+    write the pending records. The records are kept
+    pending until their transaction is committed. If
+    writing in the background fails (ie. the database
+    is locked), the error is raised by the next ``add``
+    or ``flush`` and the records are written again.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the database file. By default in
+        memory (not persisted).
+    table : str
+        Name of the table. Created if missing.
+    model : Type
+        Pydantic model of the records. The columns
+        of the table are the fields of the model.
+        By default ``rocketry.log.MinimalRecord``.
+    batch_size : int
+        Number of pending records that triggers a write.
+    flush_interval : float
+        Seconds the pending records are waited at most
+        before writing them.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        from redbird.logging import RepoHandler
+        from rocketry.log import MinimalRecord
+        from rocketry.log.repos import SQLiteRepo
+
+        repo = SQLiteRepo(filename="logs.db", table="tasks", model=MinimalRecord)
+        handler = RepoHandler(repo=repo)
+    """
+
+    filename: str = ":memory:"
+    table: str = "task_log"
+    model: Type = MinimalRecord
+    batch_size: int = 1000
+    flush_interval: float = 0.5
+
+    _conn: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    _lock: threading.RLock = PrivateAttr(default_factory=threading.RLock)
+    _buffer: List[tuple] = PrivateAttr(default_factory=list)
+    _writer: Optional[threading.Thread] = PrivateAttr(default=None)
+    _wake: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _stop: threading.Event = PrivateAttr(default_factory=threading.Event)
+    _error: Optional[Exception] = PrivateAttr(default=None)
+    _at_exit: bool = PrivateAttr(default=False)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.model.__fields__)
+
+    def insert(self, item):
+        row = tuple(_to_sql(self.get_field_value(item, col)) for col in self.columns)
+        with self._lock:
+            self._buffer.append(row)
+            if self._writer is None or not self._writer.is_alive():
+                self._start_writer()
+            if len(self._buffer) >= self.batch_size:
+                self._wake.set()
+            self._raise_error()
+
+    def flush(self):
+        "Write the pending records to the database"
+        with self._lock:
+            self._raise_error()
+            self._write()
+
+    def close(self):
+        "Write the pending records and close the connection"
+        self._stop.set()
+        self._wake.set()
+        if self._writer is not None and self._writer is not threading.current_thread():
+            self._writer.join()
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+                self._writer = None
+                self._stop.clear()
+                if self._at_exit:
+                    atexit.unregister(self.close)
+                    self._at_exit = False
+
+    def query_data(self, query:dict) -> Iterator[dict]:
+        where = self._format_where(query)
+        if where is None:
+            matcher = QueryMatcher(query, value_getter=lambda data, key: data[key])
+            yield from (data for data in self._execute("ORDER BY rowid", ()) if data in matcher)
+            return
+        sql, params = where
+        yield from self._execute(f"{sql} ORDER BY rowid", params)
+
+    def query_read_first(self, query:dict):
+        return self._read_one(query, "ASC")
+
+    def query_read_last(self, query:dict):
+        return self._read_one(query, "DESC")
+
+    def query_count(self, query:dict) -> int:
+        where = self._format_where(query)
+        if where is None:
+            raise NotImplementedError("Query not supported in SQL")
+        sql, params = where
+        with self._lock:
+            self.flush()
+            return self._get_conn().execute(f'SELECT COUNT(*) FROM "{self.table}" {sql}', params).fetchone()[0]
+
+    def query_update(self, query:dict, values:dict):
+        where = self._format_where(query)
+        if where is None:
+            raise NotImplementedError("Query not supported in SQL")
+        sql, params = where
+        sets = ", ".join(f'"{col}" = ?' for col in values)
+        with self._lock:
+            self.flush()
+            with self._get_conn() as conn:
+                conn.execute(
+                    f'UPDATE "{self.table}" SET {sets} {sql}',
+                    tuple(_to_sql(val) for val in values.values()) + params
+                )
+
+    def query_delete(self, query:dict):
+        where = self._format_where(query)
+        if where is None:
+            raise NotImplementedError("Query not supported in SQL")
+        sql, params = where
+        with self._lock:
+            self.flush()
+            with self._get_conn() as conn:
+                conn.execute(f'DELETE FROM "{self.table}" {sql}', params)
+
+    def query_latest_actions(self, task_names:Optional[Set[str]]=None) -> Iterator[Tuple[str, str, float]]:
+        "Get the latest time of each action of the tasks (see rocketry.log.utils.get_latest_actions)"
+        where, params = _format_in("task_name", task_names)
+        with self._lock:
+            self.flush()
+            yield from self._get_conn().execute(
+                f'SELECT task_name, action, MAX(created) FROM "{self.table}" {where} GROUP BY task_name, action',
+                params
+            ).fetchall()
+
+    def query_action_times(self, actions:List[str], start:float=-math.inf, end:float=math.inf,
+                           task_names:Optional[Set[str]]=None) -> List[Tuple[str, float]]:
+        "Get the times of the actions of the tasks (see rocketry.log.utils.get_action_times)"
+        marks = ", ".join("?" for _ in actions)
+        where, params = _format_in("task_name", task_names)
+        where = f"{where} AND" if where else "WHERE"
+        with self._lock:
+            self.flush()
+            return self._get_conn().execute(
+                f'SELECT task_name, created FROM "{self.table}" '
+                f'{where} action IN ({marks}) AND created >= ? AND created <= ?',
+                (*params, *actions, start, end)
+            ).fetchall()
+
+    def query_tail_actions(self, cursor:Optional[int]=None) -> Tuple[List[Tuple[str, str, float]], int]:
+        "Get the actions inserted after the cursor (rowid, see rocketry.log.utils.tail_actions)"
+        with self._lock:
+            self.flush()
+            conn = self._get_conn()
+            if cursor is None:
+                return [], conn.execute(f'SELECT COALESCE(MAX(rowid), 0) FROM "{self.table}"').fetchone()[0]
+            rows = conn.execute(
+                f'SELECT rowid, task_name, action, created FROM "{self.table}" WHERE rowid > ? ORDER BY rowid',
+                (cursor,)
+            ).fetchall()
+        if rows:
+            cursor = rows[-1][0]
+        return [row[1:] for row in rows], cursor
+
+    def query_by_created(self, query:dict, page_size:int=1000) -> Iterator[dict]:
+        "Iterate the records ordered by creation time a page at a time (see rocketry.log.utils.iter_by_created)"
+        where = self._format_where(query)
+        if where is None:
+            raise NotImplementedError("Query not supported in SQL")
+        return self._iter_pages(*where, page_size=page_size)
+
+    def _iter_pages(self, sql:str, params:tuple, page_size:int) -> Iterator[dict]:
+        # Keyset pagination: continue after the (created, rowid) of the previous page
+        sql = f"{sql} AND" if sql else "WHERE"
+        last = (-math.inf, -1)
+        while True:
+            with self._lock:
+                self.flush()
+                cursor = self._get_conn().execute(
+                    f'SELECT rowid, * FROM "{self.table}" {sql} (created > ? OR (created = ? AND rowid > ?)) '
+                    'ORDER BY created, rowid LIMIT ?',
+                    (*params, last[0], last[0], last[1], page_size)
+                )
+                cols = [desc[0] for desc in cursor.description][1:]
+                rows = cursor.fetchall()
+            for row in rows:
+                yield dict(zip(cols, row[1:]))
+            if len(rows) < page_size:
+                return
+            last = (rows[-1][cols.index("created") + 1], rows[-1][0])
+
+    def _read_one(self, query:dict, order:str):
+        where = self._format_where(query)
+        if where is None:
+            raise NotImplementedError("Query not supported in SQL")
+        sql, params = where
+        rows = self._execute(f"{sql} ORDER BY created {order}, rowid {order} LIMIT 1", params)
+        return self.data_to_item(rows[0]) if rows else None
+
+    def _execute(self, sql:str, params:tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            self.flush()
+            cursor = self._get_conn().execute(f'SELECT * FROM "{self.table}" {sql}', params)
+            cols = [desc[0] for desc in cursor.description]
+            return [dict(zip(cols, row)) for row in cursor.fetchall()]
+
+    def _format_where(self, query:dict) -> Optional[Tuple[str, tuple]]:
+        "Turn the query to SQL (None if not supported)"
+        conds = []
+        params = []
+        for key, value in query.items():
+            if key not in self.model.__fields__:
+                return None
+            col = f'"{key}"'
+            if isinstance(value, Between):
+                if value.start is not None:
+                    conds.append(f"{col} >= ?")
+                    params.append(_to_sql(value.start))
+                if value.end is not None:
+                    conds.append(f"{col} <= ?")
+                    params.append(_to_sql(value.end))
+            elif isinstance(value, In):
+                values = list(value.value)
+                conds.append(f"{col} IN ({', '.join('?' for _ in values)})" if values else "0")
+                params.extend(_to_sql(val) for val in values)
+            elif type(value) in _SQL_OPERS:
+                conds.append(f"{col} {_SQL_OPERS[type(value)]} ?")
+                params.append(_to_sql(value.value))
+            elif value is None:
+                conds.append(f"{col} IS NULL")
+            elif isinstance(value, (str, int, float, datetime.datetime, datetime.timedelta)):
+                conds.append(f"{col} = ?")
+                params.append(_to_sql(value))
+            else:
+                return None
+        sql = "WHERE " + " AND ".join(conds) if conds else ""
+        return sql, tuple(params)
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.filename, check_same_thread=False)
+            if self.filename != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+            cols = ", ".join(
+                f'"{name}" {_get_sql_type(field.outer_type_)}'
+                for name, field in self.model.__fields__.items()
+            )
+            with conn:
+                conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({cols})')
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "{self.table}_task_action_created" '
+                    f'ON "{self.table}" (task_name, action, created)'
+                )
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "{self.table}_created" ON "{self.table}" (created)')
+            self._conn = conn
+        return self._conn
+
+    def _start_writer(self):
+        self._writer = threading.Thread(target=self._run_writer, daemon=True, name=f"SQLiteRepo writer ({self.table})")
+        self._writer.start()
+        if not self._at_exit:
+            atexit.register(self.close)
+            self._at_exit = True
+
+    def _run_writer(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            with self._lock:
+                try:
+                    self._write()
+                except Exception as exc:
+                    # Raised in the next add or flush, the records are written again
+                    self._error = exc
+
+    def _write(self):
+        # Cleared only after commit so the records are not lost if writing fails
+        if self._buffer:
+            conn = self._get_conn()
+            cols = ", ".join(f'"{col}"' for col in self.columns)
+            marks = ", ".join("?" for _ in self.columns)
+            with conn:
+                conn.executemany(f'INSERT INTO "{self.table}" ({cols}) VALUES ({marks})', self._buffer)
+            self._buffer = []
+
+    def _raise_error(self):
+        "Raise the error occurred in writing in the background"
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+def _format_in(col:str, values:Optional[Set[str]]) -> Tuple[str, tuple]:
+    "Format a WHERE clause of the column being one of the values (empty if any)"
+    if values is None:
+        return "", ()
+    values = tuple(values)
+    return f'WHERE "{col}" IN ({", ".join("?" for _ in values)})' if values else "WHERE 0", values
+
+def _get_sql_type(cls) -> str:
+    if cls is bool or cls is int:
+        return "INTEGER"
+    if cls is float:
+        return "REAL"
+    return "TEXT"
+
+def _to_sql(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return str(value)
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return str(value)
@@ -1,4 +1,210 @@
+import math
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from redbird.oper import between, greater_equal, in_
+
 def get_field_value(record, field:str):
     if isinstance(record, dict):
         return record[field]
     return getattr(record, field)
+
+def get_latest_actions(repo, task_names:Optional[Iterable[str]]=None) -> Dict[str, Dict[str, float]]:
+    """Get the timestamps of the latest actions of the
+    tasks from a log repository.
+
+    The timestamps are queried in one grouped query if
+    the repository supports it (has method ``query_latest_actions``
+    or is an SQL repository) and otherwise read in one
+    pass over the log records.
+
+    Parameters
+    ----------
+    repo : redbird.BaseRepo
+        Repository of the task logs.
+    task_names : iterable of str, optional
+        Names of the tasks to get the actions for,
+        by default all.
+
+    Returns
+    -------
+    Dict[str, Dict[str, float]]
+        Timestamps of the latest actions in format
+        ``{task_name: {action: created}}``.
+    """
+    task_names = set(task_names) if task_names is not None else None
+    if hasattr(repo, "query_latest_actions"):
+        rows = repo.query_latest_actions(task_names=task_names)
+    elif hasattr(repo, "model_orm") and hasattr(repo, "session"):
+        rows = _query_sql_latest_actions(repo)
+    else:
+        records = repo.filter_by(task_name=in_(list(task_names))) if task_names is not None else repo.filter_by()
+        rows = (
+            (
+                get_field_value(record, "task_name"),
+                get_field_value(record, "action"),
+                get_field_value(record, "created")
+            )
+            for record in records
+        )
+
+    latest = {}
+    for task_name, action, created in rows:
+        if task_names is not None and task_name not in task_names:
+            continue
+        # Same as TaskAdapter.get_latest, the last
+        # record in the order of the repo is the latest
+        latest.setdefault(task_name, {})[action] = created
+    return latest
+
+def _query_sql_latest_actions(repo) -> Iterable[Tuple[str, str, float]]:
+    "Query the latest actions from redbird.repos.SQLRepo"
+    from sqlalchemy import func
+    orm = repo.model_orm
+    return (
+        repo.session.query(orm.task_name, orm.action, func.max(orm.created))
+        .group_by(orm.task_name, orm.action)
+    )
+
+def get_action_times(repo, actions:Iterable[str], start:float=-math.inf, end:float=math.inf,
+                     task_names:Optional[Iterable[str]]=None) -> Dict[str, List[float]]:
+    """Get the times of the given actions of the
+    tasks from a log repository.
+
+    The times are queried in one query. Uses the
+    repo's ``query_action_times`` if it has one.
+
+    Parameters
+    ----------
+    repo : redbird.BaseRepo
+        Repository of the task logs.
+    actions : iterable of str
+        Actions to get the times for.
+    start, end : float
+        Time span of the records (inclusive).
+    task_names : iterable of str, optional
+        Names of the tasks to get the times for,
+        by default all.
+
+    Returns
+    -------
+    Dict[str, List[float]]
+        Sorted timestamps of the actions in format
+        ``{task_name: [created, ...]}``.
+    """
+    actions = list(actions)
+    task_names = set(task_names) if task_names is not None else None
+    if hasattr(repo, "query_action_times"):
+        rows = repo.query_action_times(actions, start, end, task_names=task_names)
+    else:
+        query = {"action": in_(actions), "created": between(start, end)}
+        if task_names is not None:
+            query["task_name"] = in_(list(task_names))
+        rows = (
+            (get_field_value(record, "task_name"), get_field_value(record, "created"))
+            for record in repo.filter_by(**query)
+        )
+    times = {}
+    for task_name, created in rows:
+        times.setdefault(task_name, []).append(created)
+    for task_times in times.values():
+        task_times.sort()
+    return times
+
+def tail_actions(repo, cursor:Any=None) -> Tuple[List[Tuple[str, str, float]], Any]:
+    """Get the actions logged to a log repository
+    after the cursor.
+
+    Uses the repo's ``query_tail_actions`` if it has
+    one and otherwise queries the records created
+    at or after the previous latest record.
+
+    Parameters
+    ----------
+    repo : redbird.BaseRepo
+        Repository of the task logs.
+    cursor : any, optional
+        Cursor returned by the previous call. If not
+        given, no actions are returned but the cursor
+        is set to the end of the repository.
+
+    Returns
+    -------
+    List[Tuple[str, str, float]]
+        New actions as ``(task_name, action, created)``
+        in the order they were created.
+    any
+        Cursor for the next call.
+    """
+    if hasattr(repo, "query_tail_actions"):
+        return repo.query_tail_actions(cursor)
+    records = repo.filter_by(created=greater_equal(cursor[0])) if cursor is not None else repo.filter_by()
+    rows = [
+        (
+            get_field_value(record, "task_name"),
+            get_field_value(record, "action"),
+            get_field_value(record, "created")
+        )
+        for record in records
+    ]
+    return tail_by_created(rows, cursor)
+
+def tail_by_created(rows:Iterable[Tuple[str, str, float]], cursor:Optional[Tuple[float, frozenset]]=None):
+    """Filter the rows that are already seen by the cursor
+    and move the cursor (for ``tail_actions``).
+
+    The cursor is the latest creation time seen and
+    the rows created at that time."""
+    if cursor is None:
+        rows = list(rows)
+        created = max((row[2] for row in rows), default=-math.inf)
+        return [], (created, frozenset(row for row in rows if row[2] == created))
+
+    created, seen = cursor
+    new_rows = sorted(
+        (row for row in rows if row[2] > created or (row[2] == created and row not in seen)),
+        key=itemgetter(2)
+    )
+    if new_rows:
+        latest = new_rows[-1][2]
+        latest_rows = frozenset(row for row in new_rows if row[2] == latest)
+        cursor = (latest, seen | latest_rows if latest == created else latest_rows)
+    return new_rows, cursor
+
+def iter_by_created(repo, query:Optional[dict]=None, start:float=-math.inf, end:float=math.inf, page_size:int=1000) -> Iterator:
+    """Iterate the log records of a log repository
+    in the order they were created.
+
+    The query and the time span are passed to the
+    repository. Uses the repo's ``query_by_created``
+    if it has one (reads the records in pages of
+    ``page_size``) and otherwise sorts the matching
+    records in memory.
+
+    Parameters
+    ----------
+    repo : redbird.BaseRepo
+        Repository of the task logs.
+    query : dict, optional
+        Query of the records (ie. ``task_name`` and ``action``).
+    start, end : float
+        Time span of the records (inclusive).
+    page_size : int
+        Number of records read at a time.
+
+    Returns
+    -------
+    Iterator
+        Records of the repository.
+    """
+    query = dict(query or {})
+    if start != -math.inf or end != math.inf:
+        query["created"] = between(start, end)
+    if hasattr(repo, "query_by_created"):
+        try:
+            data = repo.query_by_created(query, page_size=page_size)
+        except NotImplementedError:
+            pass
+        else:
+            return (repo.data_to_item(d) for d in data)
+    return iter(sorted(repo.filter_by(**query), key=lambda record: get_field_value(record, "created")))
@@ -4,3 +4,4 @@ from .convert import (
     to_timestamp
 )
 from .interval import Interval
+from .epoch import supports_wall, timestamp_to_wall, wall_to_timestamp, round_timestamp
@@ -0,0 +1,80 @@
+import datetime
+import math
+import time
+from functools import lru_cache
+from typing import Optional
+
+# Wall time: microseconds from 1970-01-01 00:00 on the clock of
+# the timezone (local time if no timezone). Computing with
+# integers gives the same results as computing with naive
+# datetimes (or with fixed offset timezones) without creating them.
+
+MICROSECOND = 1
+SECOND = 1_000_000
+DAY = 86_400 * SECOND
+
+def supports_wall(timezone:Optional[datetime.tzinfo]) -> bool:
+    "Whether the wall time of the timezone can be computed (local time or fixed offset)"
+    return timezone is None or isinstance(timezone, datetime.timezone)
+
+def timestamp_to_wall(ts:float, timezone:Optional[datetime.timezone]=None) -> int:
+    "Turn timestamp to wall time (same as datetime.datetime.fromtimestamp)"
+    secs, us = _split(ts)
+    if timezone is not None:
+        offset = _get_fixed_offset(timezone)
+    else:
+        offset = _get_local_offset(secs // 86_400)
+        if offset is None:
+            # Offset changes on the day
+            offset = time.localtime(secs).tm_gmtoff * SECOND
+    return secs * SECOND + us + offset
+
+def wall_to_timestamp(wall:int, timezone:Optional[datetime.timezone]=None) -> float:
+    "Turn wall time to timestamp (same as datetime.datetime.timestamp)"
+    if timezone is not None:
+        return (wall - _get_fixed_offset(timezone)) / SECOND
+    offset = _get_wall_offset(wall // DAY)
+    if offset is None:
+        # Offset changes on the day (ambiguous or missing times)
+        return (datetime.datetime(1970, 1, 1) + datetime.timedelta(microseconds=wall)).timestamp()
+    secs, us = divmod(wall - offset, SECOND)
+    return secs + us / 1e6
+
+def round_timestamp(ts:float, timezone:Optional[datetime.timezone]=None) -> float:
+    "Round the timestamp to microseconds (same as datetime.datetime.fromtimestamp(ts).timestamp())"
+    secs, us = _split(ts)
+    if timezone is not None:
+        return (secs * SECOND + us) / SECOND
+    return secs + us / 1e6
+
+def _split(ts:float):
+    "Split the timestamp to seconds and microseconds (rounded as in datetime.datetime.fromtimestamp)"
+    frac, secs = math.modf(ts)
+    us = round(frac * 1e6)
+    if us >= 1_000_000:
+        secs += 1
+        us -= 1_000_000
+    elif us < 0:
+        secs -= 1
+        us += 1_000_000
+    return int(secs), us
+
+def _get_fixed_offset(timezone:datetime.timezone) -> int:
+    return timezone.utcoffset(None) // datetime.timedelta(microseconds=1)
+
+@lru_cache(maxsize=128)
+def _get_local_offset(day:int) -> Optional[int]:
+    "Get the UTC offset of the local time on the UTC day (None if it changes on the day)"
+    start = time.localtime(day * 86_400).tm_gmtoff
+    end = time.localtime(day * 86_400 + 86_399).tm_gmtoff
+    return start * SECOND if start == end else None
+
+@lru_cache(maxsize=128)
+def _get_wall_offset(day:int) -> Optional[int]:
+    "Get the UTC offset of the local time on the wall day (None if it changes on the day)"
+    midnight = datetime.datetime(1970, 1, 1) + datetime.timedelta(days=day)
+    start = midnight.timestamp()
+    end = (midnight + datetime.timedelta(days=1)).timestamp()
+    if end - start != 86_400:
+        return None
+    return day * DAY - int(start) * SECOND
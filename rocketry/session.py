@@ -6,6 +6,7 @@ about the scehuler/task/parameters etc.
 from copy import copy
 import datetime
 import logging
+import math
 from multiprocessing import cpu_count
 import time
 import threading
@@ -14,7 +15,8 @@ import warnings
 from itertools import chain
 from typing import TYPE_CHECKING, Callable, ClassVar, Iterable, Dict, List, Optional, Set, Tuple, Type, Union
 from pydantic import BaseModel, root_validator, validator
-from rocketry.pybox.time import to_timedelta
+from redbird.oper import in_
+from rocketry.pybox.time import to_timedelta, to_timestamp
 from rocketry.log.defaults import create_default_handler
 from rocketry._base import RedBase
 from rocketry.tasks.run_id import uuid
@@ -26,7 +28,7 @@ except ImportError: # pragma: no cover
 
 
 if TYPE_CHECKING:
-    from rocketry.core.log import TaskAdapter
+    from rocketry.core.log import TaskAdapter, LogCursor
     from rocketry.parse import StaticParser
     from rocketry.core import (
         Task,
@@ -50,6 +52,7 @@ class Config(BaseModel):
     execution: Optional[str] = None
     task_pre_exist: str = 'raise'
     force_status_from_logs: bool = False # Force to check status from logs every time (slow but robust)
+    tail_logs: bool = False # Read the new log records every cycle to update the statuses (ie. logged by other processes)
 
     task_logger_basename: str = "rocketry.task"
     scheduler_logger_basename: str = "rocketry.scheduler"
@@ -58,12 +61,23 @@ class Config(BaseModel):
     silence_task_logging: bool = False # Whether to silence errors occurred in logging a task
     silence_cond_check: bool = False # Whether to silence errors occurred in checking conditions
     cycle_sleep: Optional[float] = 0.1
+    event_driven: bool = False # Whether to sleep till next change of the conditions instead of every cycle_sleep
+    dirty_evaluation: bool = False # Whether to evaluate only the tasks which conditions may have changed
+    cycle_memo: bool = False # Whether to freeze the time and memoize the conditions' states in a cycle
+    batch_log_queries: bool = False # Whether to answer the conditions' log queries with grouped queries in a cycle
+    cache_periods: bool = False # Whether to cache the time periods' evaluations till their next starts or ends
+    buffered_logging: bool = False # Whether to write the task log records in a background thread
+    log_buffer_size: int = 10000 # Maximum number of task log records waiting to be written
     debug: bool = False
 
     multilaunch: bool = False
     func_run_id: Callable = uuid
     max_process_count = cpu_count()
     tasks_as_daemon: bool = True
+    process_pool: bool = False # Whether to run process tasks in long-lived worker processes
+    process_pool_size: Optional[int] = None # Number of worker processes (by default max_process_count)
+    process_pool_max_runs: Optional[int] = None # Number of runs after a worker is recycled
+    process_pool_max_memory: Optional[int] = None # Memory growth (bytes) after a worker is recycled
     restarting: str = 'replace'
     instant_shutdown: bool = False
 
@@ -212,25 +226,54 @@ class Session(RedBase):
 
     def __init__(self, config=None, parameters=None, delete_existing_loggers=False, **kwargs):
         from rocketry.core import Scheduler
+        from rocketry.core.time import PeriodCache
         self.config = self._get_config(config, kwargs)
         self.parameters = self._get_parameters(parameters)
         self.scheduler = Scheduler(self)
         self.tasks = set()
+        self._task_index = {} # Task name --> task, for fast look ups
         self.hooks = Hooks()
         self.returns = self._get_parameters(None)
         self._cond_parsers = self._cls_cond_parsers.copy()
         self._cond_cache: Dict = {} # Cached by CondParser to speed up expensive conditions
         self._cond_states = {} # Used by FuncConds to relay condiiton states to conditions
+        self._cycle = None # Context of the current scheduling cycle (if cycle_memo)
+        self._log_writer = None # Writer of the task log records (if buffered_logging)
+        self._log_batch = None # Log queries of the current scheduling cycle (if batch_log_queries)
+        self._period_cache = PeriodCache() # Evaluations of the time periods (if cache_periods)
         if delete_existing_loggers:
             self.delete_task_loggers()
 
     def __getitem__(self, task:Union['Task', str]):
         "Get a task from the session"
         task_name = self._get_task_name(task)
-        for task in self.tasks:
-            if task.name == task_name:
-                return task
-        raise KeyError(f"Task '{task_name}' not found")
+        task = self._get_indexed_task(task_name)
+        if task is None:
+            raise KeyError(f"Task '{task_name}' not found")
+        return task
+
+    def _get_indexed_task(self, task_name:str) -> Optional['Task']:
+        "Get a task by name (None if not found) using the name index"
+        task = self._task_index.get(task_name)
+        if task is not None and task.name == task_name and task in self.tasks:
+            return task
+        if task is not None or len(self._task_index) != len(self.tasks):
+            # Index is out of sync (the tasks were modified directly)
+            self._index_tasks()
+            return self._task_index.get(task_name)
+        return None
+
+    def _index_tasks(self):
+        "Rebuild the task name index"
+        self._task_index = {task.name: task for task in self.tasks}
+
+    def _rename_task(self, task:'Task', old_name:str):
+        "Update the name index after a task was renamed"
+        if self._task_index.get(old_name) is task:
+            del self._task_index[old_name]
+        if task in self.tasks:
+            self._task_index[task.name] = task
+            self._reset_task_repos()
 
     def __contains__(self, task: Union['Task', str]):
         "Check if task is in session"
@@ -319,6 +362,7 @@ class Session(RedBase):
         will occur after the scheduler finishes
         checking one cycle of tasks."""
         self.scheduler._flag_restart.set()
+        self.scheduler._wake()
 
     def shutdown(self):
         """Shut down the scheduler
@@ -331,6 +375,7 @@ class Session(RedBase):
             "Please use Session.shut_down instead"
         ), DeprecationWarning)
         self.scheduler._flag_shutdown.set()
+        self.scheduler._wake()
 
     def shut_down(self, force=None):
         """Shut down the scheduler"""
@@ -338,6 +383,7 @@ class Session(RedBase):
         self.scheduler._flag_shutdown.set()
         if force:
             self.scheduler._flag_force_exit.set()
+        self.scheduler._wake()
 
     def _set_configs(self):
         self._check_readable_logger()
@@ -417,26 +463,40 @@ class Session(RedBase):
     def add_task(self, task: 'Task'):
         "Add the task to the session"
         if_exists = self.config.task_pre_exist
-        exists = task in self
-        if exists:
+        existing = self._get_indexed_task(task.name)
+        if existing is not None:
             if if_exists == 'ignore':
                 return
             if if_exists == 'replace':
-                self.tasks.remove(task)
+                self.tasks.remove(existing)
                 self.tasks.add(task)
+                self._task_index[task.name] = task
+                self._reset_task_repos()
             elif if_exists == 'raise':
                 raise KeyError(f"Task '{task.name}' already exists")
         else:
             self.tasks.add(task)
+            self._task_index[task.name] = task
+            self._reset_task_repos()
 
         # Adding the session to the task
         task.session = self
+        if self.scheduler is not None:
+            self.scheduler._set_dirty(task)
 
     def remove_task(self, task: Union['Task', str]):
         from rocketry.core.task import Task
         if not isinstance(task, Task):
             task = self[task]
         self.tasks.remove(task)
+        if self._task_index.get(task.name) is task:
+            del self._task_index[task.name]
+        self._reset_task_repos()
+
+    def _reset_task_repos(self):
+        "Regroup the tasks by their log repos in the next cycle (the tasks changed)"
+        if getattr(self, "scheduler", None) is not None:
+            self.scheduler._task_repos = (None, [], {})
 
     def task_exists(self, task: 'Task'):
         warnings.warn((
@@ -445,10 +505,7 @@ class Session(RedBase):
         ), DeprecationWarning)
 
         task_name = self._get_task_name(task)
-        for task in self.tasks:
-            if task.name == task_name:
-                return True
-        return False
+        return self._get_indexed_task(task_name) is not None
 
     def get_repo(self):
         "Get log repo where the task logs are stored"
@@ -502,12 +559,90 @@ class Session(RedBase):
         Iterable[Dict]
             Generator of the task log records.
         """
+        if self._log_writer is not None:
+            # Records logged in the background
+            self._log_writer.flush()
         loggers = self.get_task_loggers(with_adapters=True)
         data = iter(())
         for logger in loggers.values():
             data = chain(data, logger.get_records(*args, **kwargs))
         return data
 
+    def iter_task_log(self, task_name:Union[str, List[str], None]=None, action:Union[str, List[str], None]=None,
+                      start:Union[datetime.datetime, float, None]=None, end:Union[datetime.datetime, float, None]=None,
+                      after:Optional[str]=None, page_size:int=1000, as_tuples:bool=False) -> 'LogCursor':
+        """Stream the task log records from all of the
+        readable handlers in the session in the order
+        they were created.
+
+        Unlike ``get_task_log``, the filters are passed
+        to the log repositories and the records are read
+        a page at a time (if the repositories support it)
+        so the whole log is not read to memory.
+
+        Parameters
+        ----------
+        task_name : str, list of str, optional
+            Name(s) of the tasks to get the records of.
+        action : str, list of str, optional
+            Action(s) of the records, ie. ``"run"``.
+        start, end : datetime, float, optional
+            Time span of the records (inclusive).
+        after : str, optional
+            Token of a previous cursor (``cursor.token``)
+            to continue after its records.
+        page_size : int
+            Number of records read from a repository at a time.
+        as_tuples : bool
+            Whether to return the records as tuples
+            ``(task_name, action, created)``.
+
+        Returns
+        -------
+        rocketry.core.log.LogCursor
+            Iterator of the task log records.
+
+        Examples
+        --------
+        .. code-block:: python
+
+            cursor = session.iter_task_log(action="fail", page_size=500)
+            for record in cursor:
+                ...
+
+            # Continue later
+            page = session.iter_task_log(action="fail", after=cursor.token).page(100)
+        """
+        from rocketry.core.log import LogCursor
+        if self._log_writer is not None:
+            # Records logged in the background
+            self._log_writer.flush()
+        repos = {}
+        for logger in self.get_task_loggers(with_adapters=True).values():
+            try:
+                repo = logger._get_repo()
+            except AttributeError:
+                # Not readable
+                continue
+            repos.setdefault(id(repo), repo)
+
+        query = {}
+        for key, value in (("task_name", task_name), ("action", action)):
+            if isinstance(value, str):
+                query[key] = value
+            elif value is not None:
+                query[key] = in_(list(value))
+        if isinstance(start, datetime.datetime):
+            start = to_timestamp(start)
+        if isinstance(end, datetime.datetime):
+            end = to_timestamp(end)
+        return LogCursor(
+            repos.values(), query,
+            start=start if start is not None else -math.inf,
+            end=end if end is not None else math.inf,
+            after=after, page_size=page_size, as_tuples=as_tuples
+        )
+
     def delete_task_loggers(self):
         """Delete the previous loggers from task logger"""
         loggers = logging.Logger.manager.loggerDict
@@ -521,6 +656,8 @@ class Session(RedBase):
         from rocketry.core import Parameters
 
         self.tasks = set()
+        self._task_index = {}
+        self._reset_task_repos()
         self.parameters = Parameters()
 
     def __getstate__(self):
@@ -528,7 +665,12 @@ class Session(RedBase):
         # the task.session. Therefore removing unpicklable here.
         state = self.__dict__.copy()
         state["tasks"] = set()
+        state["_task_index"] = {}
         state["_cond_cache"] = None
+        state["_cycle"] = None
+        state["_log_writer"] = None
+        state["_log_batch"] = None
+        state["_period_cache"] = None
         state["_cond_parsers"] = None
         state["session"] = None
         #state["parameters"] = None
@@ -612,7 +754,31 @@ class Session(RedBase):
         return time.time()
 
     def _get_datetime_now(self):
+        cycle = getattr(self, "_cycle", None)
+        if cycle is not None:
+            # Time is frozen in the cycle
+            if cycle.now is None:
+                cycle.now = self._format_timestamp(self._get_timestamp_now())
+            return cycle.now
         return self._format_timestamp(self.get_time())
 
+    def _get_timestamp_now(self) -> float:
+        cycle = getattr(self, "_cycle", None)
+        if cycle is not None:
+            # Time is frozen in the cycle
+            if cycle.timestamp is None:
+                cycle.timestamp = self.get_time()
+            return cycle.timestamp
+        return self.get_time()
+
+    def _invalidate_cycle(self, task_name:Optional[str]=None):
+        "Clear the memoized states and log query results (depending on the task) of the current cycle"
+        cycle = getattr(self, "_cycle", None)
+        if cycle is not None:
+            cycle.invalidate(task_name)
+        log_batch = getattr(self, "_log_batch", None)
+        if log_batch is not None:
+            log_batch.invalidate(task_name)
+
     def _format_timestamp(self, dt:float):
         return datetime.datetime.fromtimestamp(dt, tz=self.config.timezone)
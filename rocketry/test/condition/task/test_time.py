@@ -1,3 +1,6 @@
+import datetime
+import multiprocessing
+import threading
 from typing import List, Tuple
 
 import pytest
@@ -15,6 +18,7 @@ from rocketry.testing.log import create_task_record
 from rocketry.time import (
     TimeOfDay, TimeSpanDelta
 )
+from rocketry.core.task import TaskRun
 from rocketry.tasks import FuncTask
 
 
@@ -530,3 +534,69 @@ def test_fail(mock_datetime_now, logs, time_after, get_condition, outcome, sessi
         assert cond.observe(session=session)
     else:
         assert not cond.observe(session=session)
+
+@pytest.mark.parametrize(
+    "logs,n_running,n_recent",
+    [
+        pytest.param([("2020-01-01 07:10", "run", None)], 1, 0, id="Running"),
+        pytest.param([("2020-01-01 07:10", "run", None), ("2020-01-01 07:20", "run", None)], 2, 1, id="Running (multiple times)"),
+        pytest.param([("2020-01-01 07:10", "run", None), ("2020-01-01 07:15", "success", None)], 0, 0, id="Not running (succeeded)"),
+        pytest.param(
+            [("2020-01-01 07:10", "run", None), ("2020-01-01 07:20", "run", None), ("2020-01-01 07:25", "fail", None)],
+            1, 1, id="Running (one of two finished)"
+        ),
+        pytest.param(
+            [("2020-01-01 07:10", "run", "a"), ("2020-01-01 07:20", "run", "b"), ("2020-01-01 07:25", "success", "b")],
+            1, 0, id="Running (run IDs)"
+        ),
+        pytest.param(
+            [("2020-01-01 07:10", "run", "a"), ("2020-01-01 07:20", "run", "b"), ("2020-01-01 07:25", "success", "a"), ("2020-01-01 07:26", "fail", "b")],
+            0, 0, id="Not running (run IDs)"
+        ),
+    ],
+)
+def test_running_open_runs(mock_datetime_now, logs, n_running, n_recent, session):
+    session.config.force_status_from_logs = True
+    task = FuncTask(lambda:None, name="the task", execution="main", session=session)
+    # Maintained by the scheduler
+    task._open_runs = {}
+    for log_time, log_action, run_id in logs:
+        record = create_task_record(
+            created=log_time, action=log_action, task_name="the task",
+            msg="Logging of 'task'", args=(), exc_info=None,
+        )
+        record.run_id = run_id
+        task.log_record(record)
+    mock_datetime_now("2020-01-01 07:30")
+
+    assert len(task._open_runs) == n_running
+    assert (TaskRunning(task="the task") == n_running).observe(session=session)
+    assert (TaskRunning(task="the task", period=TimeSpanDelta(far="15 mins")) == n_recent).observe(session=session)
+
+    # Same as reading the logs
+    task._open_runs = None
+    assert (TaskRunning(task="the task") == n_running).observe(session=session)
+
+def test_running_open_runs_process(session):
+    session.config.force_status_from_logs = True
+    task = FuncTask(lambda:None, name="the task", execution="main", session=session)
+    task._open_runs = {}
+    # Process started by the scheduler before the process logged running
+    start = datetime.datetime(2020, 1, 1, 7, 5).timestamp()
+    run = TaskRun(start=start, task=multiprocessing.Process(), run_id="a", event_running=threading.Event())
+    task._run_stack.append(run)
+
+    record = create_task_record(
+        created="2020-01-01 07:10", action="run", task_name="the task",
+        msg="Logging of 'task'", args=(), exc_info=None,
+    )
+    record.run_id = "a"
+    created = record.created
+    task.log_record(record)
+
+    assert run.event_running.is_set()
+    # The record is kept as logged, the open run has the start
+    assert record.created == created
+    assert task.logger.filter_by(action="run").last().created == created
+    assert task._open_runs == {"a": start}
+    task._run_stack.remove(run)
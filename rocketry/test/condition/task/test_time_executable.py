@@ -3,12 +3,16 @@ import logging
 
 import pytest
 
+from redbird.logging import RepoHandler
+
 from rocketry.conditions import (
-    TaskExecutable,
+    IsPeriod, TaskExecutable,
 )
+from rocketry.log import MinimalRecord
+from rocketry.log.repos import RetentionMemoryRepo
 from rocketry.pybox.time.convert import to_datetime
 from rocketry.time import (
-    TimeOfDay
+    TimeDelta, TimeOfDay
 )
 from rocketry.tasks import FuncTask
 from rocketry.time.interval import TimeOfMinute
@@ -283,3 +287,60 @@ def test_periods(mock_datetime_now, logs, time_after, get_condition, outcome, se
     else:
         assert not condition.observe(session=session)
         assert not condition.observe(task=task)
+
+
+@pytest.mark.parametrize("from_logs", [pytest.param(True, id="from logs"), pytest.param(False, id="optimized")])
+@pytest.mark.parametrize("retries", [None, 2])
+@pytest.mark.parametrize("period", [TimeOfDay("07:00", "08:00"), TimeDelta("30 minutes")])
+def test_same_as_sub_conds(mock_datetime_now, session, from_logs, retries, period):
+    session.config.force_status_from_logs = from_logs
+    task = FuncTask(lambda:None, name="the task", execution="main", session=session)
+    condition = TaskExecutable(task="the task", period=period, retries=retries)
+
+    logs = [
+        ("2020-01-01 07:10", "run"), ("2020-01-01 07:12", "fail"),
+        ("2020-01-01 07:20", "run"), ("2020-01-01 07:22", "fail"),
+        ("2020-01-01 07:30", "run"), ("2020-01-01 07:32", "fail"),
+        ("2020-01-01 07:40", "run"), ("2020-01-01 07:42", "success"),
+        ("2020-01-02 07:10", "run"), ("2020-01-02 07:12", "inaction"),
+    ]
+    for log_time, log_action in logs:
+        mock_datetime_now(log_time)
+        log_method = {"run": task.log_running, "fail": task.log_failure, "success": task.log_success, "inaction": task.log_inaction}[log_action]
+        log_method()
+
+        for time_after in ("07:15", "07:25", "07:35", "07:45", "07:55", "08:30"):
+            mock_datetime_now(f"{log_time[:10]} {time_after}")
+            expected = all(cond.observe(task=task, session=session) for cond in condition._get_sub_conds(task))
+            if not isinstance(period, TimeDelta):
+                expected = expected and IsPeriod(period=period).observe(session=session)
+            assert condition.observe(session=session) == expected
+        mock_datetime_now(log_time)
+
+def test_sub_conds_cached(session):
+    task = FuncTask(lambda:None, name="the task", execution="main", session=session)
+    condition = TaskExecutable(period=TimeDelta("1 hour"))
+    assert condition._get_sub_conds(task) is condition._get_sub_conds("the task")
+    # The cache does not affect equality
+    assert condition == TaskExecutable(period=TimeDelta("1 hour"))
+
+def test_compacted_logs(mock_datetime_now, session):
+    session.config.force_status_from_logs = True
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=2)
+    logging.getLogger(session.config.task_logger_basename).handlers = [RepoHandler(repo=repo)]
+    task = FuncTask(lambda:None, name="the task", execution="main", session=session)
+    condition = TaskExecutable(task="the task", period=TimeOfDay("07:00", "08:00"))
+
+    mock_datetime_now("2020-01-01 07:10")
+    task.log_running()
+    task.log_success()
+    for minute in range(11, 21):
+        mock_datetime_now(f"2020-01-01 07:{minute}")
+        task.log_running()
+
+    # The success is only in the counts of the repo
+    mock_datetime_now("2020-01-01 07:30")
+    assert task.logger.filter_by(action="success").all() == []
+    assert not condition.observe(session=session)
+    mock_datetime_now("2020-01-02 07:30")
+    assert condition.observe(session=session)
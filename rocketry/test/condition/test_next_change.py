@@ -0,0 +1,103 @@
+import logging
+import math
+
+from redbird.logging import RepoHandler
+
+from rocketry.conditions import (
+    AlwaysTrue, AlwaysFalse, All, Any, Not,
+    TaskStarted, TaskExecutable, IsPeriod, FuncCond, DependSuccess,
+)
+from rocketry.log import MinimalRecord
+from rocketry.log.repos import RetentionMemoryRepo
+from rocketry.pybox.time.convert import to_datetime, to_timestamp
+from rocketry.time import TimeOfDay, TimeDelta
+from rocketry.tasks import FuncTask
+
+from .task.test_time import setup_task_state
+
+def test_constant(session):
+    assert AlwaysTrue().get_next_change(session=session) == math.inf
+    assert AlwaysFalse().get_next_change(session=session) == math.inf
+    assert FuncCond(lambda: True).get_next_change(session=session) is None
+
+def test_is_period(session, mock_datetime_now):
+    cond = IsPeriod(period=TimeOfDay("10:00", "12:00"))
+
+    mock_datetime_now("2000-01-01 09:00")
+    assert cond.get_next_change(session=session) == to_timestamp(to_datetime("2000-01-01 10:00"))
+
+    mock_datetime_now("2000-01-01 11:00")
+    assert cond.get_next_change(session=session) == to_timestamp(to_datetime("2000-01-01 12:00"))
+
+def test_container(session, mock_datetime_now):
+    mock_datetime_now("2000-01-01 09:00")
+    period_change = to_timestamp(to_datetime("2000-01-01 10:00"))
+    is_period = IsPeriod(period=TimeOfDay("10:00", "12:00"))
+
+    assert All(AlwaysTrue(), is_period).get_next_change(session=session) == period_change
+    assert Any(AlwaysTrue(), is_period).get_next_change(session=session) == period_change
+    assert Not(is_period).get_next_change(session=session) == period_change
+
+    # Unknown change
+    assert All(is_period, FuncCond(lambda: True)).get_next_change(session=session) is None
+
+def test_task_started_delta(session, mock_datetime_now):
+    task = FuncTask(lambda: None, name="the task", execution="main", session=session)
+    cond = TaskStarted(task=task, period=TimeDelta("1 hour")) == 0
+
+    # Never run, changes only when the task runs
+    mock_datetime_now("2000-01-01 12:00")
+    assert cond.get_next_change(session=session) == math.inf
+
+    task._last_run = to_timestamp(to_datetime("2000-01-01 11:30"))
+    assert cond.get_next_change(session=session) == to_timestamp(to_datetime("2000-01-01 12:30"))
+
+def test_task_started_delta_count(session, mock_datetime_now):
+    task = FuncTask(lambda: None, name="the task", execution="main", session=session)
+    cond = TaskStarted(task=task, period=TimeDelta("1 hour")) >= 2
+
+    setup_task_state(
+        mock_datetime_now,
+        [("2000-01-01 10:30", "run"), ("2000-01-01 11:15", "run"), ("2000-01-01 11:30", "run")],
+        task=task, time_after="2000-01-01 12:00"
+    )
+    # The first run in the period falls out first
+    assert cond.get_next_change(session=session) == to_timestamp(to_datetime("2000-01-01 12:15"))
+
+def test_task_started_delta_compacted(session, mock_datetime_now):
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=2)
+    logging.getLogger(session.config.task_logger_basename).handlers = [RepoHandler(repo=repo)]
+    task = FuncTask(lambda: None, name="the task", execution="main", session=session)
+    cond = TaskStarted(task=task, period=TimeDelta("1 hour")) >= 2
+
+    setup_task_state(
+        mock_datetime_now,
+        [("2000-01-01 11:10", "run"), ("2000-01-01 11:15", "run"), ("2000-01-01 11:20", "run"), ("2000-01-01 11:30", "run")],
+        task=task, time_after="2000-01-01 12:00"
+    )
+    # When the compacted runs fall out is not known
+    assert cond.observe(task=task, session=session)
+    assert cond.get_next_change(session=session) is None
+
+def test_task_executable_period(session, mock_datetime_now):
+    task = FuncTask(lambda: None, name="the task", execution="main", session=session)
+    cond = TaskExecutable(task=task, period=TimeOfDay("10:00", "12:00"))
+
+    mock_datetime_now("2000-01-01 09:00")
+    assert cond.get_next_change(session=session) == to_timestamp(to_datetime("2000-01-01 10:00"))
+
+def test_inputs(session):
+    task = FuncTask(lambda: None, name="the task", execution="main", session=session)
+    other = FuncTask(lambda: None, name="other", execution="main", session=session)
+
+    assert AlwaysTrue().get_inputs(session=session) == set()
+    assert IsPeriod(period=TimeOfDay("10:00", "12:00")).get_inputs(session=session) == set()
+    assert FuncCond(lambda: True).get_inputs(session=session) is None
+
+    assert TaskStarted().get_inputs(task=task, session=session) == {"the task"}
+    assert TaskStarted(task="other").get_inputs(task=task, session=session) == {"other"}
+    assert DependSuccess(depend_task=other).get_inputs(task=task, session=session) == {"the task", "other"}
+
+    cond = TaskStarted(task="other") & IsPeriod(period=TimeOfDay("10:00", "12:00")) & TaskExecutable()
+    assert cond.get_inputs(task=task, session=session) == {"the task", "other"}
+    assert (cond | FuncCond(lambda: True)).get_inputs(task=task, session=session) is None
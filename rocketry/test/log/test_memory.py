@@ -0,0 +1,258 @@
+import datetime
+import logging
+
+import pytest
+from redbird.logging import RepoHandler
+from redbird.oper import between, in_
+from redbird.repos import MemoryRepo
+from rocketry.log import CompactRecord, MinimalRecord, TaskRunRecord
+from rocketry.conditions import TaskFailed
+from rocketry.log.repos import IndexedMemoryRepo, RetentionMemoryRepo
+from rocketry.log.utils import get_field_value, get_latest_actions
+
+RECORDS = [
+    # Out of order on purpose
+    {"task_name": "task 1", "action": "run", "created": 1.0},
+    {"task_name": "task 1", "action": "success", "created": 2.0},
+    {"task_name": "task 2", "action": "run", "created": 2.5},
+    {"task_name": "task 1", "action": "run", "created": 5.0},
+    {"task_name": "task 1", "action": "fail", "created": 6.0},
+    {"task_name": "task 1", "action": "run", "created": 3.0},
+    {"task_name": "task 1", "action": "success", "created": 4.0},
+    {"task_name": "task 2", "action": "fail", "created": 3.0},
+]
+
+def create_repos():
+    repos = (MemoryRepo(model=MinimalRecord), IndexedMemoryRepo(model=MinimalRecord))
+    for repo in repos:
+        for record in RECORDS:
+            repo.add(MinimalRecord(**record))
+    return repos
+
+@pytest.mark.parametrize("query", [
+    pytest.param({"task_name": "task 1"}, id="task"),
+    pytest.param({"task_name": "task 1", "action": "run"}, id="action"),
+    pytest.param({"task_name": "task 1", "action": in_(["run", "fail"])}, id="in actions"),
+    pytest.param({"task_name": "task 1", "created": between(2.0, 5.0)}, id="between"),
+    pytest.param({"task_name": "task 1", "created": between(2.5, 10.0)}, id="from"),
+    pytest.param({"task_name": "task 1", "action": "success", "created": between(0.0, 3.0)}, id="action till"),
+    pytest.param({"task_name": "task 1", "created": 3.0}, id="exact time"),
+    pytest.param({"task_name": "missing"}, id="missing task"),
+    pytest.param({"task_name": "task 1", "action": "missing"}, id="missing action"),
+])
+def test_same_as_memory(query):
+    repo, indexed = create_repos()
+    # Indexed repo returns the records of a task in time order
+    expected = sorted(repo.filter_by(**query).all(), key=lambda r: r.created)
+    assert indexed.filter_by(**query).all() == expected
+    assert indexed.filter_by(**query).count() == len(expected)
+    assert indexed.filter_by(**query).last() == (expected[-1] if expected else None)
+    assert indexed.filter_by(**query).first() == (expected[0] if expected else None)
+
+def test_indexed_not_scanned(monkeypatch):
+    indexed = IndexedMemoryRepo(model=MinimalRecord)
+    for i in range(1000):
+        indexed.add(MinimalRecord(task_name=f"task {i % 10}", action="run", created=float(i)))
+
+    def scan(*args, **kwargs):
+        raise AssertionError("Records were scanned")
+    for method in ("query_data", "query_read_last", "query_read_first", "query_count"):
+        monkeypatch.setattr(MemoryRepo, method, scan)
+    monkeypatch.setattr(IndexedMemoryRepo, "_reindex", scan)
+
+    query = {"task_name": "task 1", "action": "run"}
+    assert indexed.filter_by(**query, created=between(100.0, 150.0)).count() == 5
+    assert [r.created for r in indexed.filter_by(**query, created=between(100.0, 150.0)).all()] == [101.0, 111.0, 121.0, 131.0, 141.0]
+    assert indexed.filter_by(**query).last().created == 991.0
+    assert indexed.filter_by(**query).first().created == 1.0
+
+def test_not_indexed():
+    repo, indexed = create_repos()
+    assert indexed.filter_by(action="run").all() == repo.filter_by(action="run").all()
+    assert indexed.filter_by(action="run").count() == 4
+
+def test_modify():
+    repo, indexed = create_repos()
+
+    indexed.filter_by(task_name="task 1", action="run").delete()
+    assert indexed.filter_by(task_name="task 1", action="run").count() == 0
+    assert indexed.filter_by(task_name="task 1").count() == 3
+
+    # Collection replaced
+    indexed.collection = list(repo.collection)
+    assert indexed.filter_by(task_name="task 1", action="run").count() == 3
+
+    # Collection modified directly
+    indexed.collection.append(MinimalRecord(task_name="task 1", action="run", created=0.5))
+    assert indexed.filter_by(task_name="task 1", action="run").first().created == 0.5
+
+def test_latest_actions():
+    indexed = create_repos()[1]
+    assert dict(get_latest_actions(indexed)) == {
+        "task 1": {"run": 5.0, "success": 4.0, "fail": 6.0},
+        "task 2": {"run": 2.5, "fail": 3.0},
+    }
+
+def test_default(session):
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=IndexedMemoryRepo(model=MinimalRecord))]
+    task = session.create_task(func=lambda: None, name="task 1", execution="main")
+    task.log_running()
+    task.log_success()
+    task.log_running()
+    task.log_failure()
+    assert [r.action for r in task.logger.get_records()] == ["run", "success", "run", "fail"]
+    assert [r.action for r in task.logger.filter_by(action="run").all()] == ["run", "run"]
+    task.set_cached()
+    assert task.status == "fail"
+
+def test_retention_max_records():
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=100, rollup=datetime.timedelta(seconds=10))
+    for i in range(1000):
+        repo.add(MinimalRecord(task_name="task 1", action="run", created=float(i)))
+        repo.add(MinimalRecord(task_name="task 1", action="success", created=i + 0.5))
+        assert len(repo.filter_by(task_name="task 1").all()) <= 126
+        # Compacted are removed from the collection in batches
+        assert len(repo.collection) <= 2 * 126 + 1
+    repo.add(MinimalRecord(task_name="task 2", action="run", created=0.0))
+
+    assert repo.filter_by(task_name="task 1").count() == 2000
+    assert repo.filter_by(task_name="task 1", action="run").count() == 1000
+    assert repo.filter_by(task_name="task 1", action="run", created=between(100.0, 199.0)).count() == 100
+    assert repo.filter_by(task_name="task 2").count() == 1
+    # Only the recent are as records
+    assert repo.filter_by(task_name="task 1").first().created >= 900
+    assert repo.filter_by(task_name="task 1").last().created == 999.5
+    assert dict(get_latest_actions(repo)) == {
+        "task 1": {"run": 999.0, "success": 999.5},
+        "task 2": {"run": 0.0},
+    }
+
+    repo.filter_by(task_name="task 1", action="run").delete()
+    assert repo.filter_by(task_name="task 1").count() == 1000
+
+def test_retention_many_tasks():
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=10)
+    for i in range(500):
+        repo.add(MinimalRecord(task_name=f"task {i % 5}", action="run", created=float(i)))
+    assert len(repo.collection) <= 2 * 5 * 13 + 1
+    for i in range(5):
+        records = repo.filter_by(task_name=f"task {i}").all()
+        assert 10 <= len(records) <= 13
+        assert records[-1].created == 495.0 + i
+        assert repo.filter_by(task_name=f"task {i}").count() == 100
+
+    # Scanning queries do not see the compacted
+    assert len(repo.filter_by(action="run").all()) == sum(
+        len(repo.filter_by(task_name=f"task {i}").all()) for i in range(5)
+    )
+
+def test_retention_window_edges():
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=10, rollup=datetime.timedelta(seconds=10))
+    for i in range(1000):
+        repo.add(MinimalRecord(task_name="task 1", action="run", created=float(i)))
+
+    # Edges on the rollup periods are exact
+    assert repo.filter_by(task_name="task 1", created=between(100.0, 199.0)).count() == 100
+    assert repo.filter_by(task_name="task 1", created=between(100.0, 199.5)).count() == 100
+    assert repo.filter_by(task_name="task 1", created=between(99.5, 109.9)).count() == 10
+
+    # Otherwise the error is at most the records of the edge periods
+    count = repo.filter_by(task_name="task 1", created=between(105.0, 194.0)).count()
+    assert 90 <= count <= 90 + 2 * 10
+    count = repo.filter_by(task_name="task 1", created=between(109.5, 190.0)).count()
+    assert 81 <= count <= 81 + 10
+
+def test_retention_rollups_bounded():
+    repo = RetentionMemoryRepo(model=MinimalRecord, max_records=1, rollup=datetime.timedelta(seconds=1), max_rollups=20)
+    n_rollups = []
+    for i in range(10_000):
+        # A record in each rollup period
+        repo.add(MinimalRecord(task_name="task 1", action="run", created=float(i)))
+        starts, stats = repo._rollups.get("task 1", {}).get("run", ([], []))
+        n_rollups.append(len(starts))
+    assert max(n_rollups) <= 20
+
+    # Nothing is dropped in merging
+    assert repo.filter_by(task_name="task 1").count() == 10_000
+    # Recent rollups are not merged
+    assert repo.filter_by(task_name="task 1", created=between(9_995.0, 9_999.0)).count() == 5
+    # Old rollups are merged thus the edges may be counted whole
+    starts, stats = repo._rollups["task 1"]["run"]
+    count = repo.filter_by(task_name="task 1", created=between(5_000.0, 5_999.0)).count()
+    assert 1_000 <= count <= 1_000 + 2 * max(n for n, first, last in stats)
+    assert max(n for n, first, last in stats) <= 2 * 10_000 / 10
+
+def test_retention_period():
+    repo = RetentionMemoryRepo(model=MinimalRecord, retention=datetime.timedelta(hours=1))
+    for i in range(48):
+        # Every half an hour
+        repo.add(MinimalRecord(task_name="task 1", action="fail", created=i * 1800.0))
+    assert len(repo.filter_by(task_name="task 1").all()) <= 5
+    assert len(repo.collection) <= 2 * 5 + 1
+    assert repo.filter_by(task_name="task 1").count() == 48
+    assert repo.filter_by(task_name="task 1", created=between(0.0, 3600.0 * 12 - 1)).count() == 24
+
+def test_retention_condition(session):
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=RetentionMemoryRepo(model=MinimalRecord, max_records=10))]
+    task = session.create_task(func=lambda: None, name="task 1", execution="main")
+    for _ in range(50):
+        task.log_running()
+        task.log_failure()
+    assert len(task.logger.get_records()) <= 13
+    assert (TaskFailed(task="task 1") == 50).observe(session=session)
+    assert not (TaskFailed(task="task 1") > 50).observe(session=session)
+
+def test_compact():
+    repo = IndexedMemoryRepo(model=TaskRunRecord)
+    # As RepoHandler logs
+    repo.add({
+        "task_name": "task 1", "action": "success", "created": 60.0, "message": "Task 'task 1' status: 'success'",
+        "start": 0.0, "end": 60.0, "runtime": datetime.timedelta(seconds=60), "run_id": "1", "levelname": "INFO",
+    })
+    data = repo.collection[0]
+    assert isinstance(data, CompactRecord)
+    assert not hasattr(data, "levelname")
+    assert get_field_value(data, "action") == "success"
+    assert data["run_id"] == "1"
+
+    # Validated when read
+    record = repo.filter_by(task_name="task 1").last()
+    assert isinstance(record, TaskRunRecord)
+    assert record.runtime.total_seconds() == 60
+    assert repo.filter_by(task_name="task 1").all() == [record]
+    assert get_field_value(record, "action") == "success"
+
+    repo = IndexedMemoryRepo(model=TaskRunRecord, compact=False)
+    repo.add({"task_name": "task 1", "action": "success", "created": 60.0, "message": "Task 'task 1' status: 'success'"})
+    assert isinstance(repo.collection[0], TaskRunRecord)
+
+def test_compact_handler():
+    # Logged through the handler, read back as validated
+    repos = (IndexedMemoryRepo(model=TaskRunRecord), IndexedMemoryRepo(model=TaskRunRecord, compact=False))
+    logger = logging.getLogger("rocketry.task.test_compact")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    extra = {
+        "task_name": "task 1", "action": "success", "run_id": "1",
+        "start": datetime.datetime(2022, 1, 1, 10, 0), "end": datetime.datetime(2022, 1, 1, 10, 1),
+        "runtime": datetime.timedelta(seconds=60),
+    }
+    for repo in repos:
+        logger.handlers = [RepoHandler(repo=repo)]
+        logger.info("Task 'task 1' status: 'success'", extra=extra)
+    logger.handlers = []
+
+    compact, validated = repos
+    data = compact.collection[0]
+    assert isinstance(data, CompactRecord)
+    assert data.dict().keys() == TaskRunRecord.__fields__.keys()
+    assert data["run_id"] == "1"
+    assert isinstance(validated.collection[0], TaskRunRecord)
+
+    record = compact.filter_by(task_name="task 1").last()
+    assert isinstance(record, TaskRunRecord)
+    assert record.runtime.total_seconds() == 60
+    assert record.dict(exclude={"created"}) == validated.collection[0].dict(exclude={"created"})
+    assert data.to_model() == record
@@ -5,7 +5,10 @@ import redbird
 from redbird.logging import RepoHandler
 from redbird.repos import CSVFileRepo, SQLRepo
 from rocketry import Rocketry
+from rocketry.conds import true
 from rocketry.log import MinimalRecord, MinimalRunRecord, TaskLogRecord, TaskRunRecord
+from rocketry.log.repos import IndexedMemoryRepo, SQLiteRepo
+from rocketry.log.utils import get_action_times, get_latest_actions, tail_actions, iter_by_created
 
 def get_csv(model, tmpdir):
     file = tmpdir.join("logs.csv")
@@ -15,7 +18,14 @@ def get_sql(model, tmpdir):
     pytest.importorskip("sqlalchemy")
     return SQLRepo(conn_string="sqlite://", table="mylogs", if_missing="create", model=model, id_field="created")
 
-@pytest.mark.parametrize("get_repo", [get_csv, get_sql])
+def get_sqlite(model, tmpdir):
+    file = tmpdir.join("logs.db")
+    return SQLiteRepo(filename=str(file), model=model)
+
+def get_memory(model, tmpdir):
+    return IndexedMemoryRepo(model=model)
+
+@pytest.mark.parametrize("get_repo", [get_csv, get_sql, get_sqlite])
 @pytest.mark.parametrize("model", [MinimalRecord, MinimalRunRecord, TaskLogRecord, TaskRunRecord])
 def test_cache(session, tmpdir, model, get_repo):
     if get_repo == get_sql and model in (TaskRunRecord, TaskLogRecord) and redbird.version_tuple[:3] <= (0, 6, 0):
@@ -39,4 +49,100 @@ def test_cache(session, tmpdir, model, get_repo):
     assert logs == [
         {"action": "run", "task_name": "task 1"},
         {"action": "success", "task_name": "task 1"}
-    ]
\ No newline at end of file
+    ]
+@pytest.mark.parametrize("get_repo", [get_csv, get_sql, get_sqlite, get_memory])
+def test_latest_actions(session, tmpdir, get_repo):
+    repo = get_repo(model=MinimalRecord, tmpdir=tmpdir)
+    repo.add(MinimalRecord(task_name="task 1", action="run", created=1640988000))
+    repo.add(MinimalRecord(task_name="task 1", action="success", created=1640988060))
+    repo.add(MinimalRecord(task_name="task 2", action="run", created=1640988100))
+    repo.add(MinimalRecord(task_name="task 1", action="run", created=1640988200))
+    repo.add(MinimalRecord(task_name="task 1", action="fail", created=1640988260))
+    repo.add(MinimalRecord(task_name="task 3", action="run", created=1640988300))
+
+    assert get_latest_actions(repo, task_names=["task 1", "task 2"]) == {
+        "task 1": {"run": 1640988200, "success": 1640988060, "fail": 1640988260},
+        "task 2": {"run": 1640988100},
+    }
+
+@pytest.mark.parametrize("get_repo", [get_csv, get_sql, get_sqlite])
+def test_startup_restore(session, tmpdir, get_repo):
+    repo = get_repo(model=MinimalRecord, tmpdir=tmpdir)
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=repo)]
+    repo.add(MinimalRecord(task_name="task 1", action="run", created=1640988000))
+    repo.add(MinimalRecord(task_name="task 1", action="success", created=1640988060))
+    repo.add(MinimalRecord(task_name="task 2", action="run", created=1640988100))
+
+    task_1 = session.create_task(func=lambda: None, name="task 1")
+    task_2 = session.create_task(func=lambda: None, name="task 2")
+    task_3 = session.create_task(func=lambda: None, name="task 3")
+
+    session.config.shut_cond = true
+    session.start()
+
+    assert task_1.status == "success"
+    assert task_1.last_run.timestamp() == 1640988000
+    assert task_1.last_success.timestamp() == 1640988060
+    # Scheduler crashed while the task was running
+    assert task_2.status == "crash"
+    assert task_3.status is None
+    assert task_3.last_run is None
+
+@pytest.mark.parametrize("get_repo", [get_csv, get_sql, get_sqlite, get_memory])
+def test_tail_actions(tmpdir, get_repo):
+    repo = get_repo(model=MinimalRecord, tmpdir=tmpdir)
+    repo.add(MinimalRecord(task_name="task 1", action="run", created=1640988000))
+
+    rows, cursor = tail_actions(repo)
+    assert rows == []
+
+    repo.add(MinimalRecord(task_name="task 1", action="success", created=1640988060))
+    repo.add(MinimalRecord(task_name="task 2", action="run", created=1640988060))
+    rows, cursor = tail_actions(repo, cursor)
+    assert sorted(rows) == [("task 1", "success", 1640988060), ("task 2", "run", 1640988060)]
+
+    rows, cursor = tail_actions(repo, cursor)
+    assert rows == []
+
+    # Created at the same time as the previous latest
+    repo.add(MinimalRecord(task_name="task 3", action="run", created=1640988060))
+    repo.add(MinimalRecord(task_name="task 2", action="fail", created=1640988120))
+    rows, cursor = tail_actions(repo, cursor)
+    assert rows == [("task 3", "run", 1640988060), ("task 2", "fail", 1640988120)]
+    assert tail_actions(repo, cursor)[0] == []
+
+@pytest.mark.parametrize("get_repo", [get_csv, get_sql, get_sqlite, get_memory])
+def test_action_times(tmpdir, get_repo):
+    repo = get_repo(model=MinimalRecord, tmpdir=tmpdir)
+    repo.add(MinimalRecord(task_name="task 1", action="run", created=1640988000))
+    repo.add(MinimalRecord(task_name="task 1", action="success", created=1640988060))
+    repo.add(MinimalRecord(task_name="task 2", action="fail", created=1640988120))
+    repo.add(MinimalRecord(task_name="task 1", action="fail", created=1640988180))
+    repo.add(MinimalRecord(task_name="task 2", action="success", created=1640988240))
+
+    assert get_action_times(repo, ["success", "fail"]) == {
+        "task 1": [1640988060, 1640988180],
+        "task 2": [1640988120, 1640988240],
+    }
+    assert get_action_times(repo, ["success"], 1640988100, 1640988240) == {"task 2": [1640988240]}
+    assert get_action_times(repo, ["crash"]) == {}
+    assert get_action_times(repo, ["success", "fail"], task_names=["task 2", "task 3"]) == {
+        "task 2": [1640988120, 1640988240],
+    }
+    assert get_action_times(repo, ["success", "fail"], task_names=[]) == {}
+
+@pytest.mark.parametrize("get_repo", [get_csv, get_sql, get_sqlite, get_memory])
+def test_by_created(tmpdir, get_repo):
+    repo = get_repo(model=MinimalRecord, tmpdir=tmpdir)
+    repo.add(MinimalRecord(task_name="task 1", action="run", created=1640988000))
+    repo.add(MinimalRecord(task_name="task 2", action="fail", created=1640988120))
+    repo.add(MinimalRecord(task_name="task 1", action="success", created=1640988060))
+    repo.add(MinimalRecord(task_name="task 1", action="fail", created=1640988180))
+
+    records = iter_by_created(repo, page_size=1)
+    assert [(r.task_name, r.action) for r in records] == [
+        ("task 1", "run"), ("task 1", "success"), ("task 2", "fail"), ("task 1", "fail")
+    ]
+    records = iter_by_created(repo, {"task_name": "task 1"}, start=1640988060, page_size=1)
+    assert [r.created for r in records] == [1640988060, 1640988180]
@@ -0,0 +1,176 @@
+import atexit
+import sqlite3
+import time
+
+import pytest
+from redbird.oper import between, greater_equal, in_
+from redbird.repos import MemoryRepo
+from rocketry.log import MinimalRecord, TaskRunRecord
+from rocketry.log.repos import SQLiteRepo
+
+RECORDS = [
+    {"task_name": "task 1", "action": "run", "created": 1.0},
+    {"task_name": "task 1", "action": "success", "created": 2.0},
+    {"task_name": "task 2", "action": "run", "created": 2.5},
+    {"task_name": "task 1", "action": "run", "created": 3.0},
+    {"task_name": "task 2", "action": "fail", "created": 3.5},
+    {"task_name": "task 1", "action": "fail", "created": 4.0},
+]
+
+@pytest.fixture
+def repo(tmpdir):
+    repo = SQLiteRepo(filename=str(tmpdir.join("logs.db")), model=MinimalRecord)
+    yield repo
+    repo.close()
+
+@pytest.mark.parametrize("query", [
+    pytest.param({}, id="all"),
+    pytest.param({"task_name": "task 1"}, id="task"),
+    pytest.param({"task_name": "task 1", "action": "run"}, id="action"),
+    pytest.param({"task_name": "task 1", "action": in_(["run", "fail"])}, id="in actions"),
+    pytest.param({"task_name": "task 1", "created": between(2.0, 3.5)}, id="between"),
+    pytest.param({"task_name": "task 1", "created": greater_equal(3.0)}, id="greater equal"),
+    pytest.param({"task_name": "missing"}, id="missing"),
+])
+def test_same_as_memory(repo, query):
+    mem_repo = MemoryRepo(model=MinimalRecord)
+    for record in RECORDS:
+        repo.add(MinimalRecord(**record))
+        mem_repo.add(MinimalRecord(**record))
+
+    expected = mem_repo.filter_by(**query).all()
+    assert repo.filter_by(**query).all() == expected
+    assert repo.filter_by(**query).count() == len(expected)
+    assert repo.filter_by(**query).last() == (expected[-1] if expected else None)
+    assert repo.filter_by(**query).first() == (expected[0] if expected else None)
+
+def test_batched_writes(tmpdir):
+    file = str(tmpdir.join("logs.db"))
+    repo = SQLiteRepo(filename=file, model=MinimalRecord, flush_interval=60)
+    assert repo.filter_by().count() == 0
+    for record in RECORDS:
+        repo.add(MinimalRecord(**record))
+
+    with sqlite3.connect(file) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        # Not yet written
+        assert conn.execute('SELECT COUNT(*) FROM "task_log"').fetchone() == (0,)
+        # Reads write the pending records
+        assert repo.filter_by(task_name="task 1").count() == 4
+        assert conn.execute('SELECT COUNT(*) FROM "task_log"').fetchone() == (6,)
+
+        plan = conn.execute(
+            'EXPLAIN QUERY PLAN SELECT * FROM "task_log" WHERE task_name = ? AND action = ? AND created >= ?',
+            ("task 1", "run", 0)
+        ).fetchall()
+        assert "task_log_task_action_created" in str(plan)
+    repo.close()
+
+def test_background_writer(tmpdir):
+    file = str(tmpdir.join("logs.db"))
+    repo = SQLiteRepo(filename=file, model=MinimalRecord, batch_size=2)
+    repo.add(MinimalRecord(**RECORDS[0]))
+    repo.add(MinimalRecord(**RECORDS[1]))
+    # Writer wakes up when the batch is full
+    start = time.perf_counter()
+    while repo._buffer and time.perf_counter() - start < 2:
+        time.sleep(0.01)
+    assert not repo._buffer
+    repo.flush()
+    with sqlite3.connect(file) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM "task_log"').fetchone() == (2,)
+    repo.close()
+    assert repo._writer is None
+
+def test_write_error(tmpdir, monkeypatch):
+    file = str(tmpdir.join("logs.db"))
+    repo = SQLiteRepo(filename=file, model=MinimalRecord, flush_interval=60)
+    repo.add(MinimalRecord(**RECORDS[0]))
+
+    def get_locked(self):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(SQLiteRepo, "_get_conn", get_locked)
+    with pytest.raises(sqlite3.OperationalError):
+        repo.flush()
+    monkeypatch.undo()
+
+    # The failed batch was kept
+    repo.flush()
+    assert repo.filter_by().count() == 1
+    repo.close()
+
+def test_background_write_error(tmpdir, monkeypatch):
+    file = str(tmpdir.join("logs.db"))
+    repo = SQLiteRepo(filename=file, model=MinimalRecord, batch_size=1)
+
+    def get_locked(self):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr(SQLiteRepo, "_get_conn", get_locked)
+    repo.add(MinimalRecord(**RECORDS[0]))
+    start = time.perf_counter()
+    while repo._error is None and time.perf_counter() - start < 2:
+        time.sleep(0.01)
+    monkeypatch.undo()
+
+    # Raised in the next add, the records are kept
+    with pytest.raises(sqlite3.OperationalError):
+        repo.add(MinimalRecord(**RECORDS[1]))
+    assert repo._writer.is_alive()
+    repo.flush()
+    assert repo.filter_by().count() == 2
+    repo.close()
+
+def test_close_registered_once(tmpdir, monkeypatch):
+    registered = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(atexit, "unregister", registered.remove)
+    repo = SQLiteRepo(filename=str(tmpdir.join("logs.db")), model=MinimalRecord, flush_interval=60)
+    repo.add(MinimalRecord(**RECORDS[0]))
+    repo._stop.set()
+    repo._wake.set()
+    repo._writer.join()
+    repo._stop.clear()
+    # Writer restarted
+    repo.add(MinimalRecord(**RECORDS[1]))
+    assert registered == [repo.close]
+    repo.close()
+    assert registered == []
+
+def test_indexed_not_scanned(repo):
+    for i in range(100):
+        repo.add(MinimalRecord(task_name=f"task {i % 10}", action="run", created=float(i)))
+    repo.flush()
+    statements = []
+    conn = repo._get_conn()
+    conn.set_trace_callback(statements.append)
+    assert repo.filter_by(task_name="task 1", action="run").last().created == 91.0
+    assert repo.filter_by(task_name="task 1", action="run").first().created == 1.0
+    assert repo.filter_by(task_name="task 1", action="run", created=between(10, 60)).count() == 5
+    conn.set_trace_callback(None)
+
+    assert len(statements) == 3
+    for sql in statements:
+        plan = str(conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall())
+        assert "USING COVERING INDEX task_log_task_action_created" in plan
+
+def test_persistence(tmpdir):
+    file = str(tmpdir.join("logs.db"))
+    repo = SQLiteRepo(filename=file, model=TaskRunRecord, flush_interval=60)
+    repo.add({
+        "task_name": "task 1", "action": "success", "created": 1.0,
+        "start": "2022-01-01 00:00", "end": "2022-01-01 00:01:30", "runtime": "0:01:30",
+        "message": "Task 'task 1' status: 'success'", "run_id": "1"
+    })
+    repo.close()
+
+    repo = SQLiteRepo(filename=file, model=TaskRunRecord)
+    record = repo.filter_by(task_name="task 1").last()
+    assert record.end.minute == 1
+    assert record.runtime.total_seconds() == 90
+    assert record.run_id == "1"
+
+    repo.filter_by(task_name="task 1").update(run_id="2")
+    assert repo.filter_by(run_id="2").count() == 1
+    repo.filter_by(task_name="task 1").delete()
+    assert repo.filter_by().count() == 0
+    repo.close()
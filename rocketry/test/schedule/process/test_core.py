@@ -1,12 +1,16 @@
 import asyncio
 import multiprocessing
+import os
 import time
 import logging
 
+import pytest
+
 from redbird.repos import MemoryRepo
 from redbird.logging import RepoHandler
 
 from rocketry.args.builtin import TerminationFlag
+from rocketry.core import Scheduler
 from rocketry.conditions.scheduler import SchedulerCycles
 
 from rocketry.log import LogRecord
@@ -14,6 +18,7 @@ from rocketry.tasks import FuncTask
 from rocketry.time import TimeDelta
 from rocketry.conds import true
 from rocketry.conditions import SchedulerStarted, TaskStarted, AlwaysTrue
+from rocketry.exc import TaskSetupError
 
 def run_succeeding():
     pass
@@ -89,3 +94,68 @@ def test_limited_processes(session):
 
     outcome = post_check.logger.filter_by().all()[-1]
     assert outcome.action == "success", outcome.exc_text
+
+class SlowStartTask(FuncTask):
+    "Task which process takes a while to start"
+
+    def _run_as_process(self, *args, **kwargs):
+        time.sleep(1)
+        return super()._run_as_process(*args, **kwargs)
+
+class CrashingStartTask(FuncTask):
+    "Task which process crashes before logging running"
+
+    def _run_as_process(self, *args, **kwargs):
+        os._exit(1)
+
+class HangingStartTask(FuncTask):
+    "Task which process never logs running"
+
+    def _run_as_process(self, *args, **kwargs):
+        time.sleep(20)
+
+def test_concurrent_start(session):
+    tasks = [
+        SlowStartTask(run_succeeding, name=f"task_{i}", start_cond=true, execution="process", session=session)
+        for i in range(3)
+    ]
+    session.config.max_process_count = 3
+    session.config.shut_cond = SchedulerCycles() >= 1
+
+    start = time.time()
+    session.start()
+    # Processes started in parallel (not one by one)
+    assert time.time() - start < 2.5
+    for task in tasks:
+        assert task.logger.filter_by(action="run").count() == 1
+
+def test_crash_in_setup(session):
+    session.config.silence_task_prerun = True
+    task = CrashingStartTask(run_succeeding, name="task", start_cond=true, execution="process", session=session)
+    session.config.shut_cond = SchedulerCycles() >= 2
+    session.start()
+
+    assert task.logger.filter_by(action="fail").count() == 2
+    assert task.logger.filter_by(action="run").count() == 0
+
+def test_crash_in_setup_raise(session):
+    session.config.silence_task_prerun = False
+    CrashingStartTask(run_succeeding, name="task", start_cond=true, execution="process", session=session)
+    session.config.shut_cond = SchedulerCycles() >= 2
+    with pytest.raises(TaskSetupError):
+        session.start()
+
+def test_setup_timeout(session, monkeypatch):
+    monkeypatch.setattr(Scheduler, "_setup_timeout", 0.5)
+    session.config.silence_task_prerun = True
+    session.config.instant_shutdown = True
+    task = HangingStartTask(run_succeeding, name="task", start_cond=true, execution="process", session=session)
+    session.config.shut_cond = SchedulerCycles() >= 2
+
+    start = time.time()
+    session.start()
+    # The cycle did not wait for the process
+    # longer than the setup timeout
+    assert time.time() - start < 5
+    assert task.logger.filter_by(action="fail").count() == 1
+    assert task.logger.filter_by(action="run").count() == 0
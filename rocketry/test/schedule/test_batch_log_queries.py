@@ -0,0 +1,219 @@
+import asyncio
+import itertools
+import logging
+import math
+
+import pytest
+from redbird.logging import RepoHandler
+
+from rocketry.conditions import (
+    DependSuccess, Retry, SchedulerCycles, TaskExecutable,
+    TaskFailed, TaskStarted, TaskSucceeded
+)
+from rocketry.core import Scheduler
+from rocketry.core.log import LogQueryBatch
+from rocketry.log import MinimalRecord
+from rocketry.log.repos import IndexedMemoryRepo, RetentionMemoryRepo, SQLiteRepo
+from rocketry.tasks import FuncTask
+from rocketry.time import TimeDelta
+
+def do_success():
+    pass
+
+def do_fail():
+    raise RuntimeError("Oops")
+
+class CountingRepo(SQLiteRepo):
+    "Counts the read queries (and separately the ones of the conditions)"
+
+    n_queries: int = 0
+    n_cond_queries: int = 0
+    in_cond: bool = False
+
+    def count_query(self):
+        self.n_queries += 1
+        if self.in_cond:
+            self.n_cond_queries += 1
+
+    def query_count(self, query):
+        self.count_query()
+        return super().query_count(query)
+
+    def query_read_last(self, query):
+        self.count_query()
+        return super().query_read_last(query)
+
+    def query_latest_actions(self, task_names=None):
+        self.count_query()
+        return super().query_latest_actions(task_names=task_names)
+
+    def query_action_times(self, actions, start, end, task_names=None):
+        self.count_query()
+        return super().query_action_times(actions, start, end, task_names=task_names)
+
+def create_tasks(session, batch):
+    session.config.batch_log_queries = batch
+    session.config.force_status_from_logs = True
+    repo = CountingRepo(model=MinimalRecord)
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=repo)]
+
+    # Run in the order of creation (the session's tasks are in a set)
+    priority = itertools.count(0, -1)
+    FuncTask(do_success, name="success", execution="main", session=session, priority=next(priority), start_cond=TaskStarted() == 0)
+    FuncTask(do_fail, name="fail", execution="main", session=session, priority=next(priority), start_cond=TaskFailed() <= 1)
+    FuncTask(do_success, name="retried", execution="main", session=session, priority=next(priority), start_cond=Retry(2))
+    for i in range(10):
+        FuncTask(
+            do_success, name=f"dependent {i}", execution="main", session=session, priority=next(priority),
+            start_cond=DependSuccess(depend_task="success") & TaskExecutable(period=TimeDelta("1 day"))
+        )
+        FuncTask(
+            do_success, name=f"counter {i}", execution="main", session=session, priority=next(priority),
+            start_cond=(TaskSucceeded(task="success") >= 1) & (TaskStarted() <= 1)
+        )
+    return repo
+
+def run_scheduler(session, batch):
+    repo = create_tasks(session, batch)
+    session.config.shut_cond = SchedulerCycles() >= 4
+    session.start()
+    return repo
+
+def run_cycles(session, batch, n):
+    "Run the cycles directly (independent of the timing of the cycles)"
+    # Each read of the time is a millisecond later
+    clock = itertools.count(1_000_000_000)
+    session.config.time_func = lambda: next(clock) / 1000
+    repo = create_tasks(session, batch)
+    session._set_configs()
+    session.scheduler.n_cycles = 0
+    for _ in range(n):
+        asyncio.run(session.scheduler.run_cycle())
+    return repo
+
+@pytest.mark.parametrize("batch", [True, False])
+def test_run(session, batch):
+    repo = run_scheduler(session, batch)
+
+    assert session["success"].status == "success"
+    assert session["fail"].status == "fail"
+    assert session["fail"].logger.filter_by(action="fail").count() == 2
+    assert session["retried"].status is None
+    for i in range(10):
+        assert session[f"dependent {i}"].logger.filter_by(action="success").count() == 1
+        assert session[f"counter {i}"].logger.filter_by(action="success").count() == 2
+
+def test_fewer_queries(session, monkeypatch):
+    check_task_cond = Scheduler.check_task_cond
+    def count_cond_queries(self, task):
+        repo = task.logger._get_repo()
+        repo.in_cond = True
+        try:
+            return check_task_cond(self, task)
+        finally:
+            repo.in_cond = False
+    monkeypatch.setattr(Scheduler, "check_task_cond", count_cond_queries)
+
+    batched = run_cycles(session, batch=True, n=4)
+    session.clear()
+    unbatched = run_cycles(session, batch=False, n=4)
+    assert (batched.n_queries, unbatched.n_queries) == (73, 245)
+    # The reads of logging (force_status_from_logs) are the same in both
+    assert (batched.n_cond_queries, unbatched.n_cond_queries) == (40, 212)
+
+@pytest.mark.parametrize("repo_cls", [IndexedMemoryRepo, RetentionMemoryRepo, SQLiteRepo])
+def test_batch(session, repo_cls):
+    repo = repo_cls(model=MinimalRecord)
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=repo)]
+    task = FuncTask(do_success, name="task", execution="main", session=session)
+    other = FuncTask(do_success, name="other", execution="main", session=session)
+    for created, action in [(100, "run"), (110, "success"), (200, "run"), (210, "fail"), (300, "run")]:
+        repo.add(MinimalRecord(task_name="task", action=action, created=created))
+    repo.add(MinimalRecord(task_name="other", action="success", created=400))
+
+    batch = LogQueryBatch()
+    assert batch.get_latest(task.logger, ["success", "fail"]) == 210
+    assert batch.get_latest(task.logger, ["crash"]) is None
+    assert batch.get_latest(other.logger, ["success"]) == 400
+
+    assert batch.count(task.logger, ["run"]) == 3
+    assert batch.count(task.logger, ["run"], 150, 300) == 2
+    assert batch.count(task.logger, ["success", "fail"], 0, 205) == 1
+    assert batch.count(other.logger, ["fail", "success"], 0, 205) == 0
+
+    # Cached till invalidated (compacting repos are queried directly)
+    repo.add(MinimalRecord(task_name="task", action="run", created=250))
+    assert batch.count(task.logger, ["run"], 150, 300) == (3 if repo_cls is RetentionMemoryRepo else 2)
+    batch.invalidate()
+    assert batch.count(task.logger, ["run"], 150, 300) == 3
+
+class RecordingRepo(IndexedMemoryRepo):
+    "Records the grouped queries"
+
+    calls: list = []
+
+    def query_latest_actions(self, task_names=None):
+        self.calls.append(("latest", task_names))
+        return super().query_latest_actions(task_names=task_names)
+
+    def query_action_times(self, actions, start, end, task_names=None):
+        self.calls.append(("times", start, end, task_names))
+        return super().query_action_times(actions, start, end, task_names=task_names)
+
+def test_batch_loads(session):
+    repo = RecordingRepo(model=MinimalRecord)
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=repo)]
+    task = FuncTask(do_success, name="task", execution="main", session=session)
+    other = FuncTask(do_success, name="other", execution="main", session=session)
+    for created in (100, 200, 300):
+        repo.add(MinimalRecord(task_name="task", action="run", created=created))
+        repo.add(MinimalRecord(task_name="other", action="run", created=created))
+
+    # Only the given tasks are batched
+    batch = LogQueryBatch(task_names=["task"])
+    assert batch.get_latest(task.logger, ["run"]) == 300
+    assert batch.get_latest(other.logger, ["run"]) == 300
+    assert batch.count(other.logger, ["run"], 150) == 2
+    assert repo.calls == [("latest", {"task"})]
+
+    # Earlier starts load only the missing times
+    repo.calls.clear()
+    assert batch.count(task.logger, ["run"], 150) == 2
+    assert batch.count(task.logger, ["run"], 200, 300) == 2
+    assert batch.count(task.logger, ["run"]) == 3
+    assert batch.count(task.logger, ["run"], 50, 250) == 2
+    assert repo.calls == [("times", 150, math.inf, {"task"}), ("times", -math.inf, 150, {"task"})]
+
+    # Loaded again if the next cycle batches more tasks
+    repo.calls.clear()
+    batch.reset()
+    assert batch.count(task.logger, ["run"], 250) == 1
+    assert batch.count(other.logger, ["run"], 250) == 1
+    assert repo.calls == [("latest", None), ("times", 250, math.inf, None)]
+
+    # Kept over the cycles if the tasks have not logged
+    repo.calls.clear()
+    batch.reset()
+    assert batch.count(task.logger, ["run"], 250) == 1
+    assert batch.count(other.logger, ["run"], 250) == 1
+    assert repo.calls == [("latest", None)]
+
+    # Only the tasks that have logged are loaded again
+    repo.calls.clear()
+    repo.add(MinimalRecord(task_name="other", action="run", created=400))
+    batch.reset()
+    assert batch.count(task.logger, ["run"], 250) == 1
+    assert batch.count(other.logger, ["run"], 250) == 2
+    assert batch.count(other.logger, ["run"], 350, 450) == 1
+    assert repo.calls == [("latest", None), ("times", 250, math.inf, {"other"})]
+
+    # The times before the earliest start asked in the previous cycle are dropped
+    repo.calls.clear()
+    batch.reset()
+    assert batch._times[(id(repo), ("run",))][2] == {"task": [300], "other": [300, 400]}
+    assert batch.count(task.logger, ["run"], 250) == 1
+    assert batch.count(task.logger, ["run"], 150) == 2
+    assert repo.calls == [("latest", None), ("times", 150, 250, None)]
@@ -0,0 +1,91 @@
+import logging
+import time
+
+import pytest
+from redbird.logging import RepoHandler
+from redbird.repos import MemoryRepo
+
+from rocketry.conditions import SchedulerCycles, TaskStarted
+from rocketry.core.log import LogWriter
+from rocketry.exc import TaskLoggingError
+from rocketry.log import LogRecord, MinimalRecord
+from rocketry.tasks import FuncTask
+
+def do_success():
+    pass
+
+def do_fail():
+    raise RuntimeError("Oops")
+
+class SlowRepo(MemoryRepo):
+
+    def insert(self, item):
+        time.sleep(0.1)
+        super().insert(item)
+
+@pytest.mark.parametrize("execution", ["main", "async", "thread", "process"])
+def test_run(session, execution):
+    session.config.buffered_logging = True
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=MemoryRepo(model=LogRecord))]
+
+    success = FuncTask(do_success, name="success", execution=execution, session=session, start_cond=TaskStarted() == 0)
+    fail = FuncTask(do_fail, name="fail", execution=execution, session=session, start_cond=TaskStarted() == 0)
+    session.config.shut_cond = (TaskStarted(task="success") >= 1) & (TaskStarted(task="fail") >= 1)
+    session.start()
+
+    assert success.status == "success"
+    assert fail.status == "fail"
+    assert [rec.action for rec in success.logger.get_records()] == ["run", "success"]
+    assert [rec.action for rec in fail.logger.get_records()] == ["run", "fail"]
+    assert "RuntimeError: Oops" in fail.logger.get_latest(action="fail").exc_text
+    # Writer is closed
+    assert session._log_writer is None
+
+def test_write_in_background(session):
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=SlowRepo(model=MinimalRecord))]
+    task = FuncTask(do_success, name="task", execution="main", session=session)
+
+    session._log_writer = LogWriter()
+    session._log_writer.start()
+
+    start = time.perf_counter()
+    task.log_running()
+    task.log_success()
+    elapsed = time.perf_counter() - start
+
+    # Status is set right away but the records are written later
+    assert elapsed < 0.1
+    assert task.status == "success"
+    assert task.last_success is not None
+
+    # Reading waits for the pending records
+    assert [rec.action for rec in task.logger.get_records()] == ["run", "success"]
+    session.config.force_status_from_logs = True
+    assert task.status == "success"
+
+    task.log_running()
+    session._log_writer.close()
+    assert len(task.logger.get_records()) == 3
+
+@pytest.mark.parametrize("silence", [True, False])
+def test_failed_logging(session, silence):
+    class MyHandler(logging.Handler):
+        def emit(self, record):
+            raise RuntimeError("Oops")
+
+    session.config.buffered_logging = True
+    session.config.silence_task_logging = silence
+    logging.getLogger(session.config.task_logger_basename).handlers.insert(0, MyHandler())
+    task = FuncTask(do_success, name="task", execution="main", session=session, start_cond=TaskStarted() == 0)
+    session.config.shut_cond = SchedulerCycles() >= 2
+
+    if silence:
+        session.start()
+    else:
+        with pytest.raises(TaskLoggingError):
+            session.start()
+    # Logged with the writer, the task itself did not fail
+    assert task.status == "success"
+    assert session._log_writer is None
@@ -15,7 +15,6 @@ from rocketry.log.log_record import TaskLogRecord
 import rocketry
 from rocketry import Session
 from rocketry.core import Parameters
-from rocketry.log.log_record import MinimalRecord
 from rocketry.tasks import FuncTask
 from rocketry.time import TimeDelta
 from rocketry.exc import TaskInactionException, TaskTerminationException
@@ -423,7 +422,7 @@ def test_logging_repo(tmpdir, execution):
     session.set_as_default()
     session.config.max_process_count = 4
 
-    handler = RepoHandler(repo=MemoryRepo(model=MinimalRecord))
+    handler = RepoHandler(repo=MemoryRepo(model=TaskLogRecord))
 
     logger = logging.getLogger("rocketry.task")
     logger.handlers = []
@@ -443,10 +442,12 @@ def test_logging_repo(tmpdir, execution):
         session.start()
         assert session.scheduler.n_cycles == 1
 
-        task_1_start = list(task_1.logger.get_records())[0].created
-        task_2_start = list(task_2.logger.get_records())[0].created
-        task_3_start = list(task_3.logger.get_records())[0].created
-        task_4_start = list(task_4.logger.get_records())[0].created
+        # The processes log running concurrently thus
+        # the order is by when the scheduler started them
+        task_1_start = list(task_1.logger.get_records())[0].start
+        task_2_start = list(task_2.logger.get_records())[0].start
+        task_3_start = list(task_3.logger.get_records())[0].start
+        task_4_start = list(task_4.logger.get_records())[0].start
 
         assert task_1_start < task_2_start < task_3_start < task_4_start
 
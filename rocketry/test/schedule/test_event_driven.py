@@ -0,0 +1,176 @@
+import asyncio
+
+import pytest
+
+from rocketry.core.condition import BaseCondition
+from rocketry.conditions import SchedulerStarted, TaskStarted, SchedulerCycles, DependSuccess, AlwaysFalse, IsPeriod
+from rocketry.args import Session
+from rocketry.tasks import FuncTask
+from rocketry.time import TimeDelta, TimeOfDay
+
+def do_success():
+    pass
+
+NOW = [1_000_000.0]
+
+def get_now():
+    # Module level as the processes also log the time
+    return NOW[0]
+
+@pytest.mark.parametrize("execution", ["main", "async", "thread", "process"])
+def test_run(session, execution):
+    session.config.event_driven = True
+    session.config.time_func = get_now
+
+    task = FuncTask(
+        do_success, name="task", execution=execution, session=session,
+        start_cond=TaskStarted(period=TimeDelta("1 second")) == 0,
+    )
+    scheduler = session.scheduler
+    scheduler.n_cycles = 0
+
+    async def run_cycle(now):
+        NOW[0] = now
+        await scheduler.run_cycle()
+        while task.is_alive():
+            await asyncio.sleep(0.01)
+            scheduler.handle_logs()
+        # Inspected after the run finished
+        await scheduler.run_cycle()
+        return scheduler._next_due
+
+    async def main():
+        # Due when the period of the previous start ends
+        assert await run_cycle(1_000_000.0) == 1_000_001.0
+        assert await run_cycle(1_000_000.5) == 1_000_001.0
+        assert len(list(task.logger.get_records(action="success"))) == 1
+
+        assert await run_cycle(1_000_001.5) == 1_000_002.5
+        assert len(list(task.logger.get_records(action="success"))) == 2
+    asyncio.run(main())
+
+def test_wake_on_run(session):
+    session.config.event_driven = True
+    session.config.cycle_sleep = 10
+
+    task = FuncTask(do_success, name="task", execution="async", session=session)
+
+    async def set_running():
+        await asyncio.sleep(0.1)
+        task.run()
+
+    session.config.shut_cond = TaskStarted(task="task") >= 1
+    async def main():
+        await asyncio.wait_for(
+            asyncio.gather(session.serve(), set_running()),
+            timeout=5
+        )
+    asyncio.run(main())
+    assert len(list(task.logger.get_records(action="success"))) == 1
+
+def test_poll_unknown(session):
+    session.config.event_driven = True
+    session.config.cycle_sleep = 0.01
+    session.config.shut_cond = SchedulerCycles() >= 5
+    session.start()
+    assert session.scheduler.n_cycles == 5
+
+class CountedFalse(AlwaysFalse):
+    n_checks = 0
+    def observe(self, **kwargs):
+        type(self).n_checks += 1
+        return super().observe(**kwargs)
+
+@pytest.mark.parametrize("event_driven", [True, False])
+def test_dirty_evaluation(session, event_driven):
+    session.config.dirty_evaluation = True
+    session.config.event_driven = event_driven
+    session.config.cycle_sleep = 0.01
+    CountedFalse.n_checks = 0
+
+    task_a = FuncTask(do_success, name="a", execution="async", session=session, start_cond=TaskStarted() == 0)
+    task_b = FuncTask(do_success, name="b", execution="async", session=session, start_cond=DependSuccess(depend_task="a"))
+    task_c = FuncTask(do_success, name="c", execution="async", session=session, start_cond=CountedFalse())
+
+    session.config.shut_cond = (TaskStarted(task="b") >= 1) & (SchedulerCycles() >= 10)
+    session.start()
+
+    assert task_a.status == "success"
+    assert task_b.status == "success"
+    assert task_c.status is None
+    # Evaluated only once as nothing it depends on changed
+    assert CountedFalse.n_checks == 1
+
+def test_wake_on_process_records(session):
+    session.config.event_driven = True
+    session.config.cycle_sleep = 10
+
+    task_a = FuncTask(do_success, name="a", execution="process", session=session, start_cond=TaskStarted() == 0)
+    task_b = FuncTask(do_success, name="b", execution="async", session=session, start_cond=DependSuccess(depend_task="a"))
+
+    session.config.shut_cond = TaskStarted(task="b") >= 1
+    async def main():
+        # The records of the process wake up the scheduler
+        # thus it does not sleep the cycle_sleep
+        await asyncio.wait_for(session.serve(), timeout=5)
+    asyncio.run(main())
+    assert task_a.status == "success"
+    assert task_b.status == "success"
+
+class CountedPeriod(IsPeriod):
+    n_checks = 0
+    def get_state(self, session=Session()):
+        type(self).n_checks += 1
+        return super().get_state(session=session)
+
+@pytest.mark.parametrize("cycle_memo", [True, False])
+def test_cycle_memo(session, cycle_memo):
+    session.config.cycle_memo = cycle_memo
+    CountedPeriod.n_checks = 0
+
+    # Equal conditions are evaluated once in a cycle
+    for name in ("a", "b", "c"):
+        FuncTask(
+            do_success, name=name, execution="main", session=session,
+            start_cond=CountedPeriod(period=TimeOfDay("00:00", "00:00")) & (TaskStarted(task="a") == 0),
+        )
+    session.scheduler.n_cycles = 0
+    asyncio.run(session.scheduler.run_cycle())
+
+    # The period does not depend on 'a' thus it is
+    # not evaluated again after 'a' ran
+    assert CountedPeriod.n_checks == (1 if cycle_memo else 3)
+    # The states depending on 'a' were invalidated when 'a' ran
+    assert session["a"].status == "success"
+    assert session["b"].status is None
+    assert session["c"].status is None
+    assert session._cycle is None
+
+class RecordTime(BaseCondition):
+    times = []
+    def get_state(self, session=Session()):
+        type(self).times.append(session._get_timestamp_now())
+        return True
+
+def test_cycle_memo_frozen_time(session):
+    session.config.cycle_memo = True
+    now = [1_000_000.0]
+    def time_func():
+        now[0] += 1
+        return now[0]
+    session.config.time_func = time_func
+    RecordTime.times = []
+
+    for name in ("a", "b", "c"):
+        FuncTask(
+            do_success, name=name, execution="main", session=session,
+            start_cond=RecordTime(),
+        )
+    session.scheduler.n_cycles = 0
+    asyncio.run(session.scheduler.run_cycle())
+
+    # The tasks ran (changed statuses) in between
+    # but all of them saw the same time
+    assert [session[name].status for name in ("a", "b", "c")] == ["success", "success", "success"]
+    assert len(RecordTime.times) == 3
+    assert len(set(RecordTime.times)) == 1
@@ -0,0 +1,192 @@
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from rocketry.args import Session
+from rocketry.conditions import TaskStarted, TaskSucceeded, SchedulerStarted, AlwaysTrue
+from rocketry.core.parameters import Parameters
+from rocketry.core import pool
+from rocketry.core.pool import PoolWorker
+from rocketry.time import TimeDelta
+from rocketry.tasks import FuncTask
+
+def write_pid():
+    with open("pids.txt", "a", encoding="utf-8") as file:
+        file.write(f"{os.getpid()}\n")
+
+def write_first():
+    with open("pids.txt", "a", encoding="utf-8") as file:
+        file.write(f"{os.getpid()} first\n")
+
+def write_second():
+    with open("pids.txt", "a", encoding="utf-8") as file:
+        file.write(f"{os.getpid()} second\n")
+
+def modify_task(session=Session()):
+    task = session["task"]
+    if task.logger.filter_by(action="success").count() >= 1:
+        task.func = write_second
+
+def run_failing():
+    raise RuntimeError("Task failed")
+
+def run_slow():
+    time.sleep(5)
+
+def read_pids():
+    with open("pids.txt", "r", encoding="utf-8") as file:
+        return [line for line in file.read().split("\n") if line]
+
+@pytest.mark.parametrize("max_runs,n_workers", [(None, 1), (1, 3)])
+def test_reuse_workers(tmpdir, session, max_runs, n_workers):
+    session.config.process_pool = True
+    session.config.process_pool_size = 1
+    session.config.process_pool_max_runs = max_runs
+    with tmpdir.as_cwd():
+        task = FuncTask(write_pid, name="task", start_cond=AlwaysTrue(), execution="process", session=session)
+        session.config.shut_cond = (TaskStarted(task="task") >= 3) | ~SchedulerStarted(period=TimeDelta("10 second"))
+        session.start()
+
+        assert task.logger.filter_by(action="success").count() == 3
+        pids = read_pids()
+        assert len(pids) == 3
+        assert len(set(pids)) == n_workers
+        assert str(os.getpid()) not in pids
+    assert session.scheduler._pool is None
+
+def test_reship_modified(tmpdir, session):
+    session.config.process_pool = True
+    session.config.process_pool_size = 1
+    with tmpdir.as_cwd():
+        task = FuncTask(write_first, name="task", start_cond=AlwaysTrue(), execution="process", session=session)
+        session.hook_scheduler_cycle()(modify_task)
+        session.config.shut_cond = (TaskStarted(task="task") >= 3) | ~SchedulerStarted(period=TimeDelta("10 second"))
+        session.start()
+
+        assert task.logger.filter_by(action="success").count() == 3
+        lines = read_pids()
+        pids = {line.split(" ")[0] for line in lines}
+        # The same worker got the modified task
+        assert len(pids) == 1
+        assert lines[0].endswith("first")
+        assert lines[-1].endswith("second")
+
+def test_fail(session):
+    session.config.process_pool = True
+    task = FuncTask(run_failing, name="task", start_cond=AlwaysTrue(), execution="process", session=session)
+    session.config.shut_cond = (TaskStarted(task="task") >= 2) | ~SchedulerStarted(period=TimeDelta("10 second"))
+    session.start()
+
+    assert task.logger.filter_by(action="fail").count() == 2
+
+def test_timeout(session):
+    session.config.process_pool = True
+    session.config.timeout = 0.1
+    task = FuncTask(run_slow, name="task", start_cond=AlwaysTrue(), execution="process", session=session)
+    session.config.shut_cond = (TaskStarted(task="task") >= 2) | ~SchedulerStarted(period=TimeDelta("10 second"))
+    session.start()
+
+    assert task.logger.filter_by(action="run").count() == 2
+    assert task.logger.filter_by(action="terminate").count() == 2
+    assert task.logger.filter_by(action="success").count() == 0
+
+def test_max_process_count(session):
+    session.config.process_pool = True
+    session.config.max_process_count = 2
+    session.config.process_pool_size = 5
+    tasks = [
+        FuncTask(run_slow, name=f"task {i}", start_cond=AlwaysTrue(), execution="process", session=session)
+        for i in range(3)
+    ]
+    session.config.instant_shutdown = True
+
+    session.config.shut_cond = ~SchedulerStarted(period=TimeDelta("1 second"))
+    session.start()
+    n_runs = sum(task.logger.filter_by(action="run").count() for task in tasks)
+    assert n_runs == 2
+
+class RecordingConn:
+    def __init__(self, received=()):
+        self.sent = []
+        self.received = list(received)
+
+    def send(self, obj):
+        self.sent.append(obj)
+
+    def recv(self):
+        return self.received.pop(0)
+
+def test_envelope(session):
+    task = FuncTask(write_first, name="task", execution="process", session=session)
+    worker = PoolWorker(multiprocessing.Queue())
+    worker.conn = RecordingConn()
+    try:
+        worker.submit(task, {"params": Parameters()})
+        worker.submit(task, {"params": Parameters()})
+        task.func = write_second
+        worker.submit(task, {"params": Parameters()})
+    finally:
+        worker.kill()
+
+    # The task is sent only if the worker
+    # does not have its current definition
+    assert [(name, shipped) for name, shipped, state, kwargs in worker.conn.sent] == [
+        ("task", task), ("task", None), ("task", task)
+    ]
+    assert all(state["status"] is None for name, shipped, state, kwargs in worker.conn.sent)
+
+load_runtime_state = FuncTask._load_runtime_state
+n_loads = 0
+
+def fail_first_loading(self, state):
+    # Counted in the worker thus a new
+    # worker would fail again
+    global n_loads
+    n_loads += 1
+    if n_loads == 1:
+        raise RuntimeError("Loading failed")
+    load_runtime_state(self, state)
+
+def test_worker_crash(tmpdir, monkeypatch, session):
+    # Crashing outside the task's own handling
+    # should fail the run but keep the worker
+    monkeypatch.setattr(FuncTask, "_load_runtime_state", fail_first_loading)
+    session.config.process_pool = True
+    session.config.process_pool_size = 1
+    session.config.silence_task_prerun = True
+    with tmpdir.as_cwd():
+        task = FuncTask(write_pid, name="task", start_cond=AlwaysTrue(), execution="process", session=session)
+        session.config.shut_cond = (TaskSucceeded(task="task") >= 1) | ~SchedulerStarted(period=TimeDelta("10 second"))
+        session.start()
+
+        assert task.logger.filter_by(action="fail").count() == 1
+        assert task.logger.filter_by(action="success").count() >= 1
+        assert len(set(read_pids())) == 1
+
+def test_worker_crash_reported():
+    conn = RecordingConn(received=[("task", None, {}, {}), ("task", None, {}, {}), None])
+    pool._run_worker(conn, queue=None, max_runs=None, max_memory=None)
+
+    # The task was never sent thus both runs
+    # crashed but the worker kept running
+    assert [is_exhausted for is_exhausted, error in conn.sent] == [False, False]
+    assert all("KeyError" in error for is_exhausted, error in conn.sent)
+
+def test_worker_memory_growth(monkeypatch):
+    # Memory of the worker at start is not counted
+    memory = iter([10_000_000, 10_000_500, 10_001_500])
+    monkeypatch.setattr(pool, "_get_memory_usage", lambda: next(memory))
+    conn = RecordingConn(received=[("task", None, {}, {}), ("task", None, {}, {}), ("task", None, {}, {})])
+    pool._run_worker(conn, queue=None, max_runs=None, max_memory=1_000)
+
+    assert [is_exhausted for is_exhausted, error in conn.sent] == [False, True]
+
+def test_memory_usage():
+    usage = pool._get_memory_usage()
+    if usage is None:
+        pytest.skip("Memory usage not available")
+    data = b"x" * 50_000_000
+    assert pool._get_memory_usage() >= usage + 40_000_000
+    del data
@@ -0,0 +1,71 @@
+import logging
+import time
+
+import pytest
+from redbird.logging import RepoHandler
+from redbird.repos import MemoryRepo
+
+from rocketry.conditions import SchedulerCycles, TaskStarted, TaskSucceeded
+from rocketry.log import MinimalRecord
+from rocketry.log.repos import SQLiteRepo
+from rocketry.tasks import FuncTask
+
+@pytest.mark.parametrize("tail_logs", [True, False])
+def test_external_records(session, tmpdir, tail_logs):
+    file = str(tmpdir.join("logs.db"))
+    session.config.tail_logs = tail_logs
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=SQLiteRepo(filename=file, model=MinimalRecord))]
+
+    # Another process writing to the same logs
+    other_repo = SQLiteRepo(filename=file, model=MinimalRecord)
+    def log_externally():
+        other_repo.add(MinimalRecord(task_name="external", action="run", created=time.time()))
+        other_repo.add(MinimalRecord(task_name="external", action="success", created=time.time()))
+        other_repo.flush()
+
+    external = FuncTask(lambda: None, name="external", execution="main", session=session)
+    FuncTask(log_externally, name="writer", execution="main", session=session, start_cond=TaskStarted() == 0)
+    FuncTask(
+        lambda: None, name="dependent", execution="main", session=session,
+        # Uses the cached statuses of the task
+        start_cond=(TaskSucceeded(task="external") >= 1) & (TaskStarted() == 0)
+    )
+    session.config.shut_cond = (TaskStarted(task="dependent") >= 1) | (SchedulerCycles() >= 5)
+    session.start()
+    other_repo.close()
+
+    if tail_logs:
+        assert external.status == "success"
+        assert external.last_success is not None
+        assert session["dependent"].status == "success"
+    else:
+        assert external.status is None
+        assert session["dependent"].status is None
+
+def test_task_repos_cached(session):
+    repo = MemoryRepo(model=MinimalRecord)
+    task_logger = logging.getLogger(session.config.task_logger_basename)
+    task_logger.handlers = [RepoHandler(repo=repo)]
+    FuncTask(lambda: None, name="task 1", execution="main", session=session)
+
+    repos = session.scheduler._get_session_task_repos()
+    assert [(r, list(tasks)) for r, tasks in repos.values()] == [(repo, ["task 1"])]
+    assert session.scheduler._get_session_task_repos() is repos
+
+    # Rebuilt if tasks are added, renamed or removed
+    task = FuncTask(lambda: None, name="task 2", execution="main", session=session)
+    repos = session.scheduler._get_session_task_repos()
+    assert sorted(repos[id(repo)][1]) == ["task 1", "task 2"]
+    task.name = "task 3"
+    repos = session.scheduler._get_session_task_repos()
+    assert sorted(repos[id(repo)][1]) == ["task 1", "task 3"]
+    session.remove_task("task 1")
+    repos = session.scheduler._get_session_task_repos()
+    assert sorted(repos[id(repo)][1]) == ["task 3"]
+
+    # Rebuilt if the handlers change
+    new_repo = MemoryRepo(model=MinimalRecord)
+    task_logger.handlers = [RepoHandler(repo=new_repo)]
+    repos = session.scheduler._get_session_task_repos()
+    assert [r for r, _ in repos.values()] == [new_repo]
@@ -117,6 +117,44 @@ def test_remove(session):
     session.remove_task("task 2")
     assert session.tasks == {task_1}
 
+def test_index_consistent(session):
+    task_1 = FuncTask(lambda : None, name="task 1", execution="main", session=session)
+    task_2 = FuncTask(lambda : None, name="task 2", execution="main", session=session)
+
+    # Rename
+    task_1.name = "renamed"
+    assert "task 1" not in session
+    assert session["renamed"] is task_1
+
+    # Remove
+    task_2.delete()
+    assert "task 2" not in session
+    assert session.tasks == {task_1}
+
+    # Replace
+    session.config.task_pre_exist = "replace"
+    task_new = FuncTask(lambda : None, name="renamed", execution="main", session=Session())
+    session.add_task(task_new)
+    assert session.tasks == {task_new}
+    assert session["renamed"] is task_new
+
+    # Ignore
+    session.config.task_pre_exist = "ignore"
+    task_ignored = FuncTask(lambda : None, name="renamed", execution="main", session=Session())
+    session.add_task(task_ignored)
+    assert session.tasks == {task_new}
+    assert session["renamed"] is task_new
+
+def test_index_modified_directly(session):
+    task_1 = FuncTask(lambda : None, name="task 1", execution="main", session=session)
+    task_2 = FuncTask(lambda : None, name="task 2", execution="main", session=Session())
+
+    session.tasks.add(task_2)
+    assert session["task 2"] is task_2
+
+    session.tasks.remove(task_1)
+    assert "task 1" not in session
+
 # Old interface
 # -------------
 
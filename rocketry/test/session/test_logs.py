@@ -14,6 +14,7 @@ from rocketry.conditions import TaskFinished
 from rocketry.conditions.scheduler import SchedulerCycles
 
 from rocketry.log.log_record import MinimalRecord
+from rocketry.log.repos import IndexedMemoryRepo, SQLiteRepo
 from rocketry.pybox.time.convert import to_datetime
 from rocketry.tasks import FuncTask
 from rocketry.exc import TaskLoggingError
@@ -265,3 +266,54 @@ def test_get_logs_params(tmpdir, mock_pydatetime, mock_time, query, expected, se
             for key, val in e.items():
                 assert a[key] == e[key]
             # assert e.items() <= a.items()
+
+@pytest.mark.parametrize("get_repo", [
+    pytest.param(lambda: MemoryRepo(model=MinimalRecord), id="MemoryRepo"),
+    pytest.param(lambda: IndexedMemoryRepo(model=MinimalRecord), id="IndexedMemoryRepo"),
+    pytest.param(lambda: SQLiteRepo(model=MinimalRecord), id="SQLiteRepo"),
+])
+def test_iter_logs(get_repo, session):
+    repo = get_repo()
+    other_repo = get_repo()
+    logging.getLogger(session.config.task_logger_basename).handlers = [RepoHandler(repo=repo)]
+    logging.getLogger(session.config.task_logger_basename + ".other").handlers = [RepoHandler(repo=other_repo)]
+
+    for created, task_name, action, to_repo in [
+        (1.0, "task1", "run", repo),
+        (2.0, "task2", "run", other_repo),
+        (3.0, "task1", "success", repo),
+        (3.0, "task2", "fail", other_repo),
+        (3.0, "task3", "run", repo),
+        (5.0, "task3", "success", other_repo),
+        (4.0, "task4", "run", repo),
+    ]:
+        to_repo.add(MinimalRecord(task_name=task_name, action=action, created=created))
+
+    cursor = session.iter_task_log(as_tuples=True)
+    assert list(cursor) == [
+        ("task1", "run", 1.0),
+        ("task2", "run", 2.0),
+        ("task1", "success", 3.0),
+        ("task3", "run", 3.0),
+        ("task2", "fail", 3.0),
+        ("task4", "run", 4.0),
+        ("task3", "success", 5.0),
+    ]
+    assert cursor.token == "5.0:1"
+
+    records = list(session.iter_task_log(task_name=["task1", "task3"], action="success", start=to_datetime(2.0), end=10))
+    assert [(r.task_name, r.created) for r in records] == [("task1", 3.0), ("task3", 5.0)]
+    assert all(isinstance(r, MinimalRecord) for r in records)
+
+    # Paginating (also over the records created at the same time)
+    pages = []
+    token = None
+    while True:
+        cursor = session.iter_task_log(after=token, page_size=2, as_tuples=True)
+        page = cursor.page(2)
+        if not page:
+            break
+        pages.append(page)
+        token = cursor.token
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert sum(pages, []) == list(session.iter_task_log(as_tuples=True))
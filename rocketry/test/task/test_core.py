@@ -3,6 +3,7 @@ import logging
 import pickle
 from textwrap import dedent
 import pytest
+from pydantic import ValidationError
 from rocketry.args.builtin import Return
 from rocketry.core import Task as BaseTask
 from rocketry.core.condition.base import AlwaysFalse
@@ -146,3 +147,49 @@ def test_json(session):
     .replace("<RUN>", dt_run.strftime("%Y-%m-%dT%H:%M:%S"))
     .replace("<SUCCESS>", dt_success.strftime("%Y-%m-%dT%H:%M:%S"))
     )[1:-1]
+
+def test_runtime_state(session):
+    task = DummyTask(name="mytest", session=session)
+    task.log_running()
+    assert task.status == "run"
+    task.log_success()
+    assert task.status == "success"
+    assert task.dict(include={"status"}) == {"status": "success"}
+
+    # User facing assignment is still validated
+    with pytest.raises(ValidationError):
+        task.status = "not valid"
+    assert task.status == "success"
+
+    # Only changes make the scheduler check the task
+    session.config.dirty_evaluation = True
+    task._set_state("force_run", False)
+    assert task not in session.scheduler._dirty
+    task._set_state("status", "fail")
+    assert task in session.scheduler._dirty
+
+def test_next_intervals(session):
+    from rocketry.conds import daily, cron, every, time_of_day, running
+
+    now = datetime.datetime(2022, 1, 1, 11, 0)
+    session.config.time_func = lambda: now.timestamp()
+    to_ts = lambda s: datetime.datetime.fromisoformat(s).timestamp()
+
+    task = DummyTask(name="between", start_cond=daily.between("10:00", "12:00"), session=session)
+    starts, ends = task.next_intervals(n=2)
+    assert list(starts) == [to_ts("2022-01-01 11:00"), to_ts("2022-01-02 10:00")]
+    assert list(ends) == [to_ts("2022-01-01 12:00"), to_ts("2022-01-02 12:00")]
+
+    task = DummyTask(name="cron", start_cond=cron("30 */6 * * *"), session=session)
+    starts, ends = task.next_intervals(horizon="1 day")
+    assert list(starts) == [to_ts(dt) for dt in ("2022-01-01 12:30", "2022-01-01 18:30", "2022-01-02 00:30", "2022-01-02 06:30")]
+
+    task = DummyTask(name="every", start_cond=every("1 hour") & time_of_day.between("11:30", "13:00"), session=session)
+    starts, ends = task.next_intervals(horizon="12 hours")
+    assert list(starts) == [to_ts("2022-01-01 11:30"), to_ts("2022-01-01 12:30")]
+    assert list(ends) == [to_ts("2022-01-01 12:30"), to_ts("2022-01-01 13:00")]
+
+    # Not time based: could start any time
+    task = DummyTask(name="running", start_cond=~running, session=session)
+    starts, ends = task.next_intervals(n=1)
+    assert list(starts) == [now.timestamp()]
@@ -28,3 +28,50 @@ def test_add_handler():
         assert logger.handlers == [hdlr]
     finally:
         logger.handlers = []
+
+def test_cached_repo():
+    logger = logging.getLogger("rocketry._temp_test")
+    try:
+        repo = MemoryRepo()
+        logger.handlers = [RepoHandler(repo)]
+        task_logger = TaskAdapter(logger, task="mytask")
+        assert task_logger._get_repo() is repo
+
+        # Handlers changed
+        another_repo = MemoryRepo()
+        task_logger.set_repo(another_repo)
+        assert task_logger._get_repo() is another_repo
+
+        logger.handlers = [RepoHandler(repo)]
+        assert task_logger._get_repo() is repo
+
+        logger.handlers = []
+        with pytest.raises(AttributeError):
+            task_logger._get_repo()
+        logger.addHandler(RepoHandler(another_repo))
+        assert task_logger._get_repo() is another_repo
+    finally:
+        logger.handlers = []
+
+def test_cached_task_logger(session):
+    task = session.create_task(func=lambda: None, name="mytask", execution="main")
+    logger = task.logger
+    assert task.logger is logger
+
+    # Logging does not replace the adapter
+    task.log_running()
+    task.log_success()
+    assert task.logger is logger
+    assert [rec.action for rec in logger.get_records()] == ["run", "success"]
+
+    task.name = "renamed"
+    assert task.logger is not logger
+    assert task.logger.task_name == "renamed"
+    logger = task.logger
+
+    task.logger_name = "rocketry.task.another"
+    with pytest.warns(UserWarning):
+        logger = task.logger
+    assert logger.logger.name == "rocketry.task.another"
+    logger.set_repo(MemoryRepo())
+    assert task.logger is logger
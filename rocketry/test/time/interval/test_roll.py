@@ -1,9 +1,12 @@
-from datetime import datetime
+import time
+from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from rocketry.core.time import TimeDelta
+from rocketry.pybox.time import epoch, to_timestamp
 from rocketry.time.interval import (
-    TimeOfDay
+    TimeOfDay, TimeOfHour, TimeOfMinute, TimeOfSecond, TimeOfWeek, TimeOfMonth
 )
 
 from_iso = datetime.fromisoformat
@@ -146,3 +149,46 @@ def test_rollback_time_of_day(start, end, dt, roll_start, roll_end):
     assert interval.closed == 'left' if roll_start != roll_end else interval.closed == "both"
     assert roll_start == interval.left
     assert roll_end == interval.right
+
+@pytest.mark.parametrize("local_tz", ["UTC", "Europe/Helsinki", "America/New_York"])
+@pytest.mark.parametrize("tz", [None, timezone.utc, timezone(timedelta(hours=5, minutes=30))])
+@pytest.mark.parametrize(
+    "period",
+    [
+        pytest.param(TimeOfDay("10:00", "12:00"), id="TimeOfDay"),
+        pytest.param(TimeOfDay("22:00", "02:00"), id="TimeOfDay overnight"),
+        pytest.param(TimeOfDay("03:30", "03:30"), id="TimeOfDay full"),
+        pytest.param(TimeOfDay(), id="TimeOfDay always"),
+        pytest.param(TimeOfHour("15:00", "45:30"), id="TimeOfHour"),
+        pytest.param(TimeOfMinute("10", "50"), id="TimeOfMinute"),
+        pytest.param(TimeOfSecond("100", "600"), id="TimeOfSecond"),
+        pytest.param(TimeOfWeek("Sat", "Mon"), id="TimeOfWeek"),
+        pytest.param(TimeOfMonth("5", "10"), id="TimeOfMonth (via datetimes)"),
+        pytest.param(TimeDelta("2 hours"), id="TimeDelta"),
+    ],
+)
+def test_rollback_timestamp(period, tz, local_tz, monkeypatch):
+    # The timestamps should be the same as through the datetimes
+    monkeypatch.setenv("TZ", local_tz)
+    time.tzset()
+    epoch._get_local_offset.cache_clear()
+    epoch._get_wall_offset.cache_clear()
+    try:
+        # Around the DST transitions of 2022 (EU and US)
+        starts = [
+            from_iso("2022-03-13 00:00:00").timestamp(),
+            from_iso("2022-03-27 00:00:00").timestamp(),
+            from_iso("2022-10-30 00:00:00").timestamp(),
+            from_iso("2022-11-06 00:00:00").timestamp(),
+        ]
+        for start in starts:
+            # Also just after the full hours (the transitions)
+            for i in [*range(0, 2 * 24 * 60 * 60, 877), *range(0, 2 * 24 * 60 * 60, 3600)]:
+                ts = start + i + 0.123456
+                interval = period.rollback(datetime.fromtimestamp(ts, tz=tz))
+                assert period.rollback_timestamp(ts, timezone=tz) == (to_timestamp(interval.left), to_timestamp(interval.right))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+        epoch._get_local_offset.cache_clear()
+        epoch._get_wall_offset.cache_clear()
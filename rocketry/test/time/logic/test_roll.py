@@ -5,7 +5,7 @@ import pytest
 from rocketry.core.time.base import (
     All, Any
 )
-from rocketry.time.interval import TimeOfDay, TimeOfMinute
+from rocketry.time.interval import TimeOfDay, TimeOfHour, TimeOfMinute, TimeOfMonth, TimeOfWeek, TimeOfYear
 
 from_iso = datetime.datetime.fromisoformat
 
@@ -195,6 +195,15 @@ def test_rollforward_any(dt, periods, roll_start, roll_end):
             from_iso("2020-01-01 08:00:00"), from_iso("2020-01-01 09:30:00"),
             id="On interval"),
 
+        pytest.param(
+            from_iso("2020-01-01 11:00:00"),
+            [
+                TimeOfDay("11:00", "13:00"),
+                TimeOfDay("10:00", "12:00"),
+            ],
+            from_iso("2020-01-01 10:00:00"), from_iso("2020-01-01 11:00:00"),
+            id="On start of overlapping interval"),
+
         pytest.param(
             from_iso("2020-01-01 10:00:00"),
             [
@@ -210,3 +219,62 @@ def test_rollback_any(dt, periods, roll_start, roll_end):
     interval = time.rollback(dt)
     assert roll_start == interval.left
     assert roll_end == interval.right
+
+def test_roll_all_sparse():
+    # Friday 13th, many rolls needed
+    period = All(TimeOfWeek.at("Fri"), TimeOfMonth.at(13))
+
+    interval = period.rollforward(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == from_iso("2023-01-13 00:00:00")
+    assert interval.right == from_iso("2023-01-14 00:00:00")
+
+    interval = period.rollback(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == from_iso("2022-05-13 00:00:00")
+    assert interval.right == from_iso("2022-05-14 00:00:00")
+
+@pytest.mark.parametrize(
+    "periods,next_start,next_end,prev_start,prev_end",
+    [
+        pytest.param(
+            [TimeOfDay("10:00", "12:00"), TimeOfWeek.at("Tue"), TimeOfMonth("1st", "7th"), TimeOfYear.at("Oct")],
+            from_iso("2022-10-04 10:00:00"), from_iso("2022-10-04 12:00:00"),
+            from_iso("2021-10-05 10:00:00"), from_iso("2021-10-05 12:00:00"),
+            id="First Tuesday of October"),
+        pytest.param(
+            [TimeOfHour("15:00", "20:00"), TimeOfDay("10:00", "11:00"), TimeOfWeek.at("Sun")],
+            from_iso("2022-06-05 10:15:00"), from_iso("2022-06-05 10:20:00"),
+            from_iso("2022-05-29 10:15:00"), from_iso("2022-05-29 10:20:00"),
+            id="Minutes of Sunday"),
+    ],
+)
+def test_roll_all_rare(periods, next_start, next_end, prev_start, prev_end):
+    period = All(*periods)
+
+    interval = period.rollforward(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == next_start
+    assert interval.right == next_end
+
+    interval = period.rollback(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == prev_start
+    assert interval.right == prev_end
+
+def test_roll_all_never():
+    # 31st of February
+    period = All(TimeOfYear.at("Feb"), TimeOfDay("10:00", "11:00"), TimeOfDay("12:00", "13:00"))
+
+    interval = period.rollforward(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == interval.right == All.max
+
+    interval = period.rollback(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == interval.right == All.min
+
+def test_roll_all_horizon(monkeypatch):
+    monkeypatch.setattr(All, "horizon", datetime.timedelta(days=100))
+    period = All(TimeOfWeek.at("Fri"), TimeOfMonth.at(13))
+
+    # Next in 2023-01-13
+    interval = period.rollforward(from_iso("2022-06-01 00:00:00"))
+    assert interval.left == interval.right == All.max
+
+    interval = period.rollforward(from_iso("2022-12-01 00:00:00"))
+    assert interval.left == from_iso("2023-01-13 00:00:00")
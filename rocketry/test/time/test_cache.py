@@ -0,0 +1,100 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import pytest
+
+from rocketry.conditions import IsPeriod
+from rocketry.core.time import PeriodCache, StaticInterval, TimeDelta
+from rocketry.core.time.utils import get_period_timestamps
+from rocketry.time import Cron
+from rocketry.time.interval import TimeOfDay, TimeOfMinute, TimeOfMonth, TimeOfWeek
+
+from_iso = datetime.fromisoformat
+
+@dataclass(frozen=True, init=False, repr=False)
+class CountedDay(TimeOfDay):
+    n_rolls = 0
+    def rollforward(self, dt):
+        type(self).n_rolls += 1
+        return super().rollforward(dt)
+
+    def rollback(self, dt):
+        type(self).n_rolls += 1
+        return super().rollback(dt)
+
+@pytest.mark.parametrize("tz", [None, timezone.utc])
+@pytest.mark.parametrize(
+    "period",
+    [
+        pytest.param(TimeOfDay("10:00", "12:00"), id="TimeOfDay"),
+        pytest.param(TimeOfDay("22:00", "02:00"), id="TimeOfDay overnight"),
+        pytest.param(TimeOfDay("10:00", "10:00"), id="TimeOfDay full"),
+        pytest.param(TimeOfMinute("10", "20"), id="TimeOfMinute"),
+        pytest.param(TimeOfWeek("Sat", "Mon"), id="TimeOfWeek"),
+        pytest.param(TimeOfMonth("5", "10"), id="TimeOfMonth"),
+        pytest.param(TimeOfDay("10:00", "12:00") & TimeOfWeek("Mon"), id="All"),
+        pytest.param(TimeOfDay("10:00", "12:00") | TimeOfDay("11:00", "13:00") | TimeOfWeek("Fri"), id="Any"),
+        pytest.param(Cron("*/15", "10-12"), id="Cron"),
+        pytest.param(StaticInterval("2022-01-02", "2022-01-05"), id="StaticInterval"),
+        pytest.param(TimeDelta("1 hour"), id="TimeDelta (not cached)"),
+    ],
+)
+def test_same_as_uncached(period, tz):
+    cache = PeriodCache()
+    ts = from_iso("2022-01-01 00:00:00").timestamp()
+    steps = [0.5, 7.3, 0, 60, 600, 3 * 60 * 60]
+    for i in range(2000):
+        ts += steps[i % len(steps)] + (i % 7)
+        if i % 50 == 0:
+            # Exactly on a minute (possibly a boundary)
+            ts = ts // 60 * 60
+        assert cache.rollback(period, ts, timezone=tz) == period.rollback_timestamp(ts, timezone=tz)
+        if not isinstance(period, TimeDelta):
+            dt = datetime.fromtimestamp(ts, tz=tz)
+            assert cache.contains(period, ts, timezone=tz)[0] == (dt in period)
+
+def test_valid_until():
+    period = TimeOfDay("10:00", "12:00")
+    cache = PeriodCache()
+
+    ts = from_iso("2022-01-01 11:00:00").timestamp()
+    assert cache.contains(period, ts) == (True, from_iso("2022-01-01 12:00:00").timestamp())
+    assert cache.rollback(period, ts) == (from_iso("2022-01-01 10:00:00").timestamp(), ts)
+
+    ts = from_iso("2022-01-01 12:00:00").timestamp()
+    assert cache.contains(period, ts) == (False, from_iso("2022-01-02 10:00:00").timestamp())
+    assert cache.rollback(period, ts) == (from_iso("2022-01-01 10:00:00").timestamp(), ts)
+
+def test_roll_per_boundary():
+    period = CountedDay("10:00", "12:00")
+    cache = PeriodCache()
+    CountedDay.n_rolls = 0
+
+    start = from_iso("2022-01-01 09:00:00").timestamp()
+    for i in range(4 * 60 * 60):
+        cache.contains(period, start + i)
+        cache.rollback(period, start + i)
+    # The states change at 10:00 and 12:00 (and the intervals
+    # are checked a microsecond after when computed)
+    assert CountedDay.n_rolls < 20
+
+def test_session(session):
+    period = CountedDay("10:00", "12:00")
+    session.config.cache_periods = True
+    cond = IsPeriod(period=period)
+    now = from_iso("2022-01-01 11:00:00").timestamp()
+    session.config.time_func = lambda: now
+
+    CountedDay.n_rolls = 0
+    for i in range(100):
+        now += 1
+        assert cond.observe(session=session)
+        assert get_period_timestamps(period, session=session) == (from_iso("2022-01-01 10:00:00").timestamp(), now)
+    assert CountedDay.n_rolls < 10
+
+    # Time moving back is not answered from the cache
+    now = from_iso("2022-01-01 09:00:00").timestamp()
+    assert not cond.observe(session=session)
+    assert get_period_timestamps(period, session=session) == (
+        from_iso("2021-12-31 10:00:00").timestamp(), from_iso("2021-12-31 12:00:00").timestamp()
+    )
@@ -209,3 +209,42 @@ def test_roll_conflict_day_of_month_first():
     interv = period.rollback(datetime.datetime(2022, 12, 7, 10, 0, 0))
     assert interv.left == datetime.datetime.fromisoformat("2022-10-29 22:15:00")
     assert interv.right == datetime.datetime.fromisoformat("2022-10-29 22:16:00")
+
+def test_roll_sparse():
+    period = Cron(*"0 3 29 2 *".split(" "))
+
+    interv = period.rollforward(datetime.datetime(2023, 3, 5))
+    assert interv.left == datetime.datetime(2024, 2, 29, 3, 0)
+    assert interv.right == datetime.datetime(2024, 2, 29, 3, 1)
+
+    interv = period.rollback(datetime.datetime(2023, 3, 5))
+    assert interv.left == datetime.datetime(2020, 2, 29, 3, 0)
+    assert interv.right == datetime.datetime(2020, 2, 29, 3, 1)
+
+    # Never matches
+    period = Cron(*"0 0 30 2 *".split(" "))
+    interv = period.rollforward(datetime.datetime(2023, 3, 5))
+    assert interv.left == interv.right == Cron.max
+
+@pytest.mark.parametrize(
+    "expr",
+    ["*/15 * * * *", "15,30 18-22 20 OCT *", "0 12 * * SAT-SUN", "23 0-20/2 * * *", "0 0 1,15 * 0", "* * * * Tue-Fri/2"]
+)
+def test_roll_same_as_subperiod(expr):
+    period = Cron(*expr.split(" "))
+    subperiod = period.get_subperiod()
+    for dt in [
+        datetime.datetime(2022, 8, 7, 12, 30, 30),
+        datetime.datetime(2022, 10, 20, 18, 15),
+        datetime.datetime(2022, 12, 31, 23, 59, 59),
+        datetime.datetime(2023, 1, 1),
+        datetime.datetime(2023, 2, 14, 0, 23, 1),
+    ]:
+        assert (dt in period) == (dt in subperiod)
+        assert period.rollforward(dt) == subperiod.rollforward(dt)
+        assert period.rollback(dt) == subperiod.rollback(dt)
+
+@pytest.mark.parametrize("args", [("60",), ("*", "24"), ("*", "*", "0"), ("*", "*", "*", "13"), ("*", "*", "*", "FOO")])
+def test_invalid(args):
+    with pytest.raises(ValueError):
+        Cron(*args)
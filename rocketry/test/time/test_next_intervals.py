@@ -0,0 +1,107 @@
+import math
+from datetime import datetime, timezone
+
+import pytest
+
+from rocketry.core.time import TimePeriod, TimeDelta, StaticInterval
+from rocketry.time import Cron
+from rocketry.time.interval import TimeOfDay, TimeOfHour, TimeOfMinute, TimeOfMonth, TimeOfWeek
+
+from_iso = datetime.fromisoformat
+
+def to_lists(intervals):
+    starts, ends = intervals
+    return [float(start) for start in starts], [float(end) for end in ends]
+
+def to_timestamps(*dts):
+    return [from_iso(dt).timestamp() for dt in dts]
+
+@pytest.mark.parametrize("tz", [None, timezone.utc])
+@pytest.mark.parametrize(
+    "period",
+    [
+        pytest.param(TimeOfDay("10:00", "12:00"), id="TimeOfDay"),
+        pytest.param(TimeOfDay("22:00", "02:00"), id="TimeOfDay overnight"),
+        pytest.param(TimeOfDay("10:00", "10:00"), id="TimeOfDay full"),
+        pytest.param(TimeOfDay(), id="TimeOfDay always"),
+        pytest.param(TimeOfHour("15:00", "45:30"), id="TimeOfHour"),
+        pytest.param(TimeOfMinute("10", "50"), id="TimeOfMinute"),
+        pytest.param(TimeOfWeek("Sat", "Mon"), id="TimeOfWeek"),
+        pytest.param(Cron(), id="Cron every minute"),
+        pytest.param(Cron("*/15", "10-12"), id="Cron"),
+        pytest.param(Cron("5,10", "*", "1-7", "*", "1"), id="Cron day of week"),
+    ],
+)
+def test_same_as_rolling(period, tz):
+    # The batched computations should give the
+    # same as rolling forward one interval at a time
+    for dt in ("2022-01-01 00:00:00", "2022-01-03 10:00:00", "2022-01-03 10:15:30.5", "2022-01-08 23:59:59"):
+        dt = from_iso(dt).replace(tzinfo=tz)
+        until = dt.timestamp() + 3 * 24 * 60 * 60
+        assert to_lists(period.next_intervals(dt, n=200, horizon="3 days")) == TimePeriod._next_intervals(period, dt, 200, until)
+
+@pytest.mark.parametrize("i", range(0, 60, 7))
+def test_forecast_day(i):
+    # Forecasting a day of the schedules of differing
+    # periods should be the same as rolling forward
+    dt = from_iso("2022-06-01 12:00")
+    until = dt.timestamp() + 24 * 60 * 60
+    for period in (TimeOfDay(f"{i % 24:02d}:00", f"{(i + 2) % 24:02d}:30"), Cron(f"{i % 60}", f"*/{i % 5 + 1}")):
+        starts, ends = to_lists(period.next_intervals(dt, horizon="1 day"))
+        assert (starts, ends) == TimePeriod._next_intervals(period, dt, math.inf, until)
+        assert starts == sorted(starts)
+        assert all(dt.timestamp() <= end and start < until for start, end in zip(starts, ends))
+
+def test_time_of_day():
+    period = TimeOfDay("10:00", "12:00")
+
+    starts, ends = to_lists(period.next_intervals("2022-01-01 11:00", n=3))
+    assert starts == to_timestamps("2022-01-01 11:00", "2022-01-02 10:00", "2022-01-03 10:00")
+    assert ends == to_timestamps("2022-01-01 12:00", "2022-01-02 12:00", "2022-01-03 12:00")
+
+    # Starting after the horizon are not included
+    starts, ends = to_lists(period.next_intervals("2022-01-01 11:00", horizon="1 day"))
+    assert starts == to_timestamps("2022-01-01 11:00", "2022-01-02 10:00")
+
+    starts, ends = to_lists(period.next_intervals("2022-01-01 11:00", n=1, horizon=from_iso("2022-01-05 00:00")))
+    assert starts == to_timestamps("2022-01-01 11:00")
+
+def test_time_of_month():
+    period = TimeOfMonth("5th", "10th")
+    starts, ends = to_lists(period.next_intervals("2022-01-20", n=2))
+    assert starts == to_timestamps("2022-02-05", "2022-03-05")
+    assert ends == to_timestamps("2022-02-11", "2022-03-11")
+
+def test_delta():
+    period = TimeDelta("1 hour")
+    starts, ends = to_lists(period.next_intervals("2022-01-01 10:30", horizon="3 hours"))
+    assert starts == to_timestamps("2022-01-01 10:30", "2022-01-01 11:30", "2022-01-01 12:30")
+    assert ends == to_timestamps("2022-01-01 11:30", "2022-01-01 12:30", "2022-01-01 13:30")
+
+def test_all_with_delta():
+    # Every hour between 10:00 and 12:30
+    period = TimeDelta("1 hour") & TimeOfDay("10:00", "12:30")
+    starts, ends = to_lists(period.next_intervals("2022-01-01 00:00", horizon="1 day"))
+    assert starts == to_timestamps("2022-01-01 10:00", "2022-01-01 11:00", "2022-01-01 12:00")
+    assert ends == to_timestamps("2022-01-01 11:00", "2022-01-01 12:00", "2022-01-01 12:30")
+
+def test_any():
+    period = TimeOfDay("10:00", "12:00") | TimeOfDay("11:00", "13:00") | TimeOfDay("20:00", "21:00")
+    starts, ends = to_lists(period.next_intervals("2022-01-01 00:00", n=3))
+    assert starts == to_timestamps("2022-01-01 10:00", "2022-01-01 20:00", "2022-01-02 10:00")
+    assert ends == to_timestamps("2022-01-01 13:00", "2022-01-01 21:00", "2022-01-02 13:00")
+
+def test_never():
+    assert to_lists(Cron("0", "0", "30", "2").next_intervals("2022-01-01", n=3)) == ([], [])
+    assert to_lists(StaticInterval("2020-01-01", "2020-01-02").next_intervals("2022-01-01", n=3)) == ([], [])
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        TimeOfDay("10:00", "12:00").next_intervals("2022-01-01")
+
+def test_numpy():
+    np = pytest.importorskip("numpy")
+    starts, ends = TimeOfDay("10:00", "12:00").next_intervals("2022-01-01", n=3)
+    assert isinstance(starts, np.ndarray)
+    assert isinstance(ends, np.ndarray)
+    assert starts.tolist() == to_timestamps("2022-01-01 10:00", "2022-01-02 10:00", "2022-01-03 10:00")
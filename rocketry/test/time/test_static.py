@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from rocketry.time import StaticInterval, always, never
 from rocketry.pybox.time import Interval
 
@@ -36,6 +36,15 @@ def test_static():
         closed="left"
     )
 
+def test_static_timezone():
+    t = StaticInterval("2022-08-01", "2022-08-10")
+    dt = datetime.fromisoformat("2022-08-03 00:00:00").astimezone(timezone.utc)
+    assert dt in t
+    assert t.rollforward(dt).right == datetime.fromisoformat("2022-08-10 00:00:00").astimezone(timezone.utc)
+
+    dt = datetime.fromisoformat("2022-09-01 00:00:00").astimezone(timezone.utc)
+    assert dt not in t
+
 def test_always():
     assert datetime(2022, 1, 1) in always
     assert always.rollforward(datetime(2022, 1, 1)) == Interval(
@@ -1,12 +1,30 @@
-from typing import Callable
+from bisect import bisect_left
+import calendar
+import datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from dataclasses import dataclass
 
 from rocketry.core.time.base import TimePeriod, always
+from rocketry.pybox.time import Interval, to_timestamp, supports_wall, wall_to_timestamp
 
 from .interval import TimeOfHour, TimeOfDay, TimeOfMinute, TimeOfWeek, TimeOfMonth, TimeOfYear
 
+_MINUTE = datetime.timedelta(minutes=1)
+_MINUTE_US = 60_000_000
+_WALL_EPOCH = datetime.datetime(1970, 1, 1)
+
 @dataclass(frozen=True)
 class Cron(TimePeriod):
+    """Time period of a cron expression.
+
+    The expression is compiled to bitmasks of the
+    allowed minutes, hours, days, months and days of
+    week when created and the next and previous
+    matching minutes are computed from them directly,
+    skipping the non-matching months, days and hours
+    at once.
+    """
 
     minute: str = "*"
     hour: str = "*"
@@ -25,14 +43,144 @@ class Cron(TimePeriod):
         # ,: list of values
         # -: range of values
         # /: step values
+        object.__setattr__(self, "_masks", _compile(minute, hour, day_of_month, month, day_of_week))
+
+    def __contains__(self, dt):
+        minutes, hours, months, day_masks = self._masks[0], self._masks[1], self._masks[2], self._masks[3:]
+        return bool(
+            minutes >> dt.minute & 1
+            and hours >> dt.hour & 1
+            and months >> dt.month & 1
+            and _get_day_mask(*day_masks, dt.year, dt.month) >> dt.day & 1
+        )
 
     def rollforward(self, dt):
-        "Get previous time interval of the period."
-        return self.get_subperiod().rollforward(dt)
+        "Get next time interval of the period."
+        start = dt.replace(second=0, microsecond=0)
+        if dt in self:
+            return Interval(dt, start + _MINUTE)
+        start = self._next_match(start)
+        if start is None:
+            return Interval(self.max, self.max)
+        return Interval(start, start + _MINUTE)
 
     def rollback(self, dt):
         "Get previous time interval of the period."
-        return self.get_subperiod().rollback(dt)
+        start = dt.replace(second=0, microsecond=0)
+        if dt > start and dt in self:
+            return Interval(start, dt)
+        start = self._prev_match(start - _MINUTE)
+        if start is None:
+            return Interval(self.min, self.min)
+        return Interval(start, start + _MINUTE)
+
+    def _has_fixed_boundaries(self) -> bool:
+        return True
+
+    def _next_intervals(self, dt:datetime.datetime, n:Union[int, float], until:float) -> Tuple[List[float], List[float]]:
+        timezone = dt.tzinfo
+        if not supports_wall(timezone):
+            return super()._next_intervals(dt, n, until)
+        # The matching minutes of a matching day are the
+        # same thus only the matching days are searched.
+        # Computed in wall time (microseconds)
+        minutes, hours = self._masks[0], self._masks[1]
+        minutes = [minute for minute in range(60) if minutes >> minute & 1]
+        day_minutes = [
+            hour * 60 + minute
+            for hour in range(24) if hours >> hour & 1
+            for minute in minutes
+        ]
+        never = to_timestamp(self.max)
+
+        starts, ends = [], []
+        current = dt.replace(second=0, microsecond=0)
+        if dt in self:
+            # Ongoing
+            starts.append(to_timestamp(dt))
+            ends.append(to_timestamp(current + _MINUTE))
+            current += _MINUTE
+        while len(starts) < n:
+            match = self._next_match(current)
+            if match is None:
+                break
+            minute_of_day = match.hour * 60 + match.minute
+            day = (match.replace(tzinfo=None) - _WALL_EPOCH) // _MINUTE * _MINUTE_US - minute_of_day * _MINUTE_US
+            for minute_of_day in day_minutes[bisect_left(day_minutes, minute_of_day):]:
+                wall = day + minute_of_day * _MINUTE_US
+                start = wall_to_timestamp(wall, timezone)
+                if start >= until or start >= never or len(starts) >= n:
+                    return starts, ends
+                starts.append(start)
+                ends.append(wall_to_timestamp(wall + _MINUTE_US, timezone))
+            current = match.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+        return starts, ends
+
+    def _next_match(self, dt:datetime.datetime) -> Optional[datetime.datetime]:
+        "Get the first matching minute at or after dt (None if none before max)"
+        minutes, hours, months, *day_masks = self._masks
+        year, month, day, hour, minute = dt.year, dt.month, dt.day, dt.hour, dt.minute
+        while year <= self.max.year:
+            next_month = _next_bit(months, month)
+            if next_month is None:
+                year, month, day, hour, minute = year + 1, 1, 1, 0, 0
+                continue
+            if next_month != month:
+                month, day, hour, minute = next_month, 1, 0, 0
+
+            next_day = _next_bit(_get_day_mask(*day_masks, year, month), day)
+            if next_day is None:
+                month, day, hour, minute = month + 1, 1, 0, 0
+                continue
+            if next_day != day:
+                day, hour, minute = next_day, 0, 0
+
+            next_hour = _next_bit(hours, hour)
+            if next_hour is None:
+                day, hour, minute = day + 1, 0, 0
+                continue
+            if next_hour != hour:
+                hour, minute = next_hour, 0
+
+            next_minute = _next_bit(minutes, minute)
+            if next_minute is None:
+                hour, minute = hour + 1, 0
+                continue
+            return dt.replace(year=year, month=month, day=day, hour=hour, minute=next_minute)
+        return None
+
+    def _prev_match(self, dt:datetime.datetime) -> Optional[datetime.datetime]:
+        "Get the last matching minute at or before dt (None if none after min)"
+        minutes, hours, months, *day_masks = self._masks
+        year, month, day, hour, minute = dt.year, dt.month, dt.day, dt.hour, dt.minute
+        while year >= self.min.year:
+            prev_month = _prev_bit(months, month)
+            if prev_month is None:
+                year, month, day, hour, minute = year - 1, 12, 31, 23, 59
+                continue
+            if prev_month != month:
+                month, day, hour, minute = prev_month, 31, 23, 59
+
+            prev_day = _prev_bit(_get_day_mask(*day_masks, year, month), day)
+            if prev_day is None:
+                month, day, hour, minute = month - 1, 31, 23, 59
+                continue
+            if prev_day != day:
+                day, hour, minute = prev_day, 23, 59
+
+            prev_hour = _prev_bit(hours, hour)
+            if prev_hour is None:
+                day, hour, minute = day - 1, 23, 59
+                continue
+            if prev_hour != hour:
+                hour, minute = prev_hour, 59
+
+            prev_minute = _prev_bit(minutes, minute)
+            if prev_minute is None:
+                hour, minute = hour - 1, 59
+                continue
+            return dt.replace(year=year, month=month, day=day, hour=hour, minute=prev_minute)
+        return None
 
     def _get_period_from_expr(self, cls, expression:str, conv:Callable=None, default=always):
 
@@ -109,3 +257,95 @@ class Cron(TimePeriod):
             & self._get_period_from_expr(TimeOfYear, self.month)
             & day_of_week_month
         )
+
+# Field: (first value, last value, names)
+_FIELDS: Dict[str, Tuple[int, int, Dict[str, int]]] = {
+    "minute": (0, 59, {}),
+    "hour": (0, 23, {}),
+    "day_of_month": (1, 31, {}),
+    "month": (1, 12, {
+        name: i + 1 for name, i in TimeOfYear._unit_mapping.items() if isinstance(name, str)
+    }),
+    # Sunday is both 0 and 7
+    "day_of_week": (0, 7, {
+        name: i + 1 for name, i in TimeOfWeek._unit_mapping.items() if isinstance(name, str)
+    }),
+}
+
+def _compile(minute:str, hour:str, day_of_month:str, month:str, day_of_week:str) -> Tuple[int, ...]:
+    "Turn the cron expression to bitmasks of the allowed values (bit n is value n)"
+    dom_mask = _parse_field("day_of_month", day_of_month)
+    dow_mask = _parse_field("day_of_week", day_of_week)
+    if dow_mask & 1:
+        # Sunday as 0 --> Sunday as 7 (as in datetime.isoweekday)
+        dow_mask = (dow_mask | 1 << 7) & ~1
+    # If both days of month and days of week are
+    # restricted, either of them is enough (as in cron)
+    is_either = day_of_month != "*" and day_of_week != "*"
+    return (
+        _parse_field("minute", minute),
+        _parse_field("hour", hour),
+        _parse_field("month", month),
+        dom_mask, dow_mask, is_either,
+    )
+
+def _parse_field(field:str, expression:str) -> int:
+    first, last, names = _FIELDS[field]
+    if field == "day_of_week":
+        # Steps go from Sunday (0) to Saturday (6)
+        last = 6
+
+    def to_value(s:str) -> int:
+        value = int(s) if s.isdigit() else names.get(s.lower())
+        if value is None or not first <= value <= _FIELDS[field][1]:
+            raise ValueError(f"Invalid cron expression for {field}: {expression!r}")
+        return value
+
+    mask = 0
+    for expr in str(expression).split(","):
+        step = 1
+        if "/" in expr:
+            expr, step = expr.split("/")
+            step = int(step)
+        if expr == "*":
+            start, end = first, last
+        elif "-" in expr:
+            start, end = map(to_value, expr.split("-"))
+        else:
+            start = to_value(expr)
+            end = start if step == 1 else last
+
+        if start <= end:
+            values = range(start, end + 1)
+        else:
+            # Range over the end, ie. FRI-MON
+            values = [*range(start, last + 1), *range(first, end + 1)]
+        for value in values[::step]:
+            mask |= 1 << value
+    return mask
+
+@lru_cache(maxsize=1024)
+def _get_day_mask(dom_mask:int, dow_mask:int, is_either:bool, year:int, month:int) -> int:
+    "Get bitmask of the matching days of the month"
+    first_weekday, n_days = calendar.monthrange(year, month)
+    mask = 0
+    for day in range(1, n_days + 1):
+        is_dom = dom_mask >> day & 1
+        is_dow = dow_mask >> (first_weekday + day - 1) % 7 + 1 & 1
+        if (is_dom or is_dow) if is_either else (is_dom and is_dow):
+            mask |= 1 << day
+    return mask
+
+def _next_bit(mask:int, value:int) -> Optional[int]:
+    "Get the smallest set bit at or after value"
+    mask >>= value
+    if not mask:
+        return None
+    return value + (mask & -mask).bit_length() - 1
+
+def _prev_bit(mask:int, value:int) -> Optional[int]:
+    "Get the largest set bit at or before value"
+    if value < 0:
+        return None
+    mask &= (1 << value + 1) - 1
+    return mask.bit_length() - 1 if mask else None
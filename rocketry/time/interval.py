@@ -23,6 +23,7 @@ class TimeOfSecond(AnchoredInterval):
     _scope: ClassVar[str] = "second"
 
     _scope_max: ClassVar[int] = to_microseconds(second=1)
+    _scope_origin: ClassVar[int] = 0
     _unit_resolution: ClassVar[int] = to_microseconds(millisecond=1)
     _unit_names: ClassVar[List[str]] = [str(i) for i in range(1000)] # 00, 01 etc. till 59
 
@@ -50,6 +51,7 @@ class TimeOfMinute(AnchoredInterval):
     _scope: ClassVar[str] = "minute"
 
     _scope_max: ClassVar[int] = to_microseconds(minute=1)
+    _scope_origin: ClassVar[int] = 0
     _unit_resolution: ClassVar[int] = to_microseconds(second=1)
     _unit_names: ClassVar[List[str]] = [f"{i:02d}" for i in range(60)] # 00, 01 etc. till 59
 
@@ -84,6 +86,7 @@ class TimeOfHour(AnchoredInterval):
     """
     _scope: ClassVar[str] = "hour"
     _scope_max: ClassVar[int] = to_microseconds(hour=1)
+    _scope_origin: ClassVar[int] = 0
     _unit_resolution: ClassVar[int] = to_microseconds(minute=1)
     _unit_names: ClassVar[List[str]] = [f"{i:02d}:00" for i in range(60)] # 00:00, 01:00 etc. till 59:00
 
@@ -121,6 +124,7 @@ class TimeOfDay(AnchoredInterval):
     """
     _scope: ClassVar[str] = "day"
     _scope_max: ClassVar[int] = to_microseconds(day=1)
+    _scope_origin: ClassVar[int] = 0
     _unit_resolution: ClassVar[int] = to_microseconds(hour=1)
     _unit_names: ClassVar[List[str]] = [f"{i:02d}:00" for i in range(24)] # 00:00, 01:00, 02:00 etc. till 23:00
 
@@ -159,6 +163,7 @@ class TimeOfWeek(AnchoredInterval):
     """
     _scope: ClassVar[str] = "week"
     _scope_max: ClassVar[int] = to_microseconds(day=7) # Sun day end of day
+    _scope_origin: ClassVar[int] = to_microseconds(day=-3) # Monday before 1970-01-01 (Thursday)
     _unit_resolution: ClassVar[int] = to_microseconds(day=1)
     _unit_names: ClassVar[List[str]] = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
 
@@ -439,6 +444,10 @@ class RelativeDay(TimeInterval):
     def rollforward(self, dt):
         raise AttributeError("RelativeDay has no next day")
 
+    def _has_fixed_boundaries(self) -> bool:
+        # Relative to the time
+        return False
+
     def __repr__(self):
         args_str = str(self.day)
         if self.start_time != self.min.date():